@@ -0,0 +1,60 @@
+"""Executa os microbenchmarks e compara com a linha de base desta máquina.
+
+Uso:
+    python -m benchmarks                       # mede e compara com benchmarks/baselines/<host>.json
+    python -m benchmarks --save-baseline       # mede e grava a nova linha de base
+    python -m benchmarks --sizes 1000,10000 -k subtitle
+"""
+import os
+import sys
+import logging
+import argparse
+from benchmarks import runner
+from benchmarks import suite  # noqa: F401 (registra os casos)
+
+
+def _parse_sizes(value):
+    return {int(v) for v in value.split(",") if v.strip()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Microbenchmarks do Amarelo Subs")
+    parser.add_argument("--sizes", type=_parse_sizes,
+                        help="Tamanhos a medir, separados por vírgula (padrão: todos, de 1k a 1M segmentos)")
+    parser.add_argument("-k", "--filter", help="Mede apenas os casos cujo nome contém este texto")
+    parser.add_argument("--repeat", type=int, help="Repetições por caso (padrão: conforme o tamanho)")
+    parser.add_argument("--baseline", default=runner.default_baseline_path(),
+                        help="Arquivo JSON da linha de base (padrão: benchmarks/baselines/<host>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova linha de base")
+    parser.add_argument("--output", help="Grava também os resultados desta execução neste arquivo JSON")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Piora relativa considerada regressão (padrão: 0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    benchmarks = runner.registered(args.sizes, args.filter)
+    if not benchmarks:
+        print("Nenhum benchmark selecionado.", file=sys.stderr)
+        return 1
+
+    report = runner.run_all(benchmarks, repeat=args.repeat)
+    if args.output:
+        runner.save(report, args.output)
+
+    if args.save_baseline:
+        runner.save(report, args.baseline)
+        print(f"Linha de base gravada em {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Sem linha de base em {args.baseline}; use --save-baseline para criá-la.")
+        return 0
+
+    regressions = runner.compare(report, runner.load(args.baseline), threshold=args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressão(ões): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
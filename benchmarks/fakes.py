@@ -0,0 +1,95 @@
+"""Dados sintéticos e dublês determinísticos para os benchmarks (sem rede, sem Whisper)"""
+import random
+import numpy as np
+from src.core.audio import SAMPLE_RATE
+from src.core.progress import current_tracker
+from src.core.transcription_engine import TranscriptionEngine
+from src.core.translation_providers import TranslationProvider
+from src.utils.translation_stub_server import fake_translate
+
+_WORDS = (
+    "então ela disse que não ia voltar para casa antes do amanhecer mas ninguém acreditou "
+    "porque a cidade inteira estava esperando a chuva passar e o trem atrasado chegar"
+).split()
+
+# Linhas que se repetem em legendas reais (a tradução consulta cada uma uma única vez)
+_REPEATED = ("[Música]", "[Risos]", "Obrigado.", "O quê?", "Vamos!")
+
+
+def make_segments(count, seed=0, repeat_ratio=0.1):
+    """Lista de `count` segmentos no formato do Whisper, sempre a mesma para a mesma semente"""
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    for i in range(count):
+        t += rng.uniform(0.05, 1.5)
+        duration = rng.uniform(0.8, 5.0)
+        if rng.random() < repeat_ratio:
+            text = rng.choice(_REPEATED)
+        else:
+            text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 12)))
+        segments.append({'id': i, 'start': t, 'end': t + duration, 'text': f" {text}"})
+        t += duration
+    return segments
+
+
+def make_audio(seconds, seed=0, speech_ratio=0.6):
+    """Ruído de fundo baixo com rajadas de "fala" (alta energia), para exercitar o VAD"""
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0, 0.003, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    block = SAMPLE_RATE  # Blocos de 1 s
+    for start in range(0, len(audio), block):
+        if rng.random() < speech_ratio:
+            audio[start:start + block] += rng.normal(0, 0.2, len(audio[start:start + block])).astype(np.float32)
+    return audio
+
+
+class FakeWhisperModel:
+    """Imita whisper.model.transcribe: resultado determinístico e progresso pelo rastreador ativo"""
+
+    def __init__(self, segment_count=None, segments_per_minute=20, seed=0):
+        self.segment_count = segment_count
+        self.segments_per_minute = segments_per_minute
+        self.seed = seed
+
+    def transcribe(self, audio, verbose=False, **options):
+        seconds = len(audio) / SAMPLE_RATE
+        tracker = current_tracker()
+        if tracker is not None:
+            tracker.begin_pass(seconds)
+            # Passos de 30 s, como as janelas do Whisper
+            for _ in range(int(seconds // 30)):
+                tracker.advance(30)
+        count = self.segment_count or max(1, int(seconds / 60 * self.segments_per_minute))
+        segments = make_segments(count, seed=self.seed + len(audio))
+        return {
+            'text': "".join(seg['text'] for seg in segments),
+            'segments': segments,
+            'language': options.get('language') or 'pt',
+        }
+
+
+class FakeTranscriptionEngine(TranscriptionEngine):
+    """TranscriptionEngine real (cache, VAD, progresso) com o modelo substituído pelo dublê"""
+
+    def __init__(self, config_manager, model):
+        super().__init__(config_manager)
+        self._fake_model = model
+
+    @property
+    def model(self):
+        return self._fake_model
+
+
+class FakeTranslationProvider(TranslationProvider):
+    """Provedor em memória com lote nativo; a mesma tradução do servidor de teste"""
+
+    name = "fake"
+    native_batch = True
+    max_batch_items = 100
+
+    def translate(self, text, source, target):
+        return fake_translate(text, target)
+
+    def translate_batch(self, texts, source, target):
+        return [fake_translate(t, target) for t in texts]
@@ -0,0 +1,196 @@
+"""Compara o Whisper float32 com o int8 (quantização dinâmica) em áudios reais: velocidade, memória e WER.
+
+Uso:
+    python -m benchmarks.quantization amostras/ --model base
+    python -m benchmarks.quantization entrevista.wav aula.mp4 --model small --output quantizacao.json
+
+Cada áudio pode ter a transcrição de referência em um .txt de mesmo nome
+(amostras/entrevista.wav + amostras/entrevista.txt). Sem referência, o WER do
+int8 é medido contra a saída do float32, ou seja, o erro introduzido pela
+quantização. O repositório não inclui áudios: use gravações próprias e
+representativas do conteúdo real.
+
+Cada variante roda em um processo novo, para que o pico de memória de uma
+não contamine a outra. A conversão para int8 é feita (ou lida do cache)
+antes das medições e informada à parte.
+"""
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime
+from benchmarks import runner
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.m4a', '.ogg', '.mp4', '.mkv', '.avi', '.mov')
+
+
+def normalize_words(text):
+    """Minúsculas, sem pontuação, separado em palavras"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """(substituições + inserções + remoções) / palavras da referência, por distância de edição"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, other in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def collect_samples(inputs):
+    """[(áudio, texto de referência ou None)] a partir de arquivos e diretórios"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(os.path.join(item, name) for name in sorted(os.listdir(item)))
+        else:
+            paths.append(item)
+    samples = []
+    for path in paths:
+        if not path.lower().endswith(AUDIO_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, "r", encoding="utf-8") as f:
+                reference = f.read()
+        samples.append((path, reference))
+    return samples
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB no Linux, bytes no macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def _prepare_int8(model_size, cache_dir):
+    """Garante o modelo int8 em cache; retorna o tempo da conversão (0 se já existia)"""
+    from src.core.quantization import cache_path, load_quantized
+    if os.path.exists(cache_path(model_size, cache_dir)):
+        return 0.0
+    start = time.perf_counter()
+    load_quantized(model_size, cache_dir)
+    return time.perf_counter() - start
+
+
+def _run_variant(model_size, quantization, samples, cache_dir, language):
+    """Executado em um processo próprio: carrega o modelo e transcreve todas as amostras"""
+    import whisper
+    from src.core.audio import load_audio, SAMPLE_RATE
+    from src.core.backends import OpenAIWhisperBackend
+    from src.core.quantization import load_quantized
+
+    start = time.perf_counter()
+    if quantization == 'int8':
+        model = load_quantized(model_size, cache_dir)
+    else:
+        model = whisper.load_model(model_size, device='cpu')
+    load_seconds = time.perf_counter() - start
+
+    options = {'fp16': False}
+    if language:
+        options['language'] = language
+    transcripts, audio_seconds, elapsed = [], 0.0, 0.0
+    for path, _ in samples:
+        audio = load_audio(path)
+        start = time.perf_counter()
+        result = model.transcribe(audio, verbose=None, **options)
+        elapsed += time.perf_counter() - start
+        audio_seconds += len(audio) / SAMPLE_RATE
+        transcripts.append(result['text'])
+
+    return {
+        'load_s': load_seconds,
+        'model_mb': OpenAIWhisperBackend().model_bytes(model) / 2**20,
+        'peak_rss_mb': _peak_rss_mb(),
+        'audio_s': audio_seconds,
+        'transcribe_s': elapsed,
+        'rtf': elapsed / audio_seconds if audio_seconds else None,
+        'transcripts': transcripts,
+    }
+
+
+def _in_subprocess(func, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def compare_variants(samples, model_size="base", cache_dir=None, language=None, stream=sys.stdout):
+    conversion = _in_subprocess(_prepare_int8, model_size, cache_dir)
+    results = {
+        'float32': _in_subprocess(_run_variant, model_size, None, samples, cache_dir, language),
+        'int8': _in_subprocess(_run_variant, model_size, 'int8', samples, cache_dir, language),
+    }
+
+    # WER contra a referência de cada amostra ou, sem ela, contra a saída float32
+    for name, result in results.items():
+        errors = []
+        for index, (_, reference) in enumerate(samples):
+            if reference is None and name == 'float32':
+                continue
+            expected = reference if reference is not None else results['float32']['transcripts'][index]
+            errors.append(word_error_rate(expected, result['transcripts'][index]))
+        result['wer'] = sum(errors) / len(errors) if errors else None
+
+    has_reference = all(reference is not None for _, reference in samples)
+    print(f"Modelo '{model_size}', {len(samples)} amostra(s), {results['float32']['audio_s']:.0f}s de áudio", file=stream)
+    if conversion:
+        print(f"Conversão para int8 (uma única vez): {conversion:.1f}s", file=stream)
+    print(f"{'variante':10s} {'carga (s)':>10s} {'modelo (MB)':>12s} {'pico RSS (MB)':>14s} {'RTF':>7s} "
+          f"{'WER' if has_reference else 'WER vs fp32':>12s}", file=stream)
+    for name, result in results.items():
+        rss = f"{result['peak_rss_mb']:14.0f}" if result['peak_rss_mb'] is not None else f"{'-':>14s}"
+        rtf = f"{result['rtf']:7.3f}" if result['rtf'] is not None else f"{'-':>7s}"
+        wer = f"{result['wer']:12.1%}" if result['wer'] is not None else f"{'-':>12s}"
+        print(f"{name:10s} {result['load_s']:10.1f} {result['model_mb']:12.0f} {rss} {rtf} {wer}", file=stream)
+    if results['float32']['rtf'] and results['int8']['rtf']:
+        print(f"Aceleração do int8: {results['float32']['rtf'] / results['int8']['rtf']:.2f}x", file=stream)
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': runner.machine_info(),
+        'model': model_size,
+        'samples': [path for path, _ in samples],
+        'conversion_s': conversion,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.quantization",
+                                     description="Whisper float32 x int8 na CPU: velocidade, memória e WER")
+    parser.add_argument("inputs", nargs="+", help="Áudios/vídeos ou diretórios (referências em .txt de mesmo nome)")
+    parser.add_argument("--model", default="base", help="Tamanho do modelo (padrão: base)")
+    parser.add_argument("--language", help="Idioma fixo das amostras (padrão: detecção automática)")
+    parser.add_argument("--cache-dir", help="Diretório do cache do modelo int8 (padrão: cache do aplicativo)")
+    parser.add_argument("--output", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    samples = collect_samples(args.inputs)
+    if not samples:
+        print("Nenhum áudio encontrado.", file=sys.stderr)
+        return 1
+    report = compare_variants(samples, args.model, args.cache_dir, args.language)
+    if args.output:
+        runner.save(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
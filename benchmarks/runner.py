@@ -0,0 +1,145 @@
+"""Registro, medição e comparação dos benchmarks com uma linha de base em JSON"""
+import os
+import sys
+import json
+import time
+import socket
+import platform
+import statistics
+from datetime import datetime
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+_benchmarks = []
+
+
+class Benchmark:
+    """Um caso de medição: `setup(size)` prepara os dados e retorna (função medida, itens por execução)"""
+
+    def __init__(self, name, setup, size=None, repeat=5):
+        self.name = name
+        self.setup = setup
+        self.size = size
+        self.repeat = repeat
+
+    @property
+    def key(self):
+        return self.name if self.size is None else f"{self.name}[{self.size}]"
+
+
+def benchmark(name, sizes=(None,), repeat=5):
+    """Decorador que registra `setup` para cada tamanho"""
+    def register(setup):
+        for size in sizes:
+            _benchmarks.append(Benchmark(name, setup, size, repeat))
+        return setup
+    return register
+
+
+def registered(sizes=None, pattern=None):
+    """Benchmarks registrados, filtrados pelos tamanhos permitidos e por substring do nome"""
+    selected = []
+    for bench in _benchmarks:
+        if sizes is not None and bench.size is not None and bench.size not in sizes:
+            continue
+        if pattern and pattern not in bench.key:
+            continue
+        selected.append(bench)
+    return selected
+
+
+def _repeat_for(bench, repeat):
+    if repeat:
+        return repeat
+    # Casos grandes custam segundos por execução: menos repetições
+    if bench.size and bench.size >= 1_000_000:
+        return 1
+    if bench.size and bench.size >= 100_000:
+        return 3
+    return bench.repeat
+
+
+def measure(bench, repeat=None):
+    func, items = bench.setup(bench.size)
+    runs = _repeat_for(bench, repeat)
+    if runs > 1:
+        func()  # Aquecimento (imports, caches de primeira chamada)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        'min_s': best,
+        'median_s': statistics.median(times),
+        'runs': runs,
+        'items': items,
+        'ns_per_item': best / items * 1e9 if items else None,
+    }
+
+
+def machine_info():
+    """Identifica a máquina: linhas de base só são comparáveis no mesmo ambiente"""
+    return {
+        'host': socket.gethostname(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def default_baseline_path():
+    return os.path.join(BASELINE_DIR, f"{socket.gethostname()}.json")
+
+
+def run_all(benchmarks, repeat=None, stream=sys.stderr):
+    results = {}
+    for bench in benchmarks:
+        result = measure(bench, repeat)
+        results[bench.key] = result
+        per_item = f"{result['ns_per_item']:10.0f} ns/item" if result['ns_per_item'] else ""
+        print(f"{bench.key:40s} {result['min_s'] * 1000:10.2f} ms  {per_item}", file=stream)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'results': results,
+    }
+
+
+def save(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(report, baseline, threshold=0.15, stream=sys.stdout):
+    """Imprime a variação em relação à linha de base e retorna os casos que pioraram além de `threshold`"""
+    if baseline.get('machine') != report.get('machine'):
+        print("Aviso: linha de base gerada em outra máquina/ambiente; a comparação é apenas indicativa",
+              file=stream)
+
+    regressions = []
+    print(f"{'benchmark':40s} {'base (ms)':>10s} {'atual (ms)':>10s} {'variação':>9s}", file=stream)
+    for key, current in report['results'].items():
+        previous = baseline.get('results', {}).get(key)
+        if not previous:
+            print(f"{key:40s} {'-':>10s} {current['min_s'] * 1000:10.2f} {'novo':>9s}", file=stream)
+            continue
+        change = current['min_s'] / previous['min_s'] - 1 if previous['min_s'] else 0.0
+        mark = ""
+        if change > threshold:
+            regressions.append(key)
+            mark = "  << regressão"
+        print(f"{key:40s} {previous['min_s'] * 1000:10.2f} {current['min_s'] * 1000:10.2f} "
+              f"{change:+8.1%}{mark}", file=stream)
+    return regressions
@@ -0,0 +1,112 @@
+"""Casos medidos: geração de legendas, tradução (provedor falso), configuração e pipeline"""
+import os
+import copy
+import atexit
+import shutil
+import tempfile
+import functools
+from benchmarks.runner import benchmark
+from benchmarks.fakes import (
+    make_segments, make_audio, FakeWhisperModel, FakeTranscriptionEngine, FakeTranslationProvider,
+)
+from src.utils.config_manager import ConfigManager
+from src.core.subtitle_generator import SubtitleGenerator
+from src.core.translation_engine import TranslationEngine
+from src.core.pipeline import SubtitlePipeline
+
+SEGMENT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+_workdir = tempfile.mkdtemp(prefix="amarelo-bench-")
+atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+
+
+def bench_config(overrides=None):
+    """Configuração padrão isolada: sem cache, sem limite de taxa e sem pré-carga"""
+    config = ConfigManager()
+    config.config_file = None
+    config.config = copy.deepcopy(config._get_default_config())
+    config.set("cache.enabled", False, persist=False)
+    config.set("translation.requests_per_second", 0, persist=False)
+    config.set("transcription.preload", False, persist=False)
+    # Os dublês imitam o resultado do openai-whisper, independentemente do que estiver instalado
+    config.set("transcription.backend", "openai-whisper", persist=False)
+    # A detecção rápida de idioma precisa do mel do Whisper real
+    config.set("transcription.language_detection.enabled", False, persist=False)
+    config.set("batch.resume", False, persist=False)
+    for key, value in (overrides or {}).items():
+        config.set(key, value, persist=False)
+    return config
+
+
+@functools.lru_cache(maxsize=1)
+def segments_for(size):
+    # Somente leitura nos casos medidos; reaproveitada entre benchmarks do mesmo tamanho
+    return make_segments(size)
+
+
+@benchmark("subtitle.format_timestamp", sizes=SEGMENT_SIZES)
+def bench_format_timestamp(size):
+    generator = SubtitleGenerator(bench_config())
+    times = [seg['start'] for seg in segments_for(size)]
+
+    def run():
+        for t in times:
+            generator.format_timestamp(t)
+    return run, len(times)
+
+
+@benchmark("subtitle.generate", sizes=SEGMENT_SIZES)
+def bench_generate(size):
+    generator = SubtitleGenerator(bench_config())
+    segments = segments_for(size)
+    output_path = os.path.join(_workdir, "generate.srt")
+    return (lambda: generator.generate(segments, output_path)), len(segments)
+
+
+@benchmark("translation.translate_segments", sizes=SEGMENT_SIZES)
+def bench_translate_segments(size):
+    engine = TranslationEngine(bench_config(), provider=FakeTranslationProvider())
+    segments = segments_for(size)
+    return (lambda: engine.translate_segments(segments, "en")), len(segments)
+
+
+@benchmark("config.get", sizes=(100_000,))
+def bench_config_get(size):
+    config = bench_config()
+    keys = ("font.color", "font.bold", "translation.enabled", "transcription.vad.enabled",
+            "cache.directory", "performance.workers", "missing.key.path")
+
+    def run():
+        for i in range(size):
+            config.get(keys[i % len(keys)])
+    return run, size
+
+
+@benchmark("pipeline.process_video", sizes=(1_000, 10_000, 100_000), repeat=3)
+def bench_process_video(size):
+    """Do áudio decodificado ao .srt com modelo falso, tradução falsa e manifesto"""
+    config = bench_config({"batch.resume": True, "translation.enabled": True, "translation.target_language": "en"})
+    transcriber = FakeTranscriptionEngine(config, FakeWhisperModel(segment_count=size))
+    translator = TranslationEngine(config, provider=FakeTranslationProvider())
+    pipeline = SubtitlePipeline(config, transcriber=transcriber, translator=translator)
+
+    video_dir = tempfile.mkdtemp(dir=_workdir)
+    video_path = os.path.join(video_dir, "video.mp4")
+    open(video_path, "wb").close()
+    audio = make_audio(60)
+
+    def run():
+        # Sem o manifesto anterior, todas as etapas são executadas a cada medição
+        shutil.rmtree(os.path.join(video_dir, ".amarelo"), ignore_errors=True)
+        pipeline._manifests.clear()
+        pipeline.process_video(video_path, audio=audio)
+    return run, size
+
+
+@benchmark("transcription.vad", sizes=(600, 3600), repeat=3)
+def bench_transcription_vad(size):
+    """Detecção de voz + remapeamento em `size` segundos de áudio sintético"""
+    config = bench_config({"transcription.vad.enabled": True})
+    engine = FakeTranscriptionEngine(config, FakeWhisperModel())
+    audio = make_audio(size)
+    return (lambda: engine.transcribe(audio)), size
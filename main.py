@@ -6,6 +6,8 @@ from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt
 from src.gui.main_window import MainWindow
 from src.utils.config_manager import ConfigManager
+from src.core.model_registry import warm_up_from_config
+from src.utils.tracing import tracer
 
 def exception_hook(exctype, value, tb):
     """Captura erros fatais e exibe em uma caixa de diálogo."""
@@ -59,14 +61,18 @@ def main():
         QMessageBox.critical(None, "Erro de Configuração", f"Falha ao carregar configurações: {e}")
         return
 
-    # 6. Criar e Exibir a Janela Principal
+    # 6. Orçamento de memória dos modelos (a pré-carga do Whisper começa quando a pasta é escolhida)
+    tracer.configure(config)  # Antes da pré-carga, para que o carregamento do modelo entre no trace
+    warm_up_from_config(config, preload=False)
+
+    # 7. Criar e Exibir a Janela Principal
     window = MainWindow(config)
     
     # Se a janela não foi mostrada pelo showMaximized no __init__, forçamos aqui
     if not window.isVisible():
         window.show()
 
-    # 7. Execução do Loop
+    # 8. Execução do Loop
     sys.exit(app.exec())
 
 if __name__ == "__main__":
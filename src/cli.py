@@ -0,0 +1,184 @@
+import os
+import re
+import sys
+import logging
+import argparse
+from src.utils.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+SIZE_LABELS = ("Pequeno", "Médio", "Grande")
+
+
+def _strip_html(text):
+    return re.sub(r"<[^>]+>", "", text)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Amarelo Subs em modo lote (sem interface gráfica)",
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="Diretórios, padrões glob (ex.: 'temporada/*.mkv') ou arquivos de vídeo")
+    parser.add_argument("--config", help="Arquivo de configuração JSON (padrão: apenas valores padrão)")
+    parser.add_argument("--model", help="Modelo do Whisper (tiny, base, small, medium, large)")
+    parser.add_argument("--deadline", type=float, metavar="HORAS",
+                        help="Escolhe o modelo de cada vídeo para concluir a fila neste prazo (o mais preciso que couber)")
+    parser.add_argument("--max-rtf", type=float, metavar="RTF",
+                        help="Escolhe o modelo de cada vídeo sem passar deste fator de tempo real (ex.: 0.5)")
+    parser.add_argument("--translate-to", metavar="LANG",
+                        help="Idioma de destino da tradução (ex.: pt, en, es). Omitido = sem tradução")
+    parser.add_argument("--color", help="Cor da fonte em HEX (ex.: #f4c430)")
+    parser.add_argument("--bold", action=argparse.BooleanOptionalAction, default=None,
+                        help="Aplica negrito às legendas")
+    parser.add_argument("--size", choices=SIZE_LABELS, help="Tamanho da fonte")
+    parser.add_argument("--mux", choices=("mkv", "mp4", "mov"),
+                        help="Embute as legendas em uma cópia do vídeo neste contêiner (sem recodificar)")
+    parser.add_argument("--formats", help="Formatos de legenda separados por vírgula (srt, vtt, ass). Padrão: srt")
+    parser.add_argument("-j", "--workers", type=int,
+                        help="Vídeos processados em paralelo, cada um em seu processo (0 = um por núcleo)")
+    parser.add_argument("--vad", action=argparse.BooleanOptionalAction, default=None,
+                        help="Detecta a fala antes do Whisper e pula silêncio/música")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=None,
+                        help="Grava cada legenda assim que fica pronta (sobrevive a falhas)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Fica observando os diretórios e legenda cada vídeo novo assim que termina de ser copiado")
+    parser.add_argument("--force", action="store_true",
+                        help="Reprocessa todos os vídeos, ignorando o manifesto de execuções anteriores")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="Mede cada etapa, grava um trace para chrome://tracing/Perfetto e exibe o resumo")
+    parser.add_argument("--progress", action="store_true",
+                        help="Exibe o progresso da transcrição (segundos de áudio e fator de tempo real)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Exibe logs detalhados")
+    return parser
+
+
+def print_progress(event):
+    """Linha de progresso de um vídeo no stderr"""
+    rtf = f", RTF {event.rtf:.2f}" if event.rtf is not None else ""
+    print(f"{event.job_id}: {event.percent}% ({event.audio_seconds:.0f}s de áudio{rtf})", file=sys.stderr)
+
+
+def apply_overrides(config, args):
+    """Aplica as opções da linha de comando apenas à sessão atual (sem gravar no arquivo)"""
+    if args.model:
+        config.set("transcription.model", args.model, persist=False)
+    if args.deadline is not None or args.max_rtf is not None:
+        config.set("transcription.scheduler.enabled", True, persist=False)
+        if args.deadline is not None:
+            config.set("transcription.scheduler.deadline_hours", args.deadline, persist=False)
+        if args.max_rtf is not None:
+            config.set("transcription.scheduler.max_rtf", args.max_rtf, persist=False)
+    if args.workers is not None:
+        config.set("performance.workers", args.workers, persist=False)
+    if args.vad is not None:
+        config.set("transcription.vad.enabled", args.vad, persist=False)
+    if args.stream is not None:
+        config.set("streaming.enabled", args.stream, persist=False)
+    if args.force:
+        config.set("batch.resume", False, persist=False)
+    if args.translate_to:
+        config.set("translation.enabled", True, persist=False)
+        config.set("translation.target_language", args.translate_to, persist=False)
+    if args.color:
+        config.set("font.color", args.color, persist=False)
+    if args.bold is not None:
+        config.set("font.bold", args.bold, persist=False)
+    if args.size:
+        config.set("font.size_label", args.size, persist=False)
+    if args.mux:
+        config.set("video.merge_subtitles", True, persist=False)
+        config.set("video.output_format", args.mux, persist=False)
+    if args.formats:
+        config.set("subtitle.formats", [f.strip() for f in args.formats.split(",") if f.strip()], persist=False)
+    if args.trace:
+        config.set("tracing.enabled", True, persist=False)
+        config.set("tracing.output", args.trace, persist=False)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    config = ConfigManager()
+    if args.config:
+        config.initialize(args.config)
+    else:
+        config.load()
+    apply_overrides(config, args)
+
+    # Importação após a configuração: o núcleo não depende de Qt
+    from src.core.pipeline import SubtitlePipeline, collect_videos
+    from src.utils.tracing import tracer
+
+    tracer.configure(config)
+
+    if args.watch:
+        return run_watch(config, args)
+
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("Nenhum vídeo encontrado.", file=sys.stderr)
+        return 1
+
+    pipeline = SubtitlePipeline(config)
+    # No modo paralelo cada worker carrega o próprio modelo
+    if pipeline.worker_count(len(videos)) == 1:
+        pipeline.warm_up(videos)
+
+    if args.progress:
+        pipeline.subscribe(print_progress)
+    try:
+        outputs = pipeline.run(videos, preview=lambda msg: print(_strip_html(msg), file=sys.stderr))
+    except KeyboardInterrupt:
+        print("Interrompido pelo usuário.", file=sys.stderr)
+        return 130
+    except Exception as e:
+        logger.debug("Falha no processamento", exc_info=True)
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    if pipeline.last_trace:
+        trace_path, summary = pipeline.last_trace
+        print(summary, file=sys.stderr)
+        if trace_path:
+            print(f"Trace: {trace_path}", file=sys.stderr)
+
+    for path in outputs:
+        print(path)
+    return 0
+
+
+def run_watch(config, args):
+    """Modo contínuo: um único processo com o modelo carregado, até Ctrl+C"""
+    from src.core.pipeline import SubtitlePipeline
+    from src.core.model_registry import warm_up_from_config
+    from src.core.watcher import watch
+
+    directories = [item for item in args.inputs if os.path.isdir(item)]
+    if len(directories) != len(args.inputs):
+        print("No modo --watch todas as entradas devem ser diretórios.", file=sys.stderr)
+        return 1
+
+    # Os vídeos chegam um a um: processa no próprio processo, sem pool
+    config.set("performance.workers", 1, persist=False)
+    pipeline = SubtitlePipeline(config)
+    if args.progress:
+        pipeline.subscribe(print_progress)
+    warm_up_from_config(config)
+    print(f"Observando: {', '.join(directories)} (Ctrl+C para sair)", file=sys.stderr)
+    try:
+        watch(pipeline, directories,
+              on_output=lambda path: print(path, flush=True),
+              preview=lambda msg: print(_strip_html(msg), file=sys.stderr))
+    except KeyboardInterrupt:
+        print("Observação encerrada.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import os
+import logging
+import threading
+import subprocess
+import queue
+import numpy as np
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Taxa de amostragem esperada pelo Whisper
+SAMPLE_RATE = 16000
+
+
+def load_audio(path, sr=SAMPLE_RATE, duration=None):
+    """Decodifica o áudio via ffmpeg em float32 mono reamostrado (mesmo formato do whisper.load_audio).
+
+    Com `duration`, apenas os primeiros segundos são decodificados.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-threads", "0", "-i", path]
+    if duration:
+        cmd += ["-t", str(duration)]
+    cmd += ["-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-"]
+    try:
+        with tracer.span("decode", file=os.path.basename(path)):
+            out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Falha ao decodificar áudio de {path}: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def stream_audio(path, block_seconds=10, sr=SAMPLE_RATE):
+    """Decodifica o áudio em blocos de `block_seconds`, sem carregar o arquivo inteiro"""
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-",
+    ]
+    block_bytes = int(block_seconds * sr) * 2
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    produced = False
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            produced = True
+            yield np.frombuffer(data[:len(data) - len(data) % 2], np.int16).astype(np.float32) / 32768.0
+        if process.wait() != 0 and not produced:
+            raise RuntimeError(f"Falha ao decodificar áudio de {path}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+def probe_duration(path):
+    """Duração do arquivo em segundos via ffprobe (None se indisponível)"""
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, text=True, timeout=30).stdout
+        return float(out.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+class AudioPrefetcher:
+    """Decodifica em segundo plano o áudio dos próximos vídeos enquanto o atual é transcrito.
+
+    No máximo `lookahead` áudios ficam decodificados à frente do vídeo em uso,
+    limitando o consumo de memória.
+    """
+
+    def __init__(self, paths, lookahead=1):
+        self.paths = list(paths)
+        self.lookahead = max(1, int(lookahead))
+        self._results = queue.Queue()
+        # Vagas = vídeo atual + look-ahead; liberadas quando o consumidor avança
+        self._slots = threading.Semaphore(self.lookahead + 1)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+
+    def _worker(self):
+        for path in self.paths:
+            self._slots.acquire()
+            if self._stop.is_set():
+                return
+            try:
+                audio = load_audio(path)
+            except Exception as e:
+                audio = e
+            self._results.put((path, audio))
+
+    def __iter__(self):
+        """Produz (caminho, áudio); áudio é None se a decodificação antecipada falhar"""
+        self._thread.start()
+        try:
+            for index in range(len(self.paths)):
+                if index > 0:
+                    self._slots.release()
+                path, audio = self._results.get()
+                if isinstance(audio, Exception):
+                    logger.warning(f"Pré-carregamento falhou para {path}: {audio}")
+                    audio = None
+                yield path, audio
+        finally:
+            self.close()
+
+    def close(self):
+        self._stop.set()
+        # Desbloqueia a thread caso esteja aguardando uma vaga
+        self._slots.release()
@@ -0,0 +1,149 @@
+import logging
+import importlib.util
+import numpy as np
+from src.core.progress import current_tracker
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros de cada família de modelos do Whisper (estimativa de memória quando o modelo não expõe os pesos)
+_PARAMETERS = {'tiny': 39e6, 'base': 74e6, 'small': 244e6, 'medium': 769e6, 'large': 1550e6, 'turbo': 809e6}
+
+
+def estimated_parameters(model_size):
+    # 'large-v3', 'base.en' -> família; desconhecido conta como o maior (o orçamento erra para o lado seguro)
+    family = model_size.split('.')[0].split('-')[0]
+    return _PARAMETERS.get(family, max(_PARAMETERS.values()))
+
+
+class OpenAIWhisperBackend:
+    """Pacote openai-whisper (PyTorch): CPU ou GPU, com quantização int8 opcional"""
+
+    name = "openai-whisper"
+
+    def load(self, model_size, device=None, quantization=None, cache_directory=None):
+        if quantization == 'int8':
+            from src.core.quantization import load_quantized
+            return load_quantized(model_size, cache_directory)
+        # Importação tardia: evita carregar torch/whisper só para listar arquivos ou exibir ajuda
+        import whisper
+        return whisper.load_model(model_size, device=device)
+
+    def model_bytes(self, model, model_size=None, device=None, quantization=None):
+        """Memória dos pesos; state_dict inclui os pesos int8 empacotados, que não aparecem em parameters()"""
+        try:
+            total = 0
+            for value in model.state_dict().values():
+                for t in (value if isinstance(value, tuple) else (value,)):
+                    if hasattr(t, 'element_size'):
+                        total += t.numel() * t.element_size()
+            return total
+        except Exception:
+            return 0
+
+    def transcribe(self, model, audio, options):
+        # O progresso chega ao rastreador da thread pelo tqdm interceptado (ver progress.install_whisper_hook)
+        return model.transcribe(audio, verbose=False, **options)
+
+    def detect_language(self, model, audio):
+        from src.core.language_detection import detect_language
+        return detect_language(model, audio)
+
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2): várias vezes mais rápido na CPU, mesmos modelos do Whisper"""
+
+    name = "faster-whisper"
+
+    # Opções do openai-whisper aceitas com o mesmo nome pelo faster-whisper
+    _SHARED_OPTIONS = ('language', 'task', 'initial_prompt', 'temperature', 'beam_size', 'best_of',
+                       'patience', 'condition_on_previous_text', 'compression_ratio_threshold',
+                       'no_speech_threshold', 'word_timestamps', 'suppress_tokens', 'without_timestamps')
+
+    def load(self, model_size, device=None, quantization=None, cache_directory=None):
+        from faster_whisper import WhisperModel
+        # int8 no CTranslate2 é nativo: não há conversão prévia a guardar em cache
+        return WhisperModel(model_size, device=device or "auto",
+                            compute_type="int8" if quantization == 'int8' else "default")
+
+    def model_bytes(self, model, model_size=None, device=None, quantization=None):
+        """Estimativa pelo tamanho do modelo: o CTranslate2 não expõe os pesos ao Python"""
+        if quantization == 'int8':
+            bytes_per_parameter = 1
+        elif device and device != 'cpu':
+            bytes_per_parameter = 2  # float16 na GPU
+        else:
+            bytes_per_parameter = 4
+        return int(estimated_parameters(model_size or '') * bytes_per_parameter)
+
+    def _options(self, options):
+        ignored = sorted(set(options) - set(self._SHARED_OPTIONS) - {'fp16', 'verbose'})
+        if ignored:
+            logger.debug(f"Opções sem equivalente no faster-whisper ignoradas: {ignored}")
+        return {k: v for k, v in options.items() if k in self._SHARED_OPTIONS}
+
+    def transcribe(self, model, audio, options):
+        # Caminhos são decodificados pelo próprio faster-whisper, como no openai-whisper
+        if not isinstance(audio, str):
+            audio = np.asarray(audio, dtype=np.float32)
+        segments, info = model.transcribe(audio, **self._options(options))
+        tracker = current_tracker()
+        if tracker is not None:
+            tracker.begin_pass(info.duration)
+
+        # Segmentos no formato do openai-whisper (o que tradução, legendas, cache e manifesto esperam),
+        # gerados sob demanda: o progresso avança a cada um
+        result = []
+        for index, seg in enumerate(segments):
+            result.append({
+                'id': index,
+                'seek': int(getattr(seg, 'seek', 0)),
+                'start': float(seg.start),
+                'end': float(seg.end),
+                'text': seg.text,
+                'tokens': list(seg.tokens),
+                'temperature': float(getattr(seg, 'temperature', 0.0) or 0.0),
+                'avg_logprob': float(seg.avg_logprob),
+                'compression_ratio': float(seg.compression_ratio),
+                'no_speech_prob': float(seg.no_speech_prob),
+            })
+            if tracker is not None:
+                tracker.set_position(seg.end)
+        return {'text': "".join(seg['text'] for seg in result), 'segments': result, 'language': info.language}
+
+    def detect_language(self, model, audio):
+        # A detecção acontece já na chamada; os segmentos (geradores) nunca são consumidos
+        with tracer.span("language_detection"):
+            _, info = model.transcribe(np.asarray(audio, dtype=np.float32), beam_size=1, without_timestamps=True)
+        return info.language, float(info.language_probability)
+
+
+BACKENDS = {backend.name: backend for backend in (OpenAIWhisperBackend(), FasterWhisperBackend())}
+
+
+def get_backend(name):
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Backend de transcrição desconhecido: {name}") from None
+
+
+def backend_from_config(config, device=None):
+    """Backend configurado em transcription.backend (padrão: openai-whisper).
+
+    O faster-whisper só é usado quando pedido: 'faster-whisper', ou 'auto',
+    que o escolhe se estiver instalado e o dispositivo for 'cpu' ou 'auto'.
+    Instalar o pacote, por si só, não troca o decodificador.
+    """
+    name = config.get("transcription.backend", OpenAIWhisperBackend.name) if hasattr(config, 'get') else None
+    if name in (None, ""):
+        name = OpenAIWhisperBackend.name
+    elif name == "auto":
+        if device in (None, 'cpu') and importlib.util.find_spec("faster_whisper") is not None:
+            name = FasterWhisperBackend.name
+        else:
+            name = OpenAIWhisperBackend.name
+    elif name == FasterWhisperBackend.name and importlib.util.find_spec("faster_whisper") is None:
+        logger.warning("faster-whisper não está instalado (pip install faster-whisper); usando openai-whisper")
+        name = OpenAIWhisperBackend.name
+    return get_backend(name)
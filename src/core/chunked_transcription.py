@@ -0,0 +1,168 @@
+import os
+import copy
+import queue
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from src.core.audio import SAMPLE_RATE
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+def plan_chunks(audio, chunk_seconds=600, overlap_seconds=2.0, search_seconds=30, sr=SAMPLE_RATE):
+    """Divide o áudio perto de cada `chunk_seconds`, no ponto mais silencioso da vizinhança.
+
+    Retorna (chunks, cuts): `chunks` são intervalos (início, fim) em amostras,
+    estendidos por `overlap_seconds` em cada lado do corte; `cuts` são os
+    pontos de corte que delimitam o trecho de responsabilidade de cada chunk.
+    """
+    n = len(audio)
+    chunk = int(chunk_seconds * sr)
+    if n <= chunk * 1.5:
+        return [(0, n)], [0, n]
+
+    frame = int(0.03 * sr)
+    n_frames = n // frame
+    energy = np.mean(np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame) ** 2, axis=1)
+    search = int(search_seconds * sr)
+
+    cuts = [0]
+    target = chunk
+    while target < n - chunk // 2:
+        lo = max(cuts[-1] + chunk // 2, target - search) // frame
+        hi = min(n_frames, (target + search) // frame)
+        if hi <= lo:
+            cut = target
+        else:
+            cut = int((lo + int(np.argmin(energy[lo:hi])) + 0.5) * frame)
+        cuts.append(cut)
+        target = cut + chunk
+    cuts.append(n)
+
+    overlap = int(overlap_seconds * sr)
+    chunks = [(max(0, cuts[i] - overlap), min(n, cuts[i + 1] + overlap)) for i in range(len(cuts) - 1)]
+    return chunks, cuts
+
+
+def stitch_results(results, chunks, cuts, sr=SAMPLE_RATE):
+    """Junta os resultados dos chunks na linha do tempo original.
+
+    Na sobreposição entre dois chunks, cada segmento fica com o chunk cujo
+    trecho de responsabilidade contém o seu ponto médio, eliminando duplicatas.
+    """
+    segments = []
+    for result, (chunk_start, _), seam_start, seam_end in zip(results, chunks, cuts[:-1], cuts[1:]):
+        offset = chunk_start / sr
+        lo, hi = seam_start / sr, seam_end / sr
+        for seg in result.get('segments', []):
+            start, end = seg['start'] + offset, seg['end'] + offset
+            if not lo <= (start + end) / 2 < hi:
+                continue
+            new_seg = dict(seg, start=start, end=end)
+            if segments and new_seg['start'] < segments[-1]['end']:
+                new_seg['start'] = min(segments[-1]['end'], new_seg['end'])
+            if seg.get('words'):
+                new_seg['words'] = [dict(w, start=w['start'] + offset, end=w['end'] + offset) for w in seg['words']]
+            segments.append(new_seg)
+
+    for i, seg in enumerate(segments):
+        seg['id'] = i
+    languages = Counter(r.get('language') for r in results if r.get('language'))
+    return {
+        'text': ''.join(seg.get('text', '') for seg in segments),
+        'segments': segments,
+        'language': languages.most_common(1)[0][0] if languages else None,
+    }
+
+
+# Estado próprio de cada processo de chunk
+_chunk_engine = None
+_chunk_events = None
+
+
+def _init_chunk_worker(config_data, events, threads_per_worker):
+    global _chunk_engine, _chunk_events
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads_per_worker))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads_per_worker))
+
+    from src.utils.config_manager import ConfigManager
+    from src.core.transcription_engine import TranscriptionEngine
+    config = ConfigManager()
+    config.config = config_data
+    tracer.configure(config)
+    _chunk_engine = TranscriptionEngine(config)
+    _chunk_events = events
+
+
+def _transcribe_chunk(index, audio):
+    result = _chunk_engine.transcribe(audio, progress_callback=lambda p: _chunk_events.put((index, p)))
+    # Os spans do processo do chunk voltam junto com o resultado
+    return index, result, tracer.drain()
+
+
+class ChunkedTranscriber:
+    """Transcreve um áudio longo em chunks paralelos, cada processo com seu próprio modelo"""
+
+    def __init__(self, config):
+        self.config = config
+        self.chunk_seconds = float(config.get("transcription.long_file.chunk_seconds", 600))
+        self.overlap_seconds = float(config.get("transcription.long_file.overlap_seconds", 2.0))
+        workers = int(config.get("transcription.long_file.workers", 0) or 0)
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 1) // 4)
+
+    def _worker_config(self, language=None):
+        # Cada chunk é transcrito diretamente: sem cache, sem nova divisão e sem pré-carga extra
+        data = copy.deepcopy(getattr(self.config, "config", {}))
+        transcription = data.setdefault('transcription', {})
+        transcription.setdefault('long_file', {})['enabled'] = False
+        transcription['preload'] = False
+        if language:
+            # Idioma já conhecido: todos os chunks usam o mesmo, sem detectar de novo
+            transcription['language'] = language
+        data.setdefault('cache', {})['enabled'] = False
+        return data
+
+    def transcribe(self, audio, progress_callback=None, language=None):
+        chunks, cuts = plan_chunks(audio, self.chunk_seconds, self.overlap_seconds)
+        workers = min(self.workers, len(chunks))
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        logger.info(f"Áudio longo: {len(chunks)} chunks em {workers} processos")
+
+        ctx = multiprocessing.get_context("spawn")
+        events = ctx.Queue()
+        weights = np.array([end - start for start, end in chunks], dtype=np.float64)
+        weights /= weights.sum()
+        percents = np.zeros(len(chunks))
+        results = [None] * len(chunks)
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_chunk_worker,
+            initargs=(self._worker_config(language), events, threads_per_worker),
+        )
+        try:
+            pending = {executor.submit(_transcribe_chunk, i, audio[start:end]) for i, (start, end) in enumerate(chunks)}
+            while pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                while True:
+                    try:
+                        index, value = events.get_nowait()
+                    except queue.Empty:
+                        break
+                    percents[index] = max(percents[index], value)
+                for future in done:
+                    index, result, spans = future.result()
+                    results[index] = result
+                    tracer.extend(spans)
+                    percents[index] = 100
+                if progress_callback:
+                    progress_callback(int(np.dot(percents, weights)))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            events.close()
+
+        return stitch_results(results, chunks, cuts)
@@ -0,0 +1,108 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIRNAME = '.amarelo'
+
+
+def settings_hash(settings):
+    """Hash estável de um dicionário de configurações"""
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class JobManifest:
+    """Manifesto de um diretório de vídeos, para execuções incrementais e retomáveis.
+
+    Cada vídeo tem seu próprio registro JSON em <diretório>/.amarelo/, o que
+    permite que processos do pool atualizem vídeos diferentes sem conflito.
+    O registro guarda tamanho e mtime do vídeo e, para cada etapa concluída
+    (transcription, translation, subtitle), o hash das configurações usadas
+    e o resultado necessário para retomar dali.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, MANIFEST_DIRNAME)
+
+    def _entry_path(self, video_path):
+        return os.path.join(self.directory, os.path.basename(video_path) + '.json')
+
+    @staticmethod
+    def signature(video_path):
+        st = os.stat(video_path)
+        return {'size': st.st_size, 'mtime': st.st_mtime}
+
+    def get(self, video_path):
+        """Registro do vídeo; um registro novo se o arquivo mudou ou não há histórico"""
+        signature = self.signature(video_path)
+        produced = {}
+        try:
+            with open(self._entry_path(video_path), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('size') == signature['size'] and entry.get('mtime') == signature['mtime']:
+                return entry
+            # As saídas antigas continuam no disco mesmo que o vídeo tenha mudado
+            produced = entry.get('produced', {})
+        except (FileNotFoundError, ValueError):
+            pass
+        return {'video': os.path.basename(video_path), **signature, 'stages': {}, 'produced': produced}
+
+    @staticmethod
+    def stage(entry, name, stage_hash):
+        """Dados da etapa se ela foi concluída com as mesmas configurações"""
+        stage = entry.get('stages', {}).get(name)
+        if stage and stage.get('hash') == stage_hash:
+            return stage
+        return None
+
+    def set_stage(self, video_path, entry, name, stage_hash, **data):
+        entry.setdefault('stages', {})[name] = {'hash': stage_hash, **data}
+        # Histórico de tudo o que a etapa já gerou (saídas de configurações anteriores continuam sendo saídas)
+        produced = entry.setdefault('produced', {}).setdefault(name, [])
+        produced.extend(p for p in data.get('outputs', []) if p not in produced)
+        self.save(video_path, entry)
+
+    def is_complete(self, video_path, output_hash, stage_name='subtitle'):
+        """True se os arquivos da etapa existem e foram gerados com as configurações atuais"""
+        try:
+            stage = self.stage(self.get(video_path), stage_name, output_hash)
+        except OSError:
+            return False
+        return bool(stage) and all(os.path.exists(p) for p in stage.get('outputs', []))
+
+    def outputs(self, stage_name):
+        """Caminhos absolutos já gerados pela etapa, em qualquer execução, para os vídeos deste diretório"""
+        paths = set()
+        base = os.path.dirname(self.directory)
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith('.json')]
+        except OSError:
+            return paths
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                recorded = entry.get('produced', {}).get(stage_name, []) + \
+                    (entry.get('stages', {}).get(stage_name) or {}).get('outputs', [])
+            except (OSError, ValueError, AttributeError, TypeError):
+                continue
+            paths.update(os.path.abspath(os.path.join(base, p)) for p in recorded)
+        return paths
+
+    def save(self, video_path, entry):
+        """Gravação atômica (arquivo temporário + rename)"""
+        try:
+            with tracer.span("manifest_save"):
+                os.makedirs(self.directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False,
+                              default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o))
+                os.replace(tmp_path, self._entry_path(video_path))
+        except Exception as e:
+            logger.error(f"Erro ao gravar manifesto de {video_path}: {e}")
@@ -0,0 +1,179 @@
+import os
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict, deque
+from src.core.pipeline import SubtitlePipeline, collect_videos
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class Job:
+    """Um pedido de legendagem: vídeos + ajustes de configuração próprios"""
+
+    def __init__(self, videos, settings=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.videos = videos
+        self.settings = settings or {}
+        self.status = QUEUED
+        self.progress = 0
+        self.current_video = None
+        self.current_progress = 0
+        self.rtf = None
+        self.outputs = []
+        self.files = {}
+        self.error = None
+        self.log = deque(maxlen=50)
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'videos': self.videos,
+            'settings': self.settings,
+            'progress': self.progress,
+            'current_video': self.current_video,
+            'current_progress': self.current_progress,
+            'rtf': self.rtf,
+            'outputs': self.outputs,
+            'files': self.files,
+            'error': self.error,
+            'log': list(self.log),
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+
+class JobQueue:
+    """Fila de jobs executada por threads de longa duração no mesmo processo.
+
+    Os modelos ficam no ModelRegistry e os provedores de tradução no cache do
+    processo, então cada job paga apenas o próprio processamento. Com vários
+    executores, a tradução, a escrita e a decodificação de áudio de um job
+    correm em paralelo com a transcrição de outro; as chamadas ao mesmo modelo
+    Whisper são serializadas pelo registro (ModelRegistry.inference_lock).
+    """
+
+    def __init__(self, config, workers=1, max_history=500):
+        self.config = config
+        self.workers = max(1, int(workers))
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, inputs, settings=None):
+        """Cria e enfileira um job; ValueError se não houver vídeos ou se houver chaves desconhecidas"""
+        settings = dict(settings or {})
+        unknown = [key for key in settings if not self.config.has_key(key)]
+        if unknown:
+            raise ValueError(f"Chaves de configuração desconhecidas: {', '.join(unknown)}")
+        videos = collect_videos(inputs)
+        if not videos:
+            raise ValueError("Nenhum vídeo encontrado")
+
+        job = Job(videos, settings)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._queue.put(job)
+        logger.info(f"Job {job.id} enfileirado ({len(videos)} vídeo(s))")
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def cancel(self, job_id):
+        """Cancela um job ainda na fila (jobs em execução vão até o fim)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.status = CANCELLED
+            job.finished = time.time()
+            return True
+
+    def _prune(self):
+        # Mantém o histórico limitado, descartando primeiro os jobs finalizados mais antigos
+        finished = [jid for jid, job in self._jobs.items() if job.status in (DONE, FAILED, CANCELLED)]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+            self._run(job)
+
+    def _run(self, job):
+        # Cada job tem a própria cópia da configuração; os vídeos rodam neste processo (modelo já carregado)
+        config = self.config.snapshot(job.settings)
+        config.set("performance.workers", 1)
+
+        def on_individual(p):
+            job.current_progress = p
+
+        def on_event(event):
+            job.current_video = event.job_id
+            job.rtf = event.rtf
+
+        pipeline = None
+        try:
+            # O tracing é configurado uma vez, na inicialização do servidor (o rastreador é do processo)
+            pipeline = SubtitlePipeline(config)
+            pipeline.subscribe(on_event)
+            job.outputs = pipeline.run(
+                job.videos,
+                progress_individual=on_individual,
+                progress_general=lambda p: setattr(job, 'progress', p),
+                preview=job.log.append,
+            )
+            # Todos os formatos gerados por vídeo (outputs traz só o principal ou o vídeo com legendas)
+            job.files = {video: [p for p in pipeline.output_paths_for(video) if os.path.exists(p)]
+                         for video in job.videos}
+            job.status = DONE
+            logger.info(f"Job {job.id} concluído")
+        except Exception as e:
+            logger.error(f"Job {job.id} falhou: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+            job.finished = time.time()
@@ -0,0 +1,69 @@
+import logging
+import numpy as np
+from src.core.audio import load_audio, SAMPLE_RATE
+from src.core.vad import detect_speech
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# O Whisper analisa no máximo 30 s por vez; a detecção usa uma única janela desse tamanho
+WINDOW_SECONDS = 30.0
+
+
+def base_language(code):
+    """'pt_BR', 'pt-br', 'PT' -> 'pt' (None para vazio ou 'auto')"""
+    code = (code or '').strip().lower().replace('_', '-').split('-')[0]
+    return None if code in ('', 'auto') else code
+
+
+def same_language(source, target):
+    source, target = base_language(source), base_language(target)
+    return bool(source) and source == target
+
+
+def detection_options(config):
+    """Parâmetros da detecção rápida de idioma, ou None se desativada"""
+    if not hasattr(config, 'get') or not config.get("transcription.language_detection.enabled", True):
+        return None
+    return {
+        'window_seconds': min(WINDOW_SECONDS, float(config.get("transcription.language_detection.window_seconds", 30))),
+        'search_seconds': float(config.get("transcription.language_detection.search_seconds", 120)),
+        'min_probability': float(config.get("transcription.language_detection.min_probability", 0.5)),
+    }
+
+
+def speech_window(audio, window_seconds, sr=SAMPLE_RATE):
+    """Trecho de `window_seconds` a partir da primeira fala (pula vinhetas e silêncio do início)"""
+    window = int(window_seconds * sr)
+    if len(audio) <= window:
+        return audio
+    regions = detect_speech(audio, sr=sr)
+    start = regions[0][0] if regions else 0
+    start = min(start, len(audio) - window)
+    return audio[start:start + window]
+
+
+def load_window(source, options):
+    """Áudio usado na detecção: só os primeiros `search_seconds` são decodificados"""
+    search = max(options['search_seconds'], options['window_seconds'])
+    if isinstance(source, str):
+        audio = load_audio(source, duration=search)
+    else:
+        audio = np.asarray(source)[:int(search * SAMPLE_RATE)]
+    return speech_window(audio, options['window_seconds'])
+
+
+def detect_language(model, audio):
+    """Idioma mais provável de até 30 s de áudio: (código, probabilidade).
+
+    Usa apenas o encoder e um passo do decoder do Whisper, em vez de deixar
+    a detecção para dentro da transcrição completa.
+    """
+    import whisper
+    n_mels = getattr(getattr(model, 'dims', None), 'n_mels', 80)
+    audio = whisper.pad_or_trim(np.asarray(audio, dtype=np.float32))
+    mel = whisper.log_mel_spectrogram(audio, n_mels) if n_mels != 80 else whisper.log_mel_spectrogram(audio)
+    with tracer.span("language_detection"):
+        _, probs = model.detect_language(mel.to(model.device))
+    language = max(probs, key=probs.get)
+    return language, float(probs[language])
@@ -0,0 +1,170 @@
+import logging
+import threading
+from collections import OrderedDict
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """Registro de modelos Whisper compartilhado pelo processo.
+
+    Um único modelo por (tamanho, dispositivo, quantização, backend), carregado
+    sob demanda ou em segundo plano, com remoção LRU quando a soma passa do
+    orçamento de memória. A inferência em cada modelo é serializada por
+    `inference_lock`: o cache de kv do decoder do Whisper fica nos próprios
+    módulos, e duas transcrições simultâneas no mesmo modelo se corromperiam.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        # Evitar múltiplas inicializações
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self._models = OrderedDict()  # chave -> (modelo, bytes); ordem = uso recente
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._inference_locks = {}
+        self.memory_budget = 0  # bytes; 0 = sem limite
+        self.cache_directory = None  # Onde ficam os modelos quantizados (None = cache padrão)
+
+    def set_memory_budget(self, megabytes):
+        self.memory_budget = int(float(megabytes or 0) * 1024 * 1024)
+        with self._lock:
+            self._enforce_budget()
+
+    @staticmethod
+    def _key(model_size, device, quantization=None, backend=None):
+        return (model_size, device or 'auto', quantization or 'float32', backend or 'openai-whisper')
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def inference_lock(self, model_size, device=None, quantization=None, backend=None):
+        """Lock a segurar durante cada chamada ao modelo (transcrição, detecção de idioma)"""
+        key = self._key(model_size, device, quantization, backend)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def get(self, model_size, device=None, quantization=None, backend=None):
+        """Retorna o modelo compartilhado, carregando-o se necessário"""
+        key = self._key(model_size, device, quantization, backend)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+        # Lock por modelo: duas threads pedindo o mesmo tamanho carregam uma vez só
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+
+            model = self._load(*key)
+            size = self._model_bytes(model, *key)
+            with self._lock:
+                self._models[key] = (model, size)
+                self._enforce_budget(keep=key)
+            return model
+
+    def _load(self, model_size, device, quantization, backend):
+        from src.core.backends import get_backend
+        logger.info(f"Carregando modelo Whisper '{model_size}' ({device}, {quantization}, {backend})")
+        with tracer.span("model_load", model=model_size, device=device, quantization=quantization, backend=backend):
+            return get_backend(backend).load(model_size, None if device == 'auto' else device,
+                                             None if quantization == 'float32' else quantization,
+                                             self.cache_directory)
+
+    @staticmethod
+    def _model_bytes(model, model_size, device, quantization, backend):
+        # Cada backend sabe medir (ou estimar) a memória dos próprios modelos
+        from src.core.backends import get_backend
+        return get_backend(backend).model_bytes(model, model_size, None if device == 'auto' else device,
+                                                None if quantization == 'float32' else quantization)
+
+    def _enforce_budget(self, keep=None):
+        """Remove os modelos menos usados até caber no orçamento (chamar com o lock)"""
+        if not self.memory_budget:
+            return
+        total = sum(size for _, size in self._models.values())
+        for key in list(self._models):
+            if total <= self.memory_budget:
+                break
+            if key == keep:
+                continue
+            _, size = self._models.pop(key)
+            total -= size
+            logger.info(f"Modelo {key[0]} ({', '.join(key[1:])}) removido da memória ({size / 2**20:.0f} MB)")
+
+    def preload_async(self, model_size, device=None, quantization=None, backend=None):
+        """Carrega o modelo em segundo plano para que o primeiro vídeo não espere"""
+        def _warm_up():
+            try:
+                self.get(model_size, device, quantization, backend)
+            except Exception as e:
+                logger.error(f"Falha no pré-carregamento do modelo '{model_size}': {e}")
+
+        thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, model_size, device=None, quantization=None, backend=None):
+        with self._lock:
+            return self._key(model_size, device, quantization, backend) in self._models
+
+    def evict(self, model_size, device=None, quantization=None, backend=None):
+        with self._lock:
+            self._models.pop(self._key(model_size, device, quantization, backend), None)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+def device_from_config(config):
+    """Converte transcription.device ('auto', 'cpu', 'cuda'...) para o argumento do Whisper"""
+    device = config.get("transcription.device", "auto") if hasattr(config, 'get') else "auto"
+    return None if not device or device == "auto" else device
+
+
+def model_spec_from_config(config):
+    """(tamanho, dispositivo, quantização, backend) do modelo que o TranscriptionEngine vai pedir"""
+    from src.core.quantization import quantization_from_config
+    from src.core.backends import backend_from_config
+    device = device_from_config(config)
+    quantization = quantization_from_config(config, device)
+    if quantization:
+        # Modelos quantizados rodam apenas na CPU
+        device = 'cpu'
+    model_size = config.get("transcription.model", "base") if hasattr(config, 'get') else "base"
+    return model_size, device, quantization, backend_from_config(config, device).name
+
+
+def warm_up_from_config(config, preload=True):
+    """Aplica o orçamento de memória e pré-carrega o modelo configurado em segundo plano.
+
+    Quem chama passa preload=False quando ainda não sabe se o modelo será
+    usado (ex.: a janela abrindo, sem pasta escolhida) ou quando nada
+    precisa ser transcrito. Com o ModelScheduler ativo o tamanho é escolhido
+    por vídeo, então não há o que pré-carregar.
+    """
+    model_registry.set_memory_budget(config.get("transcription.model_memory_mb", 0))
+    model_registry.cache_directory = config.get("cache.directory") or None
+    if (preload and config.get("transcription.preload", True)
+            and not config.get("transcription.scheduler.enabled", False)):
+        return model_registry.preload_async(*model_spec_from_config(config))
+    return None
+
+
+# Instância global
+model_registry = ModelRegistry()
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import socket
+import logging
+import tempfile
+import threading
+from src.core.audio import probe_duration, SAMPLE_RATE
+from src.core.model_registry import model_spec_from_config
+from src.core.transcription_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Fator de tempo real estimado em CPU (segundos de processamento por segundo de áudio),
+# usado até existir uma medição do modelo neste computador
+_PRIOR_RTF = {'tiny': 0.1, 'base': 0.2, 'small': 0.6, 'medium': 1.6, 'large': 3.2, 'turbo': 1.0}
+
+# Peso de cada nova medição na média móvel
+_EMA_WEIGHT = 0.3
+
+
+def _prior_rtf(model):
+    # 'large-v3', 'base.en' -> família do modelo
+    family = model.split('.')[0].split('-')[0]
+    return _PRIOR_RTF.get(family, 1.0)
+
+
+class SpeedStats:
+    """Velocidade medida de cada modelo, por computador, backend e dispositivo, persistida em JSON"""
+
+    def __init__(self, directory=None, device=None, quantization=None, backend=None):
+        self.path = os.path.join(directory or default_cache_dir(), 'model_speed.json')
+        self.key = "/".join([socket.gethostname(), backend or 'openai-whisper', device or 'auto', quantization or 'float32'])
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def measurements(self):
+        """{modelo: {'rtf', 'samples'}} deste computador (relido a cada chamada: outros processos também medem)"""
+        return self._read().get(self.key, {})
+
+    def rtf(self, model, measurements=None):
+        """(RTF, medido?) do modelo; sem medição, a estimativa conservadora padrão"""
+        entry = (self.measurements() if measurements is None else measurements).get(model)
+        if entry and entry.get('rtf'):
+            return float(entry['rtf']), True
+        return _prior_rtf(model), False
+
+    def record(self, model, audio_seconds, elapsed):
+        if not audio_seconds or audio_seconds <= 0 or elapsed <= 0:
+            return
+        rtf = elapsed / audio_seconds
+        with self._lock:
+            data = self._read()
+            entry = data.setdefault(self.key, {}).get(model)
+            if entry and entry.get('rtf'):
+                rtf = entry['rtf'] * (1 - _EMA_WEIGHT) + rtf * _EMA_WEIGHT
+            data[self.key][model] = {'rtf': round(rtf, 4), 'samples': (entry or {}).get('samples', 0) + 1}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Erro ao gravar velocidade dos modelos: {e}")
+                return
+        logger.info(f"Velocidade de '{model}': RTF {elapsed / audio_seconds:.3g} (média {rtf:.3g})")
+
+
+class ModelScheduler:
+    """Escolhe o tamanho do modelo de cada vídeo para cumprir uma meta de velocidade.
+
+    A meta é um RTF máximo (transcription.scheduler.max_rtf) e/ou um prazo
+    para concluir a fila (deadline_hours). Antes de cada vídeo, o RTF
+    permitido é recalculado com o tempo e o áudio restantes, e o modelo
+    escolhido é o mais preciso cuja velocidade medida neste computador
+    (com a margem de segurança) cabe nele. O tempo medido é o do vídeo
+    inteiro, então tradução e gravação também entram na conta.
+    """
+
+    def __init__(self, config, stats=None):
+        self.models = list(config.get("transcription.scheduler.models", ['tiny', 'base', 'small', 'medium']))
+        self.max_rtf = float(config.get("transcription.scheduler.max_rtf", 0) or 0)
+        self.deadline_hours = float(config.get("transcription.scheduler.deadline_hours", 0) or 0)
+        self.safety_margin = float(config.get("transcription.scheduler.safety_margin", 1.2) or 1.0)
+        if stats is None:
+            _, device, quantization, backend = model_spec_from_config(config)
+            stats = SpeedStats(config.get("cache.directory") or None, device, quantization, backend)
+        self.stats = stats
+        self.workers = 1
+        self._deadline = None
+        self._durations = {}
+        self._remaining = {}
+
+    def identity(self):
+        """Representa o modelo no manifesto: um vídeo já feito por qualquer candidato não é refeito"""
+        return {'scheduler': self.models}
+
+    def duration_of(self, video_path, audio=None):
+        if audio is not None:
+            return len(audio) / SAMPLE_RATE
+        if video_path not in self._durations:
+            self._durations[video_path] = probe_duration(video_path)
+        return self._durations[video_path]
+
+    def begin_batch(self, videos, workers=1):
+        """Início de uma fila: fixa o prazo e soma o áudio a processar"""
+        self.workers = max(1, workers)
+        self._deadline = time.monotonic() + self.deadline_hours * 3600 if self.deadline_hours > 0 else None
+        self._remaining = {v: self.duration_of(v) for v in videos} if self._deadline else {}
+        known = [d for d in self._remaining.values() if d]
+        if self._deadline and len(known) < len(self._remaining):
+            # Duração desconhecida: assume a média dos demais
+            average = sum(known) / len(known) if known else 0
+            self._remaining = {v: d or average for v, d in self._remaining.items()}
+            if not known:
+                logger.warning("Duração dos vídeos desconhecida (ffprobe indisponível?); prazo ignorado")
+
+    def budget(self):
+        """RTF permitido agora (None = sem meta)"""
+        limits = []
+        if self.max_rtf > 0:
+            limits.append(self.max_rtf)
+        remaining = sum(self._remaining.values())
+        if self._deadline is not None and remaining > 0:
+            # Com vários workers, o áudio restante é dividido entre eles
+            limits.append(max(0.0, self._deadline - time.monotonic()) * self.workers / remaining)
+        return min(limits) if limits else None
+
+    def choose(self, video_path):
+        budget = self.budget()
+        if budget is None:
+            return self.models[-1]
+        measurements = self.stats.measurements()
+        for model in reversed(self.models):
+            rtf, measured = self.stats.rtf(model, measurements)
+            if rtf * self.safety_margin <= budget:
+                logger.info(f"{os.path.basename(video_path)}: modelo '{model}' "
+                            f"(RTF {'medido' if measured else 'estimado'} {rtf:.3g}, permitido {budget:.3g})")
+                return model
+        logger.warning(f"{os.path.basename(video_path)}: nenhum modelo cabe no RTF {budget:.3g}; "
+                       f"usando '{self.models[0]}' (prazo em risco)")
+        return self.models[0]
+
+    def done(self, video_path):
+        self._remaining.pop(video_path, None)
+
+    def record(self, model, audio_seconds, elapsed):
+        self.stats.record(model, audio_seconds, elapsed)
@@ -0,0 +1,113 @@
+import os
+import logging
+import subprocess
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# ISO 639-1 (Whisper / tradutores) -> ISO 639-2/B, usado pelo Matroska
+LANGUAGE_CODES = {
+    'af': 'afr', 'ar': 'ara', 'bg': 'bul', 'ca': 'cat', 'cs': 'cze', 'cy': 'wel', 'da': 'dan', 'de': 'ger',
+    'el': 'gre', 'en': 'eng', 'es': 'spa', 'et': 'est', 'eu': 'baq', 'fa': 'per', 'fi': 'fin', 'fr': 'fre',
+    'gl': 'glg', 'he': 'heb', 'hi': 'hin', 'hr': 'hrv', 'hu': 'hun', 'hy': 'arm', 'id': 'ind', 'is': 'ice',
+    'it': 'ita', 'ja': 'jpn', 'ka': 'geo', 'ko': 'kor', 'lt': 'lit', 'lv': 'lav', 'mk': 'mac', 'ms': 'may',
+    'nl': 'dut', 'no': 'nor', 'pl': 'pol', 'pt': 'por', 'ro': 'rum', 'ru': 'rus', 'sk': 'slo', 'sl': 'slv',
+    'sq': 'alb', 'sr': 'srp', 'sv': 'swe', 'ta': 'tam', 'th': 'tha', 'tl': 'tgl', 'tr': 'tur', 'uk': 'ukr',
+    'ur': 'urd', 'vi': 'vie', 'zh': 'chi',
+}
+
+# Onde a forma terminológica (ISO 639-2/T, usada no MP4) difere da bibliográfica
+_TERMINOLOGIC = {
+    'alb': 'sqi', 'arm': 'hye', 'baq': 'eus', 'chi': 'zho', 'cze': 'ces', 'dut': 'nld', 'fre': 'fra',
+    'geo': 'kat', 'ger': 'deu', 'gre': 'ell', 'ice': 'isl', 'mac': 'mkd', 'may': 'msa', 'per': 'fas',
+    'rum': 'ron', 'slo': 'slk', 'wel': 'cym',
+}
+
+# Formato do ffmpeg, codec das legendas novas e formatos de legenda preferidos por contêiner
+CONTAINERS = {
+    'mkv': {'format': 'matroska', 'subtitle_codec': 'copy', 'preferred': ('ass', 'srt', 'vtt'), 'keep_subtitles': True},
+    'mp4': {'format': 'mp4', 'subtitle_codec': 'mov_text', 'preferred': ('srt', 'vtt', 'ass'), 'keep_subtitles': False},
+    'mov': {'format': 'mov', 'subtitle_codec': 'mov_text', 'preferred': ('srt', 'vtt', 'ass'), 'keep_subtitles': False},
+}
+
+
+def language_tag(code, container='mkv'):
+    """Código ISO 639-2 da faixa ('und' se desconhecido); forma /T no MP4/MOV, /B no Matroska"""
+    code = (code or '').lower().split('-')[0].split('_')[0]
+    tag = LANGUAGE_CODES.get(code) or (code if len(code) == 3 else 'und')
+    if container in ('mp4', 'mov'):
+        tag = _TERMINOLOGIC.get(tag, tag)
+    return tag
+
+
+def pick_subtitle(paths, container='mkv'):
+    """Escolhe, entre as legendas geradas, o formato que o contêiner guarda melhor"""
+    by_format = {os.path.splitext(p)[1].lstrip('.').lower(): p for p in paths}
+    for fmt in CONTAINERS[container]['preferred']:
+        if fmt in by_format:
+            return by_format[fmt]
+    return None
+
+
+def count_subtitle_streams(path):
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "s", "-show_entries", "stream=index", "-of", "csv=p=0", path]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, text=True, timeout=60).stdout
+    except (OSError, subprocess.SubprocessError):
+        return 0
+    return len([line for line in out.splitlines() if line.strip()])
+
+
+def mux_subtitles(video_path, tracks, output_path, container='mkv'):
+    """Adiciona legendas como faixas (soft subs) sem recodificar vídeo nem áudio.
+
+    `tracks` é uma lista de dicionários {'path', 'language', 'title'}. No
+    Matroska as faixas de legenda já existentes são mantidas (as de texto de
+    um MP4/MOV convertidas para SRT); no MP4/MOV as novas são convertidas
+    para mov_text (texto, custo desprezível) e as antigas são descartadas,
+    pois podem não ser compatíveis com o contêiner.
+    A gravação é atômica: arquivo parcial + rename.
+    """
+    spec = CONTAINERS[container]
+    cmd = ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", video_path]
+    for track in tracks:
+        cmd += ["-i", track['path']]
+
+    existing = count_subtitle_streams(video_path) if spec['keep_subtitles'] else 0
+    convert_existing = False
+    if spec['keep_subtitles'] and os.path.splitext(video_path)[1].lower() == '.mkv':
+        # Matroska -> Matroska: tudo é mantido, inclusive as fontes anexadas usadas pelo ASS
+        cmd += ["-map", "0"]
+    elif spec['keep_subtitles']:
+        # Outras origens: faixas de dados e legendas mov_text não entram como estão no Matroska
+        cmd += ["-map", "0:v?", "-map", "0:a?", "-map", "0:s?"]
+        convert_existing = existing > 0
+    else:
+        cmd += ["-map", "0:v?", "-map", "0:a?"]
+    for i in range(len(tracks)):
+        cmd += ["-map", f"{i + 1}:0"]
+
+    cmd += ["-c", "copy"]
+    if spec['subtitle_codec'] != 'copy':
+        cmd += ["-c:s", spec['subtitle_codec']]
+    for j in range(existing if convert_existing else 0):
+        cmd += [f"-c:s:{j}", "srt"]
+    for i, track in enumerate(tracks):
+        stream = f"s:s:{existing + i}"
+        cmd += [f"-metadata:{stream}", f"language={language_tag(track.get('language'), container)}"]
+        if track.get('title'):
+            cmd += [f"-metadata:{stream}", f"title={track['title']}"]
+        cmd += [f"-disposition:{stream[2:]}", "default" if i == 0 else "0"]
+
+    temp_path = f"{output_path}.part"
+    cmd += ["-f", spec['format'], temp_path]
+    try:
+        with tracer.span("mux", container=container, tracks=len(tracks)):
+            subprocess.run(cmd, capture_output=True, check=True)
+        os.replace(temp_path, output_path)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Falha ao incorporar legendas em {output_path}: {e.stderr.decode(errors='ignore')}") from e
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return output_path
@@ -0,0 +1,610 @@
+import os
+import copy
+import time
+import glob
+import queue
+import logging
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from src.core.transcription_engine import TranscriptionEngine
+from src.core.translation_engine import TranslationEngine
+from src.core.subtitle_generator import SubtitleGenerator
+from src.core.audio import AudioPrefetcher
+from src.core.model_registry import warm_up_from_config
+from src.core.job_manifest import JobManifest, MANIFEST_DIRNAME, settings_hash
+from src.core.progress import ProgressTracker
+from src.core.muxer import CONTAINERS, mux_subtitles, pick_subtitle
+from src.core.language_detection import detection_options, same_language
+from src.core.model_scheduler import ModelScheduler
+from src.utils.tracing import tracer, export_chrome_trace, format_summary
+from src.utils.config_manager import ConfigSnapshot
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov')
+
+
+def list_videos(directory):
+    """Lista os vídeos compatíveis de um diretório (sem recursão)"""
+    return sorted(f for f in os.listdir(directory) if f.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def collect_videos(inputs):
+    """Resolve diretórios, padrões glob e arquivos em uma lista ordenada de vídeos"""
+    videos = []
+    seen = set()
+
+    def _add(path):
+        path = os.path.abspath(path)
+        if path not in seen and path.lower().endswith(VIDEO_EXTENSIONS) and os.path.isfile(path):
+            seen.add(path)
+            videos.append(path)
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in list_videos(item):
+                _add(os.path.join(item, name))
+        elif glob.has_magic(item):
+            for match in sorted(glob.glob(item, recursive=True)):
+                if os.path.isdir(match):
+                    for name in list_videos(match):
+                        _add(os.path.join(match, name))
+                else:
+                    _add(match)
+        elif os.path.isfile(item):
+            _add(item)
+        else:
+            logger.warning(f"Entrada ignorada (não encontrada): {item}")
+
+    return videos
+
+
+def _emit(callback, value):
+    if callback:
+        callback(value)
+
+
+# Estado próprio de cada processo do pool (um motor por worker)
+_worker_pipeline = None
+_worker_events = None
+
+
+def _init_worker(config_data, events, threads_per_worker, preload):
+    """Inicializa um processo do pool com sua própria configuração e motores"""
+    global _worker_pipeline, _worker_events
+    # Evita que N workers disputem todos os núcleos (torch ainda não foi importado aqui)
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads_per_worker))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads_per_worker))
+
+    from src.utils.config_manager import ConfigManager
+    config = ConfigManager()
+    config.config = config_data
+    tracer.configure(config)
+    _worker_pipeline = SubtitlePipeline(config)
+    _worker_events = events
+    warm_up_from_config(config, preload=preload)
+
+
+def _process_in_worker(index, video_path, model_size=None):
+    _worker_events.put(("start", index, 0))
+    # Os eventos de progresso são serializáveis e seguem pela fila até o processo principal
+    unsubscribe = _worker_pipeline.subscribe(lambda event: _worker_events.put(("event", index, event)))
+    try:
+        # A velocidade medida volta ao processo principal, o único que grava as medições
+        path, speed = _worker_pipeline._process_and_measure(
+            video_path,
+            progress_callback=lambda p: _worker_events.put(("progress", index, p)),
+            preview_callback=lambda text: _worker_events.put(("preview", index, text)),
+            model_size=model_size,
+        )
+    finally:
+        unsubscribe()
+    # Os spans deste processo voltam junto com o resultado
+    return index, path, tracer.drain(), speed
+
+
+class SubtitlePipeline:
+    """Núcleo do fluxo transcrição → tradução → legenda, independente de interface"""
+
+    def __init__(self, config, transcriber=None, translator=None, subtitle_gen=None):
+        self.config = config
+        self.transcriber = transcriber or TranscriptionEngine(self.config)
+        self.translator = translator or TranslationEngine(self.config)
+        self.subtitle_gen = subtitle_gen or SubtitleGenerator(self.config)
+        self._manifests = {}
+        self._listeners = []
+        self.last_trace = None  # (caminho, resumo) do último lote rastreado
+        # Modelo escolhido por vídeo conforme a meta de velocidade (transcription.scheduler)
+        self.scheduler = ModelScheduler(self.config) if self.config.get("transcription.scheduler.enabled", False) else None
+
+    def close(self):
+        """Libera os recursos dos motores (conexão da memória de tradução)"""
+        close = getattr(self.translator, 'close', None)
+        if close:
+            close()
+
+    def subscribe(self, callback):
+        """Recebe os ProgressEvent da transcrição de cada vídeo (CLI, interface, métricas...)"""
+        self._listeners.append(callback)
+
+        def unsubscribe():
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+        return unsubscribe
+
+    def _publish(self, event):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Erro em assinante de progresso: {e}")
+
+    def _tracker_for(self, video_path):
+        tracker = ProgressTracker(os.path.basename(video_path))
+        tracker.subscribe(self._publish)
+        return tracker
+
+    def output_paths_for(self, video_path):
+        """Legendas geradas para o vídeo, uma por formato configurado (a primeira é a principal)"""
+        base = os.path.splitext(video_path)[0]
+        if hasattr(self.subtitle_gen, 'output_paths'):
+            return list(self.subtitle_gen.output_paths(base).values())
+        return [base + ".srt"]
+
+    def output_path_for(self, video_path):
+        return self.output_paths_for(video_path)[0]
+
+    def settings_hashes(self):
+        """Hashes das configurações que afetam cada etapa (cada uma inclui as anteriores)"""
+        transcription = {
+            'model': self.scheduler.identity() if self.scheduler else getattr(self.transcriber, 'model_size', None),
+            'streaming': self.config.get("streaming.enabled", False),
+            'options': (self.transcriber.transcription_options()
+                        if hasattr(self.transcriber, 'transcription_options') else {}),
+        }
+        translation = {
+            **transcription,
+            'enabled': self.config.get("translation.enabled", False),
+            'target': self.config.get("translation.target_language", "pt"),
+            'provider': self.config.get("translation.provider", "google"),
+        }
+        output = {
+            **translation,
+            'font': self.config.get("font", {}),
+            'formats': self.subtitle_gen.formats() if hasattr(self.subtitle_gen, 'formats') else ['srt'],
+        }
+        return {
+            # Idioma detectado: depende só do modelo e da janela analisada
+            'language': settings_hash({'model': transcription['model'], 'detection': detection_options(self.config)}),
+            'transcription': settings_hash(transcription),
+            'translation': settings_hash(translation),
+            'subtitle': settings_hash(output),
+            'mux': settings_hash({**output, 'video': self.config.get("video", {})}),
+        }
+
+    def manifest_for(self, video_path):
+        """Manifesto do diretório do vídeo (None se a retomada estiver desativada)"""
+        if not self.config.get("batch.resume", True):
+            return None
+        directory = os.path.dirname(os.path.abspath(video_path))
+        if directory not in self._manifests:
+            self._manifests[directory] = JobManifest(directory)
+        return self._manifests[directory]
+
+    def is_up_to_date(self, video_path):
+        manifest = self.manifest_for(video_path)
+        if not manifest:
+            return False
+        hashes = self.settings_hashes()
+        if not manifest.is_complete(video_path, hashes['subtitle']):
+            return False
+        return not self.mux_enabled() or manifest.is_complete(video_path, hashes['mux'], 'mux')
+
+    def needs_model(self, videos):
+        """True se algum vídeo ainda precisa ser transcrito.
+
+        Transcrições já feitas (inclusive as vindas do cache) ficam no
+        manifesto; só sem ele não há como saber antes de decodificar o áudio.
+        """
+        hashes = self.settings_hashes()
+        for video_path in videos:
+            manifest = self.manifest_for(video_path)
+            if not manifest or not JobManifest.stage(manifest.get(video_path), 'transcription', hashes['transcription']):
+                return True
+        return False
+
+    def warm_up(self, videos):
+        """Pré-carrega o modelo em segundo plano se algum dos vídeos for precisar dele"""
+        return warm_up_from_config(self.config, preload=self.needs_model(videos))
+
+    def mux_enabled(self):
+        return bool(self.config.get("video.merge_subtitles", False))
+
+    def muxed_path_for(self, video_path):
+        """Vídeo com as legendas embutidas; o sufixo evita sobrescrever o original"""
+        container = self.config.get("video.output_format", "mkv")
+        suffix = self.config.get("video.output_suffix", ".legendado")
+        return f"{os.path.splitext(video_path)[0]}{suffix}.{container}"
+
+    def filter_inputs(self, videos):
+        """Remove as cópias legendadas geradas antes, com quaisquer configurações de mux.
+
+        São excluídos os arquivos `*<sufixo>.mkv/.mp4/.mov` e todo vídeo que o
+        manifesto do diretório registra como saída da etapa de mux (ex.: gerado
+        com outro sufixo), mesmo com o mux desativado agora.
+        """
+        suffix = self.config.get("video.output_suffix", ".legendado")
+        recorded = {}
+        inputs = []
+        for path in videos:
+            base, ext = os.path.splitext(path)
+            if suffix and base.endswith(suffix) and ext.lstrip('.').lower() in CONTAINERS:
+                continue
+            directory = os.path.dirname(os.path.abspath(path))
+            if directory not in recorded:
+                recorded[directory] = JobManifest(directory).outputs('mux')
+            if os.path.abspath(path) not in recorded[directory]:
+                inputs.append(path)
+        return inputs
+
+    def is_output(self, path):
+        """True para cópias legendadas geradas por este pipeline (não devem ser reprocessadas)"""
+        return not self.filter_inputs([path])
+
+    def _mux(self, video_path, outputs, language, manifest, entry, hashes):
+        """Etapa opcional: legenda como faixa do vídeo, por cópia de streams (sem recodificação)"""
+        if not self.mux_enabled():
+            return
+        container = str(self.config.get("video.output_format", "mkv")).lower()
+        if container not in CONTAINERS:
+            logger.error(f"Formato de saída não suportado para incorporar legendas: {container}")
+            return
+        subtitle = pick_subtitle(outputs, container)
+        if subtitle is None:
+            return
+        muxed_path = mux_subtitles(
+            video_path, [{'path': subtitle, 'language': language, 'title': (language or '').upper() or None}],
+            self.muxed_path_for(video_path), container,
+        )
+        if manifest:
+            manifest.set_stage(video_path, entry, 'mux', hashes['mux'], outputs=[muxed_path])
+
+    def _known_language(self, entry, hashes):
+        """Idioma já detectado para este arquivo (manifesto), evitando repetir a detecção"""
+        done = JobManifest.stage(entry, 'language', hashes['language'])
+        return done.get('language') if done else None
+
+    def _remember_language(self, video_path, language, manifest, entry, hashes):
+        if manifest and language and not JobManifest.stage(entry, 'language', hashes['language']):
+            manifest.set_stage(video_path, entry, 'language', hashes['language'], language=language)
+
+    def _skip_translation(self, language, target_lang, preview_callback):
+        """A tradução é dispensada quando o áudio já está no idioma de destino"""
+        if not same_language(language, target_lang):
+            return False
+        logger.info(f"Áudio já está em '{language}': tradução dispensada")
+        _emit(preview_callback, f"⏭️ Áudio já em {language}: tradução dispensada")
+        return True
+
+    def process_video(self, video_path, progress_callback=None, audio=None, preview_callback=None, model_size=None):
+        """Processa um único vídeo e retorna o caminho da legenda gerada.
+
+        `audio` pode trazer o áudio já decodificado (ex.: pelo AudioPrefetcher).
+        No modo streaming, cada legenda nova também é enviada a `preview_callback`.
+        `model_size` substitui o modelo configurado (escolha do ModelScheduler).
+        """
+        path, speed = self._process_and_measure(video_path, progress_callback, audio, preview_callback, model_size)
+        if speed:
+            self.scheduler.record(*speed)
+        return path
+
+    def _process_and_measure(self, video_path, progress_callback=None, audio=None, preview_callback=None,
+                             model_size=None):
+        """(legenda, (modelo, segundos de áudio, tempo gasto) ou None) de um vídeo"""
+        if model_size:
+            self.transcriber.model_size = model_size
+        # Só vídeos realmente transcritos (sem cache nem manifesto) medem a velocidade do modelo
+        transcribed = []
+        unsubscribe = self.subscribe(lambda event: transcribed.append(event.audio_seconds > 0))
+        started = time.monotonic()
+        try:
+            with tracer.span("video", file=os.path.basename(video_path), model=self.transcriber.model_size):
+                path = self._process_video(video_path, progress_callback, audio, preview_callback)
+        finally:
+            unsubscribe()
+        speed = None
+        if self.scheduler and any(transcribed):
+            speed = (self.transcriber.model_size, self.scheduler.duration_of(video_path, audio),
+                     time.monotonic() - started)
+        return path, speed
+
+    def _choose_model(self, video_path, preview=None):
+        if not self.scheduler:
+            return None
+        model = self.scheduler.choose(video_path)
+        _emit(preview, f"🧠 Modelo: {model}")
+        return model
+
+    def _process_video(self, video_path, progress_callback, audio, preview_callback):
+        def report(p):
+            _emit(progress_callback, p)
+
+        # Etapas já concluídas com as mesmas configurações são reaproveitadas do manifesto
+        manifest = self.manifest_for(video_path)
+        entry = manifest.get(video_path) if manifest else {}
+        hashes = self.settings_hashes()
+
+        # 1. Transcrição (0-70%)
+        done = JobManifest.stage(entry, 'transcription', hashes['transcription'])
+        if not done and self.config.get("streaming.enabled", False) and hasattr(self.transcriber, 'transcribe_stream'):
+            source = audio if audio is not None else video_path
+            return self._process_streaming(video_path, source, manifest, entry, hashes, report, preview_callback)
+        if done:
+            segments = done['segments']
+            language = done.get('language')
+            report(70)
+        else:
+            source = audio if audio is not None else video_path
+            with tracer.span("transcription"):
+                result = self.transcriber.transcribe(source, progress_callback=lambda p: report(int(p * 0.7)),
+                                                     tracker=self._tracker_for(video_path),
+                                                     language=self._known_language(entry, hashes))
+            segments = result['segments']
+            language = result.get('language')
+            if manifest:
+                manifest.set_stage(video_path, entry, 'transcription', hashes['transcription'],
+                                   segments=segments, language=result.get('language'))
+            self._remember_language(video_path, language, manifest, entry, hashes)
+
+        # 2. Tradução (70-100%), exceto se o áudio já estiver no idioma de destino
+        target_lang = self.config.get("translation.target_language", "pt")
+        is_enabled = (self.config.get("translation.enabled", False)
+                      and not self._skip_translation(language, target_lang, preview_callback))
+
+        if is_enabled:
+            done = JobManifest.stage(entry, 'translation', hashes['translation'])
+            if done:
+                segments = done['segments']
+                report(100)
+            else:
+                with tracer.span("translation", segments=len(segments)):
+                    segments = self.translator.translate_segments(
+                        segments, target_lang, progress_callback=lambda p: report(70 + int(p * 0.3)),
+                        source_lang=language,
+                    )
+                if manifest:
+                    manifest.set_stage(video_path, entry, 'translation', hashes['translation'], segments=segments)
+        else:
+            report(100)
+
+        # 3. Gerar Arquivos (todos os formatos em uma passagem)
+        outputs = self.output_paths_for(video_path)
+        if not self.subtitle_gen.generate(segments, outputs[0]):
+            raise RuntimeError(f"Falha ao gerar legenda: {outputs[0]}")
+        if manifest:
+            manifest.set_stage(video_path, entry, 'subtitle', hashes['subtitle'], outputs=outputs)
+
+        # 4. Incorporar ao vídeo (opcional)
+        self._mux(video_path, outputs, target_lang if is_enabled else language, manifest, entry, hashes)
+        return outputs[0]
+
+    def _process_streaming(self, video_path, source, manifest, entry, hashes, report, preview_callback):
+        """Transcrição, tradução e escrita em fluxo: cada janela do Whisper vai direto para as legendas"""
+        is_enabled = self.config.get("translation.enabled", False)
+        target_lang = self.config.get("translation.target_language", "pt")
+        outputs = self.output_paths_for(video_path)
+        original, translated = [], []
+        language = None
+
+        with self.subtitle_gen.open_stream(outputs[0]) as writer:
+            stream = self.transcriber.transcribe_stream(
+                source, progress_callback=report, tracker=self._tracker_for(video_path),
+                language=self._known_language(entry, hashes),
+            )
+            for segments, language in stream:
+                original.extend(segments)
+                # O idioma é conhecido a partir da primeira janela
+                if is_enabled and not translated and self._skip_translation(language, target_lang, preview_callback):
+                    is_enabled = False
+                if is_enabled and segments:
+                    with tracer.span("translation", segments=len(segments)):
+                        segments = self.translator.translate_segments(segments, target_lang, source_lang=language)
+                    translated.extend(segments)
+                for seg in segments:
+                    _emit(preview_callback, seg['text'].strip())
+                writer.write(segments)
+
+        self._remember_language(video_path, language, manifest, entry, hashes)
+        if manifest:
+            manifest.set_stage(video_path, entry, 'transcription', hashes['transcription'],
+                               segments=original, language=language)
+            if is_enabled:
+                manifest.set_stage(video_path, entry, 'translation', hashes['translation'], segments=translated)
+            manifest.set_stage(video_path, entry, 'subtitle', hashes['subtitle'], outputs=outputs)
+        self._mux(video_path, outputs, target_lang if is_enabled else language, manifest, entry, hashes)
+        return outputs[0]
+
+    def worker_count(self, total_videos):
+        workers = int(self.config.get("performance.workers", 1) or 1)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, total_videos))
+
+    def run(self, videos, progress_individual=None, progress_general=None, preview=None):
+        """Processa a lista de vídeos e retorna as legendas geradas (na ordem de entrada).
+
+        Vídeos cujas legendas já estão atualizadas segundo o manifesto são ignorados.
+        Com tracing.enabled, grava ao final um trace do lote (ver `last_trace`).
+        """
+        # Cópias legendadas de execuções anteriores não são vídeos de entrada
+        videos = self.filter_inputs(videos)
+        with tracer.span("run", videos=len(videos)):
+            outputs = self._run(videos, progress_individual, progress_general, preview)
+        if tracer.enabled:
+            self.last_trace = self._export_trace(videos)
+        return outputs
+
+    def _export_trace(self, videos):
+        events = tracer.drain()
+        path = self.config.get("tracing.output", "")
+        if not path:
+            directory = os.path.dirname(os.path.abspath(videos[0])) if videos else os.getcwd()
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(directory, MANIFEST_DIRNAME, "traces", f"trace-{stamp}.json")
+        summary = format_summary(events)
+        try:
+            export_chrome_trace(events, path)
+            logger.info(f"Trace gravado em {path}\n{summary}")
+        except OSError as e:
+            logger.error(f"Erro ao gravar trace: {e}")
+            path = None
+        return path, summary
+
+    def _run(self, videos, progress_individual, progress_general, preview):
+        outputs = {}
+        pending = []
+        for video_path in videos:
+            if self.is_up_to_date(video_path):
+                outputs[video_path] = self.output_path_for(video_path)
+                _emit(preview, f"⏭️ Já atualizado: {os.path.basename(video_path)}")
+            else:
+                pending.append(video_path)
+
+        if self.scheduler:
+            self.scheduler.begin_batch(pending, self.worker_count(len(pending)))
+        if not pending:
+            _emit(progress_general, 100)
+        elif self.worker_count(len(pending)) > 1:
+            outputs.update(zip(pending, self._run_parallel(pending, progress_individual, progress_general, preview)))
+        else:
+            outputs.update(zip(pending, self._run_sequential(pending, progress_individual, progress_general, preview)))
+        return [outputs[v] for v in videos]
+
+    def prefetch_lookahead(self):
+        """Vídeos com áudio decodificado à frente; nenhum no streaming, que lê cada arquivo aos poucos"""
+        if self.config.get("streaming.enabled", False):
+            return 0
+        return int(self.config.get("performance.prefetch", 1) or 0)
+
+    def _run_sequential(self, videos, progress_individual=None, progress_general=None, preview=None):
+        total_videos = len(videos)
+        outputs = []
+        _emit(progress_general, 0)
+        _emit(progress_individual, 0)
+
+        lookahead = self.prefetch_lookahead()
+        if lookahead > 0 and total_videos > 1:
+            queue_iter = AudioPrefetcher(videos, lookahead=lookahead)
+        else:
+            queue_iter = ((v, None) for v in videos)
+
+        for index, (video_path, audio) in enumerate(queue_iter):
+            _emit(preview, f"<b>🎬 Processando ({index+1}/{total_videos}):</b> {os.path.basename(video_path)}")
+
+            base_geral = int((index / total_videos) * 100)
+            porcao_video = 100 / total_videos
+
+            def update_sync_progress(p_ind):
+                _emit(progress_individual, p_ind)
+                # Sincronização em tempo real da barra geral
+                _emit(progress_general, int(base_geral + (p_ind * porcao_video / 100)))
+
+            model_size = self._choose_model(video_path, preview)
+            outputs.append(self.process_video(video_path, progress_callback=update_sync_progress, audio=audio,
+                                              preview_callback=preview, model_size=model_size))
+            if self.scheduler:
+                self.scheduler.done(video_path)
+            del audio
+
+        cache = getattr(self.transcriber, "cache", None)
+        if cache is not None:
+            logger.info(f"Cache de transcrição: {cache.stats()}")
+
+        _emit(progress_general, 100)
+        return outputs
+
+    def _worker_config(self, workers):
+        """Configuração enviada aos processos do pool.
+
+        Cada processo tem o próprio limitador de taxa da tradução; a taxa é
+        dividida entre eles para que o provedor receba, somados, os
+        translation.requests_per_second configurados.
+        """
+        worker_config = ConfigSnapshot(copy.deepcopy(getattr(self.config, "config", {})))
+        rate = float(self.config.get("translation.requests_per_second", 5) or 0)
+        if rate > 0:
+            worker_config.set("translation.requests_per_second", rate / workers)
+        return worker_config.config
+
+    def _run_parallel(self, videos, progress_individual=None, progress_general=None, preview=None):
+        """Distribui os vídeos entre processos, cada um com seu próprio TranscriptionEngine"""
+        total_videos = len(videos)
+        workers = self.worker_count(total_videos)
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        logger.info(f"Processando {total_videos} vídeos com {workers} workers ({threads_per_worker} threads cada)")
+
+        # 'spawn' evita herdar threads (Qt, torch) do processo principal via fork
+        ctx = multiprocessing.get_context("spawn")
+        events = ctx.Queue()
+        percents = [0] * total_videos
+        outputs = [None] * total_videos
+        last_index = 0
+
+        _emit(progress_general, 0)
+        _emit(progress_individual, 0)
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._worker_config(workers), events, threads_per_worker, self.needs_model(videos)),
+        )
+        # Com o scheduler, só um vídeo por worker é enviado por vez: cada modelo é escolhido com as medições mais recentes
+        in_flight = workers if self.scheduler else total_videos
+        queued = list(enumerate(videos))[::-1]
+        pending = set()
+        try:
+            while pending or queued:
+                while queued and len(pending) < in_flight:
+                    index, video_path = queued.pop()
+                    pending.add(executor.submit(_process_in_worker, index, video_path,
+                                                self._choose_model(video_path, preview)))
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+
+                # Mescla o progresso enviado pelos workers
+                while True:
+                    try:
+                        kind, index, value = events.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "preview":
+                        _emit(preview, value)
+                        continue
+                    if kind == "event":
+                        self._publish(value)
+                        continue
+                    if kind == "start":
+                        _emit(preview, f"<b>🎬 Processando ({index+1}/{total_videos}):</b> {os.path.basename(videos[index])}")
+                    percents[index] = max(percents[index], value)
+                    last_index = index
+
+                for future in done:
+                    index, path, trace_events, speed = future.result()
+                    tracer.extend(trace_events)
+                    if speed and self.scheduler:
+                        self.scheduler.record(*speed)
+                    percents[index] = 100
+                    outputs[index] = path
+                    if self.scheduler:
+                        self.scheduler.done(videos[index])
+                    _emit(preview, f"✅ Concluído: {os.path.basename(videos[index])}")
+
+                _emit(progress_individual, percents[last_index])
+                _emit(progress_general, int(sum(percents) / total_videos))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            events.close()
+
+        _emit(progress_general, 100)
+        return outputs
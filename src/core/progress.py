@@ -0,0 +1,190 @@
+import sys
+import time
+import types
+import logging
+import threading
+import contextlib
+import importlib
+
+logger = logging.getLogger(__name__)
+
+# O Whisper conta o progresso em quadros do espectrograma (100 por segundo de áudio)
+WHISPER_FRAMES_PER_SECOND = 100
+
+
+class ProgressEvent:
+    """Instantâneo do progresso de um job (serializável, pode cruzar processos)"""
+
+    __slots__ = ('job_id', 'percent', 'audio_seconds', 'total_seconds', 'elapsed', 'rtf')
+
+    def __init__(self, job_id, percent, audio_seconds, total_seconds, elapsed):
+        self.job_id = job_id
+        self.percent = percent
+        self.audio_seconds = audio_seconds
+        self.total_seconds = total_seconds
+        self.elapsed = elapsed
+        # Fator de tempo real: segundos de processamento por segundo de áudio (< 1 = mais rápido que o real)
+        self.rtf = (elapsed / audio_seconds) if audio_seconds else None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        rtf = f"{self.rtf:.2f}" if self.rtf is not None else "-"
+        return (f"ProgressEvent({self.job_id!r}, {self.percent}%, "
+                f"{self.audio_seconds:.1f}/{self.total_seconds or 0:.1f}s, rtf={rtf})")
+
+
+class ProgressTracker:
+    """Progresso de um job, seguro entre threads, com assinantes e emissão limitada.
+
+    Os eventos saem no máximo a cada `min_interval` segundos (e sempre que o
+    job termina), o que evita inundar a interface com um sinal por quadro.
+    """
+
+    def __init__(self, job_id, total_seconds=None, min_interval=0.2):
+        self.job_id = job_id
+        self.total_seconds = total_seconds
+        self.min_interval = min_interval
+        self.audio_seconds = 0.0
+        self._percent = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._last_emit = 0.0
+        self._last_percent = -1
+
+    def subscribe(self, callback):
+        """Registra callback(ProgressEvent); retorna função para cancelar a inscrição"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def begin_pass(self, total_seconds):
+        """Chamado quando o modelo começa a percorrer o áudio; define o total se ainda não conhecido"""
+        with self._lock:
+            if self.total_seconds is None:
+                self.total_seconds = total_seconds
+
+    def advance(self, seconds):
+        with self._lock:
+            self.audio_seconds += seconds
+            event = self._update_locked()
+        self._publish(event)
+
+    def set_position(self, seconds):
+        """Posição absoluta no áudio (nunca retrocede)"""
+        with self._lock:
+            self.audio_seconds = max(self.audio_seconds, seconds)
+            event = self._update_locked()
+        self._publish(event)
+
+    def set_percent(self, percent):
+        """Para etapas sem medida em segundos de áudio"""
+        with self._lock:
+            self._percent = max(self._percent, min(100, int(percent)))
+            event = self._maybe_event_locked()
+        self._publish(event)
+
+    def finish(self):
+        """Marca o job como concluído e retorna o evento final (sempre emitido)"""
+        with self._lock:
+            self._percent = 100
+            event = self._maybe_event_locked(force=True)
+        self._publish(event)
+        return event
+
+    @property
+    def percent(self):
+        with self._lock:
+            return self._percent
+
+    def _update_locked(self):
+        if self.total_seconds:
+            self._percent = max(self._percent, min(99, int(self.audio_seconds / self.total_seconds * 100)))
+        return self._maybe_event_locked()
+
+    def _maybe_event_locked(self, force=False):
+        now = time.monotonic()
+        if not force:
+            if self._percent == self._last_percent or now - self._last_emit < self.min_interval:
+                return None
+        self._last_emit = now
+        self._last_percent = self._percent
+        return ProgressEvent(self.job_id, self._percent, self.audio_seconds, self.total_seconds, now - self._started)
+
+    def _publish(self, event):
+        if event is None:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Erro em assinante de progresso: {e}")
+
+
+# Rastreador ativo da thread atual (cada transcrição simultânea tem o seu)
+_local = threading.local()
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+def current_tracker():
+    return getattr(_local, 'tracker', None)
+
+
+@contextlib.contextmanager
+def progress_scope(tracker):
+    """Direciona o progresso do Whisper, nesta thread, para `tracker`"""
+    install_whisper_hook()
+    previous = current_tracker()
+    _local.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        _local.tracker = previous
+
+
+def install_whisper_hook():
+    """Substitui, uma única vez e só dentro do whisper.transcribe, o tqdm por um que roteia por thread"""
+    global _hook_installed
+    if _hook_installed:
+        return
+    with _hook_lock:
+        if _hook_installed:
+            return
+        try:
+            module = sys.modules.get('whisper.transcribe') or importlib.import_module('whisper.transcribe')
+        except ImportError:
+            return
+        base = module.tqdm.tqdm
+
+        class RoutedTqdm(base):
+            def __init__(self, *args, **kwargs):
+                tracker = current_tracker()
+                if tracker is not None:
+                    kwargs['disable'] = True  # O progresso vai para o rastreador, não para o terminal
+                    total = kwargs.get('total')
+                    if total:
+                        tracker.begin_pass(total / WHISPER_FRAMES_PER_SECOND)
+                self._tracker = tracker
+                super().__init__(*args, **kwargs)
+
+            def update(self, n=1):
+                if self._tracker is not None:
+                    self._tracker.advance(n / WHISPER_FRAMES_PER_SECOND)
+                return super().update(n)
+
+        module.tqdm = types.SimpleNamespace(tqdm=RoutedTqdm)
+        _hook_installed = True
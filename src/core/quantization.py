@@ -0,0 +1,93 @@
+import os
+import logging
+import tempfile
+from src.core.transcription_cache import default_cache_dir
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Modos aceitos em transcription.quantization
+QUANTIZATION_MODES = ('none', 'int8')
+
+
+def quantization_from_config(config, device=None):
+    """'int8' se a quantização foi pedida e o modelo vai rodar na CPU; senão None"""
+    mode = str(config.get("transcription.quantization", "none") if hasattr(config, 'get') else "none").lower()
+    if mode in ('', 'none'):
+        return None
+    if mode not in QUANTIZATION_MODES:
+        logger.warning(f"Quantização desconhecida '{mode}'; usando float32")
+        return None
+    if device not in (None, 'cpu'):
+        logger.warning(f"Quantização {mode} só se aplica à CPU; dispositivo '{device}' usa float32")
+        return None
+    return mode
+
+
+def cache_path(model_size, directory=None):
+    """Arquivo do modelo quantizado; as versões entram no nome (o formato serializado muda entre elas)"""
+    import torch
+    import whisper
+    torch_version = torch.__version__.split('+')[0]
+    whisper_version = getattr(whisper, '__version__', 'unknown')
+    name = f"whisper-{model_size}-int8-torch{torch_version}-whisper{whisper_version}.pt"
+    return os.path.join(directory or default_cache_dir(), 'models', name)
+
+
+def _plain_linears(module):
+    """Troca o Linear do Whisper (subclasse que converte o dtype) pelo nn.Linear padrão.
+
+    quantize_dynamic só reconhece o tipo exato nn.Linear; os pesos são os mesmos.
+    """
+    import torch
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            plain.weight = child.weight
+            plain.bias = child.bias
+            setattr(module, name, plain)
+        else:
+            _plain_linears(child)
+
+
+def quantize_int8(model):
+    """Quantização dinâmica int8 das camadas lineares (pesos int8, ativações quantizadas em tempo de execução)"""
+    import torch
+    if torch.backends.quantized.engine == 'none':
+        supported = [e for e in torch.backends.quantized.supported_engines if e != 'none']
+        if not supported:
+            raise RuntimeError("Este build do PyTorch não tem backend de quantização")
+        torch.backends.quantized.engine = supported[0]
+    model = model.cpu().float().eval()
+    _plain_linears(model)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_quantized(model_size, directory=None):
+    """Modelo int8 do disco; na primeira vez converte o float32 e grava (o custo é pago uma vez só)"""
+    import torch
+    import whisper
+    path = cache_path(model_size, directory)
+    if os.path.exists(path):
+        try:
+            with tracer.span("model_load", model=model_size, quantization="int8", cached=True):
+                return torch.load(path, map_location='cpu', weights_only=False)
+        except Exception as e:
+            logger.warning(f"Modelo quantizado em cache ilegível ({e}); convertendo de novo")
+
+    with tracer.span("quantize", model=model_size):
+        model = quantize_int8(whisper.load_model(model_size, device='cpu'))
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            torch.save(model, f)
+        os.replace(tmp_path, path)
+        logger.info(f"Modelo '{model_size}' quantizado (int8) gravado em {path}")
+    except Exception as e:
+        logger.error(f"Erro ao gravar modelo quantizado: {e}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return model
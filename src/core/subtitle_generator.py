@@ -1,7 +1,94 @@
+import os
+import logging
+import numpy as np
+from src.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Extensão de cada formato suportado
+SUBTITLE_FORMATS = {'srt': '.srt', 'vtt': '.vtt', 'ass': '.ass'}
+
+# Padrão e unidades por segundo dos tempos de cada formato (ASS usa centésimos)
+_TIME_FORMATS = {
+    'srt': ("%02d:%02d:%02d,%03d", 1000),
+    'vtt': ("%02d:%02d:%02d.%03d", 1000),
+    'ass': ("%d:%02d:%02d.%02d", 100),
+}
+
+# Tamanho da fonte no ASS (PlayResY = 288) a partir da opção da interface
+_ASS_SIZES = {"Pequeno": 12, "Médio": 18, "Grande": 24}
+
+_ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 384
+PlayResY: 288
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, \
+Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, \
+MarginV, Encoding
+Style: Default,{name},{size},{color},&H000000FF,&H00000000,&H80000000,{bold},0,0,0,100,100,0,0,1,2,1,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def format_timestamps(seconds, fmt='srt'):
+    """Formata vários tempos de uma vez (divisões vetorizadas com NumPy).
+
+    Mesma aritmética de SubtitleGenerator.format_timestamp (fração truncada,
+    não arredondada), então o texto é idêntico ao da versão escalar.
+    """
+    pattern, scale = _TIME_FORMATS[fmt]
+    values = np.maximum(np.asarray(seconds, dtype=np.float64), 0.0)
+    hours = np.floor_divide(values, 3600).astype(np.int64)
+    minutes = np.floor_divide(np.remainder(values, 3600), 60).astype(np.int64)
+    secs = np.remainder(values, 60).astype(np.int64)
+    frac = ((values - np.trunc(values)) * scale).astype(np.int64)
+    return [pattern % parts for parts in zip(hours.tolist(), minutes.tolist(), secs.tolist(), frac.tolist())]
+
+
+def _ass_color(hex_color):
+    """#RRGGBB -> &H00BBGGRR (ordem de cores do ASS)"""
+    value = hex_color.lstrip('#')
+    if len(value) != 6:
+        value = "f4c430"
+    return f"&H00{value[4:6]}{value[2:4]}{value[0:2]}".upper()
+
+
+def _escape_vtt(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_ass(text):
+    # Chaves abririam blocos de override; quebras de linha viram \N
+    return text.replace("{", "(").replace("}", ")").replace("\n", "\\N")
+
+
 class SubtitleGenerator:
     def __init__(self, config_manager=None):
         self.config = config_manager
 
+    def formats(self):
+        """Formatos configurados (subtitle.formats), na ordem; o primeiro é o principal"""
+        formats = self.config.get("subtitle.formats", ["srt"]) if hasattr(self.config, 'get') else ["srt"]
+        if isinstance(formats, str):
+            formats = [formats]
+        invalid = [f for f in formats if not f or f.lower() not in SUBTITLE_FORMATS]
+        if invalid:
+            logger.warning(f"Formatos de legenda ignorados: {invalid}")
+        return list(dict.fromkeys(f.lower() for f in formats if f and f.lower() in SUBTITLE_FORMATS)) or ["srt"]
+
+    def output_paths(self, output_path, formats=None):
+        """Caminho de cada formato a partir de um caminho base (a extensão atual é trocada)"""
+        base, ext = os.path.splitext(output_path)
+        if ext.lower() not in SUBTITLE_FORMATS.values():
+            base = output_path
+        return {fmt: base + SUBTITLE_FORMATS[fmt] for fmt in (formats or self.formats())}
+
     def format_timestamp(self, seconds):
         """Converte segundos para o formato SRT: HH:MM:SS,mmm"""
         td_hours = int(seconds // 3600)
@@ -10,32 +97,117 @@ class SubtitleGenerator:
         td_msecs = int((seconds - int(seconds)) * 1000)
         return f"{td_hours:02d}:{td_mins:02d}:{td_secs:02d},{td_msecs:03d}"
 
-    def generate(self, segments, output_path):
-        """Gera o arquivo .srt aplicando cor, negrito e tamanho"""
-        color = self.config.get("font_color", "#f4c430")
-        is_bold = self.config.get("font_bold", True)
-        
-        # Mapeamento de tamanho (SRT aceita tags de fonte em players modernos)
-        size_map = {"Pequeno": "12", "Médio": "18", "Grande": "24"}
-        size_label = self.config.get("font_size_label", "Médio")
-        font_size = size_map.get(size_label, "18")
+    def _style(self):
+        color = self.config.get("font.color", "#f4c430")
+        is_bold = self.config.get("font.bold", True)
+        return color, is_bold
+
+    def _srt_tags(self):
+        # O SRT não tem cabeçalho de estilo: as tags vão em cada legenda (calculadas uma vez)
+        color, is_bold = self._style()
+        prefix, suffix = f'<font color="{color}">', '</font>'
+        if is_bold:
+            prefix, suffix = f'<b>{prefix}', f'{suffix}</b>'
+        return prefix, suffix
+
+    def style_text(self, text):
+        """Aplica cor e negrito (tags aceitas por players modernos)"""
+        prefix, suffix = self._srt_tags()
+        return f"{prefix}{text}{suffix}"
+
+    def header(self, fmt):
+        """Início do arquivo: no VTT e no ASS o estilo é declarado aqui, uma única vez"""
+        if fmt == 'vtt':
+            color, is_bold = self._style()
+            weight = "bold" if is_bold else "normal"
+            return f"WEBVTT\n\nSTYLE\n::cue {{\n  color: {color};\n  font-weight: {weight};\n}}\n\n"
+        if fmt == 'ass':
+            color, is_bold = self._style()
+            size = _ASS_SIZES.get(self.config.get("font.size_label", ""), self.config.get("font.size", 18))
+            return _ASS_HEADER.format(name=self.config.get("font.name", "Arial"), size=size,
+                                      color=_ass_color(color), bold=-1 if is_bold else 0)
+        return ""
 
+    def render(self, segments, formats=None, first_index=1):
+        """Percorre os segmentos uma vez e devolve {formato: texto das legendas} (sem cabeçalho)"""
+        formats = formats or self.formats()
+        starts, ends, texts = [], [], []
+        for segment in segments:
+            starts.append(segment['start'])
+            ends.append(segment['end'])
+            texts.append(segment['text'].strip())
+
+        rendered = {}
+        for fmt in formats:
+            begin = format_timestamps(starts, fmt)
+            finish = format_timestamps(ends, fmt)
+            if fmt == 'srt':
+                prefix, suffix = self._srt_tags()
+                cues = [f"{i}\n{s} --> {e}\n{prefix}{t}{suffix}\n\n"
+                        for i, s, e, t in zip(range(first_index, first_index + len(texts)), begin, finish, texts)]
+            elif fmt == 'vtt':
+                cues = [f"{s} --> {e}\n{_escape_vtt(t)}\n\n" for s, e, t in zip(begin, finish, texts)]
+            else:
+                cues = [f"Dialogue: 0,{s},{e},Default,,0,0,0,,{_escape_ass(t)}\n" for s, e, t in zip(begin, finish, texts)]
+            rendered[fmt] = "".join(cues)
+        return rendered
+
+    def generate(self, segments, output_path, formats=None):
+        """Gera as legendas em cada formato configurado (um arquivo por formato, gravado de uma vez)"""
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                for i, segment in enumerate(segments, start=1):
-                    start = self.format_timestamp(segment['start'])
-                    end = self.format_timestamp(segment['end'])
-                    text = segment['text'].strip()
-                    
-                    # Aplica Formatação Visual
-                    styled_text = f'<font color="{color}">{text}</font>'
-                    if is_bold:
-                        styled_text = f'<b>{styled_text}</b>'
-                    
-                    f.write(f"{i}\n")
-                    f.write(f"{start} --> {end}\n")
-                    f.write(f"{styled_text}\n\n")
+            paths = self.output_paths(output_path, formats)
+            with tracer.span("write_subtitle", segments=len(segments), formats=",".join(paths)):
+                rendered = self.render(segments, list(paths))
+                for fmt, path in paths.items():
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(self.header(fmt) + rendered[fmt])
             return True
         except Exception as e:
-            print(f"Erro ao gerar SRT: {e}")
-            return False
\ No newline at end of file
+            logger.error(f"Erro ao gerar legendas: {e}")
+            return False
+
+    def open_stream(self, output_path, formats=None):
+        return StreamingSubtitleWriter(self, output_path, formats)
+
+
+class StreamingSubtitleWriter:
+    """Escreve as legendas aos poucos: cada lote é gravado e sincronizado em disco.
+
+    Se o processo cair no meio, os arquivos contêm todas as legendas já emitidas.
+    """
+
+    def __init__(self, generator, output_path, formats=None):
+        self.generator = generator
+        self.paths = generator.output_paths(output_path, formats)
+        self.count = 0
+        self._files = {}
+        try:
+            for fmt, path in self.paths.items():
+                self._files[fmt] = open(path, "w", encoding="utf-8")
+                self._files[fmt].write(generator.header(fmt))
+        except Exception:
+            self.close()
+            raise
+
+    def write(self, segments):
+        if not segments:
+            return
+        with tracer.span("write_subtitle", segments=len(segments)):
+            rendered = self.generator.render(segments, list(self._files), first_index=self.count + 1)
+            self.count += len(segments)
+            for fmt, f in self._files.items():
+                f.write(rendered[fmt])
+                f.flush()
+                os.fsync(f.fileno())
+
+    def close(self):
+        for f in self._files.values():
+            if not f.closed:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
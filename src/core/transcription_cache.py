@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir():
+    return os.path.join(os.path.expanduser('~'), '.amarelo_legendas', 'cache')
+
+
+def audio_fingerprint(audio):
+    """Impressão digital do conteúdo do áudio decodificado (independe de nome/container)"""
+    return hashlib.sha256(np.ascontiguousarray(audio)).hexdigest()
+
+
+class TranscriptionCache:
+    """Cache em disco dos resultados do Whisper, endereçado pelo conteúdo do áudio.
+
+    Cada entrada é um JSON; o mtime do arquivo marca o último uso e a remoção
+    segue LRU quando o tamanho total passa de `max_bytes`.
+    """
+
+    def __init__(self, directory=None, max_bytes=512 * 1024 * 1024):
+        self.directory = os.path.join(directory or default_cache_dir(), 'transcriptions')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint, model_size, options=None):
+        payload = json.dumps(
+            {'audio': fingerprint, 'model': model_size, 'options': options or {}},
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)  # Marca como usado recentemente (LRU)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key, result):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {k: result[k] for k in ('text', 'segments', 'language') if k in result}
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Erro ao gravar cache de transcrição: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas até caber em max_bytes"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
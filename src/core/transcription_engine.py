@@ -1,51 +1,291 @@
-import whisper
 import logging
-import tqdm
 import os
+import numpy as np
+from src.core.audio import load_audio, stream_audio, probe_duration, SAMPLE_RATE
+from src.core.transcription_cache import TranscriptionCache, audio_fingerprint
+from src.core.model_registry import model_registry, model_spec_from_config
+from src.core.backends import get_backend
+from src.core.vad import detect_speech, SpeechTimeline
+from src.core.chunked_transcription import ChunkedTranscriber
+from src.core.progress import ProgressTracker, progress_scope
+from src.core.language_detection import base_language, detection_options, load_window
+from src.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
-class ProgressHook(tqdm.tqdm):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.progress_callback = None
-
-    def update(self, n=1):
-        displayed = super().update(n)
-        if self.progress_callback and self.total:
-            percentage = int((self.n / self.total) * 100)
-            self.progress_callback(min(percentage, 100))
-        return displayed
-
 class TranscriptionEngine:
     def __init__(self, config_manager=None):
         self.config = config_manager
-        self._model = None
-        # Pegar o modelo do config ou default 'base'
-        self.model_size = "base"
-        if hasattr(self.config, 'get'):
-            self.model_size = self.config.get("transcription.model", "base")
+        # Modelo, dispositivo, quantização e backend (openai-whisper ou faster-whisper) vêm do config
+        self.model_size, self.device, self.quantization, backend = model_spec_from_config(self.config)
+        self.backend = get_backend(backend)
+        self.cache = self._create_cache()
+
+    def _create_cache(self):
+        if not hasattr(self.config, 'get') or not self.config.get("cache.enabled", True):
+            return None
+        try:
+            max_mb = float(self.config.get("cache.transcription_max_mb", 512))
+            return TranscriptionCache(self.config.get("cache.directory") or None, max_bytes=int(max_mb * 1024 * 1024))
+        except Exception as e:
+            logger.error(f"Cache de transcrição desativado: {e}")
+            return None
+
+    def decode_options(self):
+        """Opções repassadas ao Whisper"""
+        # fp16 não existe na CPU: evita o aviso do Whisper a cada chamada
+        return {'fp16': False} if self.quantization else {}
+
+    def vad_options(self):
+        """Parâmetros da detecção de voz, ou None se desativada"""
+        if not hasattr(self.config, 'get') or not self.config.get("transcription.vad.enabled", False):
+            return None
+        return {
+            'margin_db': float(self.config.get("transcription.vad.margin_db", 12.0)),
+            'min_speech_ms': int(self.config.get("transcription.vad.min_speech_ms", 250)),
+            'min_silence_ms': int(self.config.get("transcription.vad.min_silence_ms", 500)),
+            'pad_ms': int(self.config.get("transcription.vad.pad_ms", 200)),
+            'speech_band_ratio': float(self.config.get("transcription.vad.speech_band_ratio", 0.0)),
+        }
+
+    def long_file_options(self):
+        """Parâmetros do modo de chunks paralelos para arquivos longos, ou None se desativado"""
+        if not hasattr(self.config, 'get') or not self.config.get("transcription.long_file.enabled", False):
+            return None
+        return {
+            'min_seconds': float(self.config.get("transcription.long_file.min_seconds", 1800)),
+            'chunk_seconds': float(self.config.get("transcription.long_file.chunk_seconds", 600)),
+            'overlap_seconds': float(self.config.get("transcription.long_file.overlap_seconds", 2.0)),
+        }
+
+    def language_option(self, language=None):
+        """Idioma fixado para o Whisper: o informado (ex.: já detectado antes) ou o da configuração"""
+        if language is None and hasattr(self.config, 'get'):
+            language = self.config.get("transcription.language", "auto")
+        return base_language(language)
+
+    def resolve_language(self, source, language=None):
+        """Idioma a repassar ao Whisper; sem idioma conhecido, faz a detecção rápida"""
+        language = self.language_option(language)
+        if language is None:
+            language, _ = self.detect_language(source)
+        return language
+
+    def detect_language(self, source):
+        """Detecção rápida em uma janela curta: (idioma, probabilidade) ou (None, 0.0).
+
+        Resultados abaixo de language_detection.min_probability são descartados
+        (o Whisper volta a detectar o idioma durante a transcrição).
+        """
+        options = detection_options(self.config)
+        if options is None:
+            return None, 0.0
+        try:
+            window = load_window(source, options)
+            if len(window) < SAMPLE_RATE:
+                return None, 0.0
+            model = self.model
+            with self._model_lock():
+                language, probability = self.backend.detect_language(model, window)
+        except Exception as e:
+            logger.warning(f"Detecção rápida de idioma falhou: {e}")
+            return None, 0.0
+        logger.info(f"Idioma detectado: {language} ({probability:.0%})")
+        if probability < options['min_probability']:
+            return None, probability
+        return language, probability
+
+    def transcription_options(self):
+        """Tudo o que altera o resultado da transcrição (compõe a chave do cache e o manifesto)"""
+        return {
+            'decode': self.decode_options(),
+            'vad': self.vad_options(),
+            'long_file': self.long_file_options(),
+            'quantization': self.quantization,
+            'backend': self.backend.name,
+            'language': self.language_option(),
+            'language_detection': detection_options(self.config),
+        }
 
     @property
     def model(self):
-        if self._model is None:
-            self._model = whisper.load_model(self.model_size)
-        return self._model
-
-    def transcribe(self, audio_path, progress_callback=None, preview_callback=None):
-        if progress_callback:
-            progress_callback(0) # Forçar 0% no início
-            
-        original_tqdm = tqdm.tqdm
-        def custom_tqdm(*args, **kwargs):
-            pbar = ProgressHook(*args, **kwargs)
-            pbar.progress_callback = progress_callback
-            return pbar
-        
-        tqdm.tqdm = custom_tqdm
+        # Instância compartilhada entre motores (e possivelmente já pré-carregada)
+        return model_registry.get(self.model_size, self.device, self.quantization, self.backend.name)
+
+    def _model_lock(self):
+        # Motores de threads diferentes (ex.: jobs do servidor) usam o mesmo modelo, uma chamada por vez
+        return model_registry.inference_lock(self.model_size, self.device, self.quantization, self.backend.name)
+
+    def transcribe(self, audio, progress_callback=None, preview_callback=None, tracker=None, language=None):
+        """Transcreve um arquivo (caminho) ou áudio já decodificado (np.ndarray float32 16 kHz).
+
+        O progresso vai para `tracker` (um ProgressTracker por job); sem ele,
+        um rastreador local é criado e `progress_callback` recebe o percentual.
+        Sem idioma fixo, ele é detectado em uma janela curta antes da
+        transcrição; `language` informa um idioma já detectado para este áudio.
+        """
+        if tracker is None:
+            tracker = ProgressTracker(audio if isinstance(audio, str) else None)
+        unsubscribe = tracker.subscribe(lambda event: progress_callback(event.percent)) if progress_callback else None
+        try:
+            if progress_callback:
+                progress_callback(0) # Forçar 0% no início
+            result = self._transcribe(audio, tracker, language)
+        finally:
+            if unsubscribe:
+                unsubscribe()
+        return result
+
+    def _transcribe(self, audio, tracker, language):
+        # Cache: um acerto evita até o carregamento do modelo
+        cache_key = None
+        vad = self.vad_options()
+        long_file = self.long_file_options()
+        if isinstance(audio, str) and (self.cache is not None or vad is not None or long_file is not None):
+            audio = load_audio(audio)
+        if self.cache is not None:
+            with tracer.span("cache_lookup") as span:
+                cache_key = self.cache.make_key(audio_fingerprint(audio), self.model_size, self.transcription_options())
+                cached = self.cache.get(cache_key)
+                span['hit'] = cached is not None
+            if cached is not None:
+                logger.info(f"Transcrição obtida do cache ({cache_key[:12]})")
+                tracker.finish()
+                return cached
+
+        language = self.resolve_language(audio, language)
+        with progress_scope(tracker):
+            if long_file is not None and len(audio) / SAMPLE_RATE >= long_file['min_seconds']:
+                total_seconds = len(audio) / SAMPLE_RATE
+                tracker.begin_pass(total_seconds)
+                result = ChunkedTranscriber(self.config).transcribe(
+                    audio, progress_callback=lambda p: tracker.set_position(total_seconds * p / 100),
+                    language=language,
+                )
+            else:
+                options = dict(self.decode_options())
+                if language:
+                    options['language'] = language
+                result = self._run_model(audio, vad, options)
+        if cache_key:
+            self.cache.put(cache_key, result)
+        event = tracker.finish()
+        if event.rtf is not None:
+            logger.info(f"Transcrição: {event.audio_seconds:.0f}s de áudio em {event.elapsed:.1f}s (RTF {event.rtf:.2f})")
+        return result
+
+    def _infer(self, audio, options):
+        model = self.model
+        # Com um caminho, o backend decodifica o arquivo: a duração não é conhecida aqui
+        args = {} if isinstance(audio, str) else {'audio_seconds': round(len(audio) / SAMPLE_RATE, 1)}
+        with self._model_lock(), tracer.span("whisper", model=self.model_size, backend=self.backend.name, **args):
+            return self.backend.transcribe(model, audio, options)
+
+    def _run_model(self, audio, vad, options):
+        """Executa o Whisper, opcionalmente só nas regiões com fala"""
+        if vad is None:
+            return self._infer(audio, options)
+
+        with tracer.span("vad"):
+            regions = detect_speech(audio, **vad)
+        total_seconds = len(audio) / SAMPLE_RATE
+        if not regions:
+            logger.info("Nenhuma fala detectada; transcrição vazia")
+            return {'text': '', 'segments': [], 'language': options.get('language')}
+
+        timeline = SpeechTimeline(regions)
+        speech_seconds = timeline.speech_seconds()
+        logger.info(f"VAD: {speech_seconds:.0f}s de fala em {total_seconds:.0f}s ({len(regions)} regiões)")
+        if speech_seconds >= total_seconds * 0.95:
+            return self._infer(audio, options)
+
+        result = self._infer(timeline.extract(audio), options)
+        timeline.remap_segments(result['segments'])
+        return result
+
+    def _stream_windows(self, audio, window_seconds):
+        """Produz (deslocamento em amostras, janela) cortando cada janela no trecho mais silencioso do final"""
+        if isinstance(audio, str):
+            blocks = stream_audio(audio, block_seconds=min(10, window_seconds))
+        else:
+            step = int(10 * SAMPLE_RATE)
+            blocks = (audio[i:i + step] for i in range(0, len(audio), step))
+
+        window = int(window_seconds * SAMPLE_RATE)
+        frame = int(0.03 * SAMPLE_RATE)
+        buffer = np.empty(0, dtype=np.float32)
+        offset = 0
+        for block in blocks:
+            buffer = np.concatenate((buffer, block))
+            while len(buffer) >= window:
+                # Procura o quadro de menor energia nos últimos 20% da janela
+                tail_start = int(window * 0.8) // frame
+                n_frames = window // frame
+                frames = buffer[:n_frames * frame].reshape(n_frames, frame)[tail_start:]
+                cut = (tail_start + int(np.argmin(np.mean(frames ** 2, axis=1)))) * frame + frame // 2
+                yield offset, buffer[:cut]
+                offset += cut
+                buffer = buffer[cut:]
+        if len(buffer):
+            yield offset, buffer
+
+    def transcribe_stream(self, audio, progress_callback=None, preview_callback=None, tracker=None, language=None):
+        """Transcreve em janelas sucessivas, produzindo (segmentos, idioma) de cada janela assim que fica pronta.
+
+        Aceita caminho (decodificado aos poucos, memória limitada) ou np.ndarray.
+        O idioma (fixo, informado ou detectado antes da primeira janela) e o
+        final do texto anterior são repassados a cada janela para manter a
+        continuidade.
+        """
+        window_seconds = float(self.config.get("streaming.window_seconds", 60)) if hasattr(self.config, 'get') else 60.0
+        if isinstance(audio, str):
+            total_seconds = probe_duration(audio)
+        else:
+            total_seconds = len(audio) / SAMPLE_RATE
+        vad = self.vad_options()
+        language = self.resolve_language(audio, language)
+
+        # Total fixo (0 se desconhecido): cada janela não deve redefini-lo
+        if tracker is None:
+            tracker = ProgressTracker(audio if isinstance(audio, str) else None)
+        tracker.total_seconds = total_seconds or 0
+        unsubscribe = tracker.subscribe(lambda event: progress_callback(event.percent)) if progress_callback else None
         try:
-            result = self.model.transcribe(audio_path, verbose=False)
-            if progress_callback: progress_callback(100)
-            return result
+            if progress_callback:
+                progress_callback(0)
+            yield from self._stream(audio, window_seconds, vad, language, tracker, preview_callback)
         finally:
-            tqdm.tqdm = original_tqdm
\ No newline at end of file
+            if unsubscribe:
+                unsubscribe()
+
+    def _stream(self, audio, window_seconds, vad, language, tracker, preview_callback):
+        previous_text = ""
+        next_id = 0
+
+        for offset, window in self._stream_windows(audio, window_seconds):
+            start_seconds = offset / SAMPLE_RATE
+            window_len = len(window) / SAMPLE_RATE
+
+            options = dict(self.decode_options())
+            if language:
+                options['language'] = language
+            if previous_text:
+                options['initial_prompt'] = previous_text[-200:]
+
+            with progress_scope(tracker):
+                result = self._run_model(window, vad, options)
+            # Com VAD o modelo vê menos áudio que a janela: alinha a posição ao fim dela
+            tracker.set_position(start_seconds + window_len)
+            language = language or result.get('language')
+
+            segments = []
+            for seg in result.get('segments', []):
+                seg = dict(seg, id=next_id, start=seg['start'] + start_seconds, end=seg['end'] + start_seconds)
+                next_id += 1
+                segments.append(seg)
+                if preview_callback:
+                    preview_callback(seg['text'].strip())
+            previous_text = (previous_text + result.get('text', ''))[-400:]
+            yield segments, language
+
+        tracker.finish()
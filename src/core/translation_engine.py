@@ -1,45 +1,171 @@
 import logging
-from deep_translator import GoogleTranslator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.core.translation_memory import TranslationMemory
+from src.core.language_detection import base_language
+from src.core.translation_providers import get_provider, is_transient_error
+from src.utils.rate_limiter import get_rate_limiter, retry_with_backoff
+from src.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Separador entre segmentos de um lote (o Google preserva quebras de linha)
+BATCH_DELIMITER = "\n"
+
 class TranslationEngine:
-    def __init__(self, config_manager=None):
+    def __init__(self, config_manager=None, provider=None):
         self.config = config_manager
+        self.provider = provider  # Provedor fixo (ex.: benchmarks); None = definido pela configuração
+        self.batch_max_chars = 4500  # Limite do Google é 5000 caracteres por requisição
+        self.batch_max_items = 50
+        self.concurrency = 4
+        self.requests_per_second = 5.0
+        self.max_retries = 3
+        if hasattr(self.config, 'get'):
+            self.batch_max_chars = int(self.config.get("translation.batch_max_chars", self.batch_max_chars))
+            self.batch_max_items = int(self.config.get("translation.batch_max_items", self.batch_max_items))
+            self.concurrency = max(1, int(self.config.get("translation.concurrency", self.concurrency)))
+            self.requests_per_second = float(self.config.get("translation.requests_per_second", self.requests_per_second))
+            self.max_retries = int(self.config.get("translation.max_retries", self.max_retries))
+        self.memory = self._create_memory()
+
+    def _create_memory(self):
+        if not hasattr(self.config, 'get') or not self.config.get("cache.enabled", True):
+            return None
+        try:
+            max_entries = int(self.config.get("cache.translation_memory_max_entries", 200000))
+            return TranslationMemory(self.config.get("cache.directory") or None, max_entries=max_entries)
+        except Exception as e:
+            logger.error(f"Memória de tradução desativada: {e}")
+            return None
+
+    def close(self):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory = None
+
+    def _make_batches(self, texts, provider):
+        """Agrupa textos em lotes limitados por caracteres e por quantidade"""
+        max_items = min(self.batch_max_items, provider.max_batch_items)
+        batch, size = [], 0
+        for text in texts:
+            extra = len(text) + len(BATCH_DELIMITER)
+            if batch and (size + extra > self.batch_max_chars or len(batch) >= max_items):
+                yield batch
+                batch, size = [], 0
+            batch.append(text)
+            size += extra
+        if batch:
+            yield batch
+
+    def _request(self, provider, func, description, items=1):
+        """Uma requisição ao provedor, respeitando o limite de taxa e com novas tentativas"""
+        rate_limiter = get_rate_limiter(provider.name, self.requests_per_second)
+
+        def attempt():
+            rate_limiter.acquire()
+            return func()
+
+        try:
+            with tracer.span("translate_request", "network", provider=provider.name, items=items):
+                return retry_with_backoff(attempt, retries=self.max_retries, retry_if=is_transient_error)
+        except Exception as e:
+            logger.error(f"Erro ao traduzir '{description[:40]}': {e}")
+            return None
+
+    def _translate_one(self, provider, text, source, target):
+        return self._request(provider, lambda: provider.translate(text, source, target), text)
 
-    def translate_segments(self, segments, target_lang, progress_callback=None):
+    def _translate_batch(self, provider, batch, source, target):
+        """Traduz um lote em uma requisição; se o retorno vier desalinhado, traduz item a item"""
+        if len(batch) > 1:
+            if provider.native_batch:
+                parts = self._request(provider, lambda: provider.translate_batch(batch, source, target), batch[0],
+                                      items=len(batch)) or []
+            else:
+                joined = BATCH_DELIMITER.join(t.replace(BATCH_DELIMITER, " ") for t in batch)
+                result = self._request(provider, lambda: provider.translate(joined, source, target), joined,
+                                       items=len(batch))
+                parts = result.split(BATCH_DELIMITER) if result else []
+            parts = [(p or "").strip() for p in parts]
+            if len(parts) == len(batch):
+                return {text: part for text, part in zip(batch, parts) if part}
+            logger.warning(f"Lote desalinhado ({len(parts)} de {len(batch)} linhas); traduzindo individualmente")
+
+        translations = {}
+        for text in batch:
+            translated = self._translate_one(provider, text, source, target)
+            if translated:
+                translations[text] = translated
+        return translations
+
+    def translate_segments(self, segments, target_lang, progress_callback=None, source_lang=None):
+        """Traduz os segmentos para `target_lang`.
+
+        `source_lang` é o idioma do áudio (detectado ou configurado); sem ele o
+        provedor detecta sozinho ('auto'). Ele também compõe a chave da
+        memória de tradução.
+        """
         if not target_lang or target_lang == "Original":
             return segments
 
         target_code = target_lang.lower().strip()
-        
+        source_code = base_language(source_lang) or 'auto'
+
         try:
-            translator = GoogleTranslator(source='auto', target=target_code)
+            provider = self.provider or get_provider(self.config)
         except Exception as e:
             logger.error(f"Erro ao carregar tradutor: {e}")
             return segments
-        
-        translated_segments = []
-        total = len(segments)
 
-        for i, seg in enumerate(segments):
-            try:
-                original_text = seg.get('text', '').strip()
-                new_seg = seg.copy()
+        # Textos repetidos ("[Música]", vinhetas...) viram uma única consulta
+        texts = [seg.get('text', '').strip() for seg in segments]
+        unique_texts = list(dict.fromkeys(t for t in texts if t))
+        total = len(unique_texts)
+
+        translations = {}
+        if self.memory is not None and unique_texts:
+            translations = self.memory.get_many(unique_texts, source_code, target_code, provider.name)
+        missing = [t for t in unique_texts if t not in translations]
 
-                if original_text:
-                    # Tradução real via Google
-                    new_seg['text'] = translator.translate(original_text)
-                
-                translated_segments.append(new_seg)
+        new_translations = {}
+        done = total - len(missing)
+        batches = list(self._make_batches(missing, provider))
+        workers = min(self.concurrency, len(batches))
 
-                # Atualiza o progresso via callback para o Workflow
+        def run_batch(batch):
+            return self._translate_batch(provider, batch, source_code, target_code)
+
+        if workers <= 1:
+            results = ((batch, run_batch(batch)) for batch in batches)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translation")
+            futures = {executor.submit(run_batch, batch): batch for batch in batches}
+            results = ((futures[f], f.result()) for f in as_completed(futures))
+
+        try:
+            for batch, batch_translations in results:
+                # Vários segmentos por requisição ao provedor
+                new_translations.update(batch_translations)
+
+                # Atualiza o progresso via callback para o Workflow (sempre nesta thread)
+                done += len(batch)
                 if progress_callback:
-                    percent = int(((i + 1) / total) * 100)
-                    progress_callback(percent)
+                    progress_callback(int((done / total) * 100))
+        finally:
+            if workers > 1:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.memory is not None and new_translations:
+            self.memory.put_many(new_translations, source_code, target_code, provider.name)
+        translations.update(new_translations)
 
-            except Exception as e:
-                logger.error(f"Erro no segmento {i}: {e}")
-                translated_segments.append(seg)
+        translated_segments = []
+        for seg, text in zip(segments, texts):
+            new_seg = seg.copy()
+            if text in translations:
+                new_seg['text'] = translations[text]
+            translated_segments.append(new_seg)
 
-        return translated_segments
\ No newline at end of file
+        if progress_callback:
+            progress_callback(100)
+        return translated_segments
@@ -0,0 +1,96 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from src.core.transcription_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Limite de variáveis por consulta do SQLite
+_SQL_CHUNK = 500
+
+
+class TranslationMemory:
+    """Memória de tradução persistente (SQLite) com remoção LRU por número de entradas"""
+
+    def __init__(self, directory=None, max_entries=200000):
+        directory = directory or default_cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, 'translation_memory.sqlite3')
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        # WAL permite leitores simultâneos vindos de outros processos do pool
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source_text TEXT NOT NULL, source_lang TEXT NOT NULL, target_lang TEXT NOT NULL,"
+            " provider TEXT NOT NULL, translation TEXT NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (source_text, source_lang, target_lang, provider))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._conn.commit()
+
+    def get_many(self, texts, source_lang, target_lang, provider):
+        """Retorna {texto: tradução} para os textos já conhecidos"""
+        texts = list(texts)
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(texts), _SQL_CHUNK):
+                chunk = texts[i:i + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source_text, translation FROM translations"
+                    f" WHERE source_lang = ? AND target_lang = ? AND provider = ? AND source_text IN ({placeholders})",
+                    (source_lang, target_lang, provider, *chunk),
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ?"
+                    " WHERE source_text = ? AND source_lang = ? AND target_lang = ? AND provider = ?",
+                    [(now, text, source_lang, target_lang, provider) for text in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, translations, source_lang, target_lang, provider):
+        """Grava {texto: tradução} e aplica o limite de entradas"""
+        if not translations:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations"
+                " (source_text, source_lang, target_lang, provider, translation, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(text, source_lang, target_lang, provider, translated, now)
+                 for text, translated in translations.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN"
+                " (SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            logger.info(f"Memória de tradução: {excess} entradas antigas removidas")
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
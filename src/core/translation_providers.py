@@ -0,0 +1,188 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationProvider:
+    """Interface dos serviços de tradução.
+
+    Provedores com `native_batch` recebem a lista de textos em uma única
+    requisição; os demais recebem um texto por chamada (o motor cuida do
+    agrupamento com delimitador).
+    """
+
+    name = "base"
+    native_batch = False
+    max_batch_items = 50
+
+    def translate(self, text, source, target):
+        raise NotImplementedError
+
+    def translate_batch(self, texts, source, target):
+        return [self.translate(t, source, target) for t in texts]
+
+
+def is_transient_error(error):
+    """Erros que valem nova tentativa: limite de taxa (429), falha do servidor (5xx) e de conexão.
+
+    Autenticação, cota e requisição inválida (demais 4xx) falhariam de novo.
+    """
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status == 429 or (status is not None and status >= 500)
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    try:
+        from deep_translator.exceptions import TooManyRequests, ServerException, RequestError
+    except ImportError:
+        return False
+    # O deep_translator não informa o status em RequestError; para o Google ele é quase sempre transitório
+    return isinstance(error, (TooManyRequests, ServerException, RequestError))
+
+
+def _make_session(pool_size):
+    """Sessão HTTP com pool de conexões keep-alive reaproveitado entre arquivos"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Códigos do Whisper que o Google Tradutor escreve de outra forma
+_GOOGLE_CODES = {'zh': 'zh-CN', 'he': 'iw'}
+
+
+class GoogleProvider(TranslationProvider):
+    """Google Tradutor via deep_translator (sem chave de API).
+
+    O deep_translator faz chamadas avulsas a requests.get, sem aceitar uma
+    sessão: aqui não há pool keep-alive como no DeepL e no LibreTranslate.
+    Lotes, memória de tradução e concorrência continuam valendo.
+    """
+
+    name = "google"
+
+    def __init__(self):
+        # GoogleTranslator guarda o texto da requisição no objeto: um por thread e par de idiomas
+        self._local = threading.local()
+
+    def _translator(self, source, target):
+        from deep_translator import GoogleTranslator
+        cache = getattr(self._local, "translators", None)
+        if cache is None:
+            cache = self._local.translators = {}
+        translator = cache.get((source, target))
+        if translator is None:
+            try:
+                translator = GoogleTranslator(source=_GOOGLE_CODES.get(source, source), target=target)
+            except Exception as e:
+                if source == "auto":
+                    raise
+                # Idioma de origem que o Google não aceita: ele mesmo detecta
+                logger.debug(f"Idioma de origem '{source}' não aceito pelo Google ({e}); usando 'auto'")
+                translator = GoogleTranslator(source="auto", target=target)
+            cache[(source, target)] = translator
+        return translator
+
+    def translate(self, text, source, target):
+        return self._translator(source, target).translate(text)
+
+
+class DeepLProvider(TranslationProvider):
+    """API REST do DeepL (aceita vários textos por requisição)"""
+
+    name = "deepl"
+    native_batch = True
+
+    def __init__(self, api_key, pool_size=8, timeout=30):
+        if not api_key:
+            raise ValueError("Chave de API do DeepL não configurada (translation.deepl_api_key)")
+        self.api_key = api_key
+        self.timeout = timeout
+        # Chaves do plano gratuito terminam em ':fx' e usam outro host
+        host = "api-free.deepl.com" if api_key.endswith(":fx") else "api.deepl.com"
+        self.url = f"https://{host}/v2/translate"
+        self.session = _make_session(pool_size)
+
+    def translate_batch(self, texts, source, target):
+        data = {"text": list(texts), "target_lang": target.upper()}
+        if source and source != "auto":
+            data["source_lang"] = source.upper()
+        response = self.session.post(
+            self.url, data=data, timeout=self.timeout,
+            headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
+        )
+        response.raise_for_status()
+        return [item["text"] for item in response.json()["translations"]]
+
+    def translate(self, text, source, target):
+        return self.translate_batch([text], source, target)[0]
+
+
+class LibreTranslateProvider(TranslationProvider):
+    """Backend HTTP genérico no formato do LibreTranslate (POST /translate)"""
+
+    name = "libretranslate"
+    native_batch = True
+
+    def __init__(self, url, api_key="", pool_size=8, timeout=30):
+        if not url:
+            raise ValueError("URL do LibreTranslate não configurada (translation.libretranslate_url)")
+        self.url = url.rstrip("/") + "/translate"
+        self.api_key = api_key
+        self.timeout = timeout
+        self.session = _make_session(pool_size)
+
+    def translate_batch(self, texts, source, target):
+        payload = {"q": list(texts), "source": source or "auto", "target": target, "format": "text"}
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        translated = response.json()["translatedText"]
+        return translated if isinstance(translated, list) else [translated]
+
+    def translate(self, text, source, target):
+        return self.translate_batch([text], source, target)[0]
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(config):
+    """Retorna o provedor configurado, compartilhado no processo (mantém as conexões abertas)"""
+    name = (config.get("translation.provider") or config.get("translation.service") or "google").lower()
+    pool_size = max(1, int(config.get("translation.concurrency", 4)))
+
+    if name == "deepl":
+        key = (name, config.get("translation.deepl_api_key", ""))
+        factory = lambda: DeepLProvider(key[1], pool_size=pool_size)
+    elif name in ("libretranslate", "http"):
+        key = (name, config.get("translation.libretranslate_url", ""), config.get("translation.api_key", ""))
+        factory = lambda: LibreTranslateProvider(key[1], api_key=key[2], pool_size=pool_size)
+    else:
+        if name != "google":
+            logger.warning(f"Provedor de tradução desconhecido '{name}'; usando Google")
+        key = ("google",)
+        factory = GoogleProvider
+
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            return provider
+        try:
+            provider = factory()
+        except Exception as e:
+            if key[0] == "google" or not config.get("translation.google_fallback", True):
+                raise
+            logger.error(f"Provedor '{name}' indisponível ({e}); usando Google")
+            provider = _providers.get(("google",)) or GoogleProvider()
+            _providers[("google",)] = provider
+        # O fallback também fica sob a chave pedida: a fábrica que falhou não é chamada de novo
+        _providers[key] = provider
+        return provider
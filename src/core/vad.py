@@ -0,0 +1,128 @@
+import logging
+import numpy as np
+from src.core.audio import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Quadros por bloco no cálculo do espectro
+_FFT_BLOCK = 8192
+
+
+def _runs(mask):
+    """Início e fim (exclusivo) de cada sequência de True em um vetor booleano"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _merge_close(starts, ends, min_gap):
+    """Une regiões separadas por menos de `min_gap` amostras/quadros"""
+    if len(starts) < 2:
+        return starts, ends
+    keep = (starts[1:] - ends[:-1]) >= min_gap
+    return np.concatenate((starts[:1], starts[1:][keep])), np.concatenate((ends[:-1][keep], ends[-1:]))
+
+
+def detect_speech(audio, sr=SAMPLE_RATE, frame_ms=30, margin_db=12.0, min_speech_ms=250,
+                  min_silence_ms=500, pad_ms=200, speech_band_ratio=0.0):
+    """Encontra as regiões com fala e retorna uma lista de (início, fim) em amostras.
+
+    Cada quadro é classificado pela energia em relação ao piso de ruído do
+    próprio arquivo; com `speech_band_ratio` > 0, exige-se também que essa
+    fração da energia esteja na faixa de voz (250–4000 Hz), o que descarta
+    boa parte da música de fundo. Tudo é calculado de forma vetorizada.
+    """
+    frame = max(1, int(sr * frame_ms / 1000))
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    frames = np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    # Limiar adaptativo: piso de ruído (percentil 10) + margem, nunca abaixo de -60 dBFS
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + margin_db, -60.0)
+    mask = energy_db > threshold
+
+    if speech_band_ratio > 0:
+        window = np.hanning(frame).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame, 1.0 / sr)
+        band = (freqs >= 250) & (freqs <= 4000)
+        ratio = np.empty(n_frames)
+        # Em blocos, para o espectro de arquivos longos não ocupar gigabytes
+        for i in range(0, n_frames, _FFT_BLOCK):
+            power = np.abs(np.fft.rfft(frames[i:i + _FFT_BLOCK] * window, axis=1)) ** 2
+            ratio[i:i + _FFT_BLOCK] = power[:, band].sum(axis=1) / (power.sum(axis=1) + 1e-10)
+        mask &= ratio >= speech_band_ratio
+
+    starts, ends = _runs(mask)
+    frames_per_ms = 1.0 / frame_ms
+    starts, ends = _merge_close(starts, ends, int(min_silence_ms * frames_per_ms))
+    keep = (ends - starts) >= max(1, int(min_speech_ms * frames_per_ms))
+    starts, ends = starts[keep], ends[keep]
+
+    # Converte para amostras com margem nas bordas e une o que passou a se sobrepor
+    pad = int(sr * pad_ms / 1000)
+    starts = np.maximum(starts * frame - pad, 0)
+    ends = np.minimum(ends * frame + pad, len(audio))
+    starts, ends = _merge_close(starts, ends, 1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class SpeechTimeline:
+    """Concatena as regiões de fala e converte tempos do áudio recortado para o original"""
+
+    def __init__(self, regions, sr=SAMPLE_RATE):
+        self.sr = sr
+        self.regions = regions
+        lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        self._orig_starts = np.array([start for start, _ in regions], dtype=np.float64) / sr
+        self._cut_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.float64) / sr
+        self._cut_ends = self._cut_starts + lengths / sr
+
+    def extract(self, audio):
+        return np.concatenate([audio[start:end] for start, end in self.regions])
+
+    def _region_index(self, times, side):
+        return np.clip(np.searchsorted(self._cut_starts, times, side=side) - 1, 0, len(self.regions) - 1)
+
+    def to_original(self, times, side='right'):
+        """side='right' para inícios; 'left' para fins (um fim na emenda fica na região anterior)"""
+        times = np.asarray(times, dtype=np.float64)
+        idx = self._region_index(times, side)
+        return self._orig_starts[idx] + (times - self._cut_starts[idx])
+
+    def remap_segments(self, segments):
+        """Reescreve start/end (e palavras, se houver) de volta na linha do tempo original.
+
+        Um segmento que atravessa uma emenda é recortado para a região onde
+        passa mais tempo, para não cobrir o silêncio removido entre elas.
+        """
+        if not segments:
+            return segments
+        cut_starts = np.array([s['start'] for s in segments], dtype=np.float64)
+        cut_ends = np.array([s['end'] for s in segments], dtype=np.float64)
+        idx_s = self._region_index(cut_starts, 'right')
+        idx_e = self._region_index(cut_ends, 'left')
+        crossing = idx_s != idx_e
+        if crossing.any():
+            in_first = self._cut_ends[idx_s] - cut_starts
+            in_last = cut_ends - self._cut_starts[idx_e]
+            keep_first = crossing & (in_first >= in_last)
+            keep_last = crossing & ~keep_first
+            cut_ends = np.where(keep_first, self._cut_ends[idx_s], cut_ends)
+            cut_starts = np.where(keep_last, self._cut_starts[idx_e], cut_starts)
+        starts = self.to_original(cut_starts, side='right')
+        ends = self.to_original(cut_ends, side='left')
+        for seg, start, end in zip(segments, starts.tolist(), ends.tolist()):
+            seg['start'], seg['end'] = start, max(start, end)
+            words = seg.get('words')
+            if words:
+                w_starts = self.to_original([w['start'] for w in words], side='right')
+                w_ends = self.to_original([w['end'] for w in words], side='left')
+                for word, ws, we in zip(words, w_starts.tolist(), w_ends.tolist()):
+                    word['start'], word['end'] = ws, max(ws, we)
+        return segments
+
+    def speech_seconds(self):
+        return sum(end - start for start, end in self.regions) / self.sr
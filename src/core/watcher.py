@@ -0,0 +1,207 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+from src.core.pipeline import VIDEO_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+# Eventos do inotify: arquivo fechado após escrita, movido para a pasta ou criado
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _is_video(path):
+    name = os.path.basename(path)
+    return not name.startswith('.') and name.lower().endswith(VIDEO_EXTENSIONS)
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+class InotifyWatcher:
+    """Notificações do kernel (Linux) via ctypes, sem dependências externas"""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify indisponível")
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._dirs = {}
+        try:
+            for directory in directories:
+                wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou para {directory}")
+                self._dirs[wd] = directory
+        except OSError:
+            self.close()
+            raise
+
+    def poll(self, timeout):
+        """Caminhos com atividade, aguardando até `timeout` segundos"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name and wd in self._dirs:
+                paths.append(os.path.join(self._dirs[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Alternativa portátil (Windows, macOS, compartilhamentos de rede): varre as pastas periodicamente"""
+
+    def __init__(self, directories, interval=2.0):
+        self.directories = list(directories)
+        self.interval = interval
+        self._seen = {}
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        changed = []
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.error(f"Erro ao listar {directory}: {e}")
+                continue
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                signature = (st.st_size, st.st_mtime)
+                if self._seen.get(entry.path) != signature:
+                    self._seen[entry.path] = signature
+                    changed.append(entry.path)
+        return changed
+
+    def close(self):
+        pass
+
+
+class FolderWatcher:
+    """Observa pastas e entrega cada vídeo novo quando ele termina de ser gravado.
+
+    Um arquivo só é considerado completo depois que tamanho e data de
+    modificação ficam estáveis por `stable_seconds` (cópias por rede não
+    geram um evento confiável de fim de escrita).
+    """
+
+    def __init__(self, directories, config, is_excluded=None):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.poll_interval = float(config.get("watch.poll_interval", 2.0))
+        self.stable_seconds = float(config.get("watch.stable_seconds", 5.0))
+        self.is_excluded = is_excluded or (lambda path: False)
+        self._pending = {}  # caminho -> (assinatura, desde quando está estável)
+        self._handled = {}  # caminho -> assinatura já entregue
+        self._stop = threading.Event()
+        self._backend = self._create_backend(config.get("watch.use_inotify", True))
+
+    def _create_backend(self, use_inotify):
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                backend = InotifyWatcher(self.directories)
+                logger.info(f"Observando {len(self.directories)} pasta(s) via inotify")
+                return backend
+            except OSError as e:
+                logger.warning(f"inotify indisponível ({e}); usando varredura periódica")
+        logger.info(f"Observando {len(self.directories)} pasta(s) por varredura a cada {self.poll_interval:g}s")
+        return PollingWatcher(self.directories, self.poll_interval)
+
+    def _track(self, path):
+        path = os.path.abspath(path)
+        if not _is_video(path) or self.is_excluded(path):
+            return
+        signature = _signature(path)
+        if signature is None or self._handled.get(path) == signature:
+            return
+        if path not in self._pending or self._pending[path][0] != signature:
+            self._pending[path] = (signature, time.monotonic())
+
+    def _ready(self):
+        """Arquivos estáveis pelo tempo mínimo (na ordem em que apareceram)"""
+        now = time.monotonic()
+        ready = []
+        for path, (signature, since) in list(self._pending.items()):
+            current = _signature(path)
+            if current is None:
+                del self._pending[path]
+            elif current != signature:
+                self._pending[path] = (current, now)
+            elif now - since >= self.stable_seconds:
+                del self._pending[path]
+                self._handled[path] = current
+                ready.append(path)
+        return ready
+
+    def run(self, handle):
+        """Bloqueia até `stop()`, chamando handle(caminho) para cada vídeo completo"""
+        # Arquivos que já estavam nas pastas também passam pela verificação (o manifesto pula os prontos)
+        for directory in self.directories:
+            for name in sorted(os.listdir(directory)):
+                self._track(os.path.join(directory, name))
+
+        try:
+            while not self._stop.is_set():
+                timeout = min(1.0, self.stable_seconds) if self._pending else self.poll_interval
+                for path in self._backend.poll(timeout):
+                    self._track(path)
+                for path in self._ready():
+                    if self._stop.is_set():
+                        break
+                    try:
+                        handle(path)
+                    except Exception as e:
+                        # Só será tentado de novo se o arquivo mudar
+                        logger.error(f"Falha ao processar {path}: {e}")
+        finally:
+            self._backend.close()
+
+    def stop(self):
+        self._stop.set()
+
+
+def watch(pipeline, directories, on_output=None, preview=None, watcher=None):
+    """Modo contínuo: cada vídeo novo passa pelo pipeline com o modelo já carregado em memória"""
+    watcher = watcher or FolderWatcher(directories, pipeline.config, is_excluded=pipeline.is_output)
+
+    def handle(path):
+        if preview:
+            preview(f"📥 Novo vídeo: {os.path.basename(path)}")
+        for output in pipeline.run([path], preview=preview):
+            if on_output:
+                on_output(output)
+
+    watcher.run(handle)
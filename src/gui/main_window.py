@@ -156,8 +156,8 @@ class MainWindow(QMainWindow):
         self.last_dir = path
         
         # Detectar arquivos de vídeo compatíveis
-        extensions = ('.mp4', '.mkv', '.avi', '.mov')
-        videos = [f for f in os.listdir(path) if f.lower().endswith(extensions)]
+        video_paths = self.workflow.videos_in(path)
+        videos = [os.path.basename(v) for v in video_paths]
         if not videos:
             QMessageBox.warning(self, "Erro", "Nenhum vídeo compatível encontrado na pasta.")
             return
@@ -177,10 +177,15 @@ class MainWindow(QMainWindow):
         # Mapeamento e Persistência de Configurações
         lang_map = {"Português": "pt", "Inglês": "en", "Espanhol": "es", "Francês": "fr", "Alemão": "de", "Italiano": "it"}
         choice = self.combo_lang.currentText()
-        self.config.set("font.color", self.selected_color)
-        self.config.set("font.bold", self.check_bold.isChecked())
-        self.config.set("translation.enabled", choice != "Original (Sem Tradução)")
-        self.config.set("translation.target_language", lang_map.get(choice, "pt"))
+        with self.config.transaction():  # Uma única gravação para todas as opções
+            self.config.set("font.color", self.selected_color)
+            self.config.set("font.bold", self.check_bold.isChecked())
+            self.config.set("font.size_label", self.combo_size.currentText())
+            self.config.set("translation.enabled", choice != "Original (Sem Tradução)")
+            self.config.set("translation.target_language", lang_map.get(choice, "pt"))
+
+        # Pré-carregar o Whisper em segundo plano (com as opções já gravadas)
+        self.workflow.warm_up(video_paths)
 
         # Reiniciar Estado da UI
         self.btn_run.setEnabled(False)
@@ -0,0 +1,179 @@
+"""API HTTP local para solicitar legendas de outros serviços.
+
+Uso:
+    python -m src.server --port 8765 [--config config.json] [--token SEGREDO]
+
+Rotas:
+    POST   /jobs        {"videos": [caminhos, pastas ou globs], "settings": {"translation.target_language": "en"}}
+    GET    /jobs        lista os jobs
+    GET    /jobs/<id>   estado, progresso e caminhos das legendas
+    DELETE /jobs/<id>   cancela um job ainda na fila
+    GET    /health      estado do serviço
+"""
+import sys
+import hmac
+import json
+import logging
+import argparse
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.utils.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class JobServer(ThreadingHTTPServer):
+    """Servidor HTTP sobre uma JobQueue; só escuta em localhost por padrão"""
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs, token=""):
+        super().__init__(address, _JobHandler)
+        self.jobs = jobs
+        self.token = token
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _JobHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        logger.debug(fmt % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get("Authorization", "")
+        if hmac.compare_digest(header, f"Bearer {token}"):
+            return True
+        self._send_json(401, {"error": "Não autorizado"})
+        return False
+
+    def _route(self):
+        """Caminho da requisição sem query string nem barra final"""
+        return urlsplit(self.path).path.rstrip("/") or "/"
+
+    def _job_id(self):
+        parts = self._route().split("/")
+        return parts[2] if len(parts) == 3 and parts[1] == "jobs" else None
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        jobs = self.server.jobs
+        route = self._route()
+        if route == "/health":
+            self._send_json(200, {"status": "ok", "queued": jobs.pending(), "jobs": len(jobs.list())})
+        elif route == "/jobs":
+            self._send_json(200, {"jobs": [job.to_dict() for job in jobs.list()]})
+        elif self._job_id():
+            job = jobs.get(self._job_id())
+            if job is None:
+                self._send_json(404, {"error": "Job não encontrado"})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": "Rota não encontrada"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self._route() != "/jobs":
+            self._send_json(404, {"error": "Rota não encontrada"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "Requisição muito grande"})
+                return
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("O corpo deve ser um objeto JSON")
+            videos = payload["videos"]
+            if isinstance(videos, str):
+                videos = [videos]
+            settings = payload.get("settings") or {}
+            if not isinstance(videos, list) or not all(isinstance(v, str) for v in videos) \
+                    or not isinstance(settings, dict):
+                raise ValueError("'videos' deve ser uma lista de caminhos e 'settings' um objeto")
+            job = self.server.jobs.submit(videos, settings)
+        except KeyError:
+            self._send_json(400, {"error": "Campo 'videos' obrigatório"})
+            return
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(202, job.to_dict())
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        job_id = self._job_id()
+        if not job_id or self.server.jobs.get(job_id) is None:
+            self._send_json(404, {"error": "Job não encontrado"})
+        elif self.server.jobs.cancel(job_id):
+            self._send_json(200, self.server.jobs.get(job_id).to_dict())
+        else:
+            self._send_json(409, {"error": "O job já está em execução ou finalizado"})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.server", description="API HTTP local do Amarelo Subs")
+    parser.add_argument("--host", help="Endereço de escuta (padrão: server.host = 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Porta (padrão: server.port = 8765)")
+    parser.add_argument("--config", help="Arquivo de configuração JSON (padrão: apenas valores padrão)")
+    parser.add_argument("--token", help="Exige 'Authorization: Bearer <token>' em todas as requisições")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Exibe logs detalhados")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    config = ConfigManager()
+    if args.config:
+        config.initialize(args.config)
+    else:
+        config.load()
+
+    # Importação após a configuração: o núcleo não depende de Qt
+    from src.core.jobs import JobQueue
+    from src.core.model_registry import warm_up_from_config
+    from src.utils.tracing import tracer
+
+    tracer.configure(config)
+    warm_up_from_config(config)
+    jobs = JobQueue(config, workers=config.get("server.workers", 1))
+    jobs.start()
+
+    host = args.host or config.get("server.host", "127.0.0.1")
+    port = args.port or int(config.get("server.port", 8765))
+    server = JobServer((host, port), jobs, token=args.token or config.get("server.token", ""))
+    print(f"API de legendas em {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
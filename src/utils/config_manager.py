@@ -1,10 +1,26 @@
 import os
+import copy
 import json
+import atexit
 import logging
-from typing import Dict, Any
+import tempfile
+import threading
+import contextlib
+import functools
+from typing import Dict, Any, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Marca uma chave ausente (diferente de uma chave com valor None)
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Caminho de uma chave pontuada; as chaves usadas são poucas e repetidas, então ficam em cache"""
+    return tuple(key.split('.'))
+
+
 class ConfigManager:
     """Gerenciador de configurações"""
     
@@ -24,6 +40,13 @@ class ConfigManager:
         self.config_file = None
         self.config = {}
         self._default_config = self._get_default_config()
+        self._lock = threading.RLock()
+        self._local = threading.local()  # Transação em andamento de cada thread
+        self._session_values = {}  # chave definida com persist=False -> valor a gravar em disco
+        self._listeners = []
+        self.write_delay = 0.0  # > 0: gravações adiadas e agrupadas (write-behind)
+        self._save_timer = None
+        self._dirty = False  # Há alterações aguardando o write-behind
         
     def initialize(self, config_file: str = None):
         """Inicializa com arquivo de configuração"""
@@ -48,31 +71,113 @@ class ConfigManager:
             'transcription': {
                 'model': 'base',
                 'device': 'auto',
-                'language': 'auto'
+                'language': 'auto',
+                'backend': 'openai-whisper',  # 'faster-whisper' ou 'auto' (faster-whisper na CPU, se instalado) mudam o decodificador
+                'quantization': 'none',  # 'int8': camadas lineares quantizadas na CPU (convertido uma vez, em cache)
+                'preload': True,  # Carrega o modelo em segundo plano assim que há vídeos a transcrever
+                'model_memory_mb': 0,  # Orçamento para modelos em memória (0 = sem limite)
+                'vad': {
+                    'enabled': False,  # Transcreve apenas os trechos com fala
+                    'margin_db': 12.0,  # Acima do piso de ruído do arquivo
+                    'min_speech_ms': 250,
+                    'min_silence_ms': 500,
+                    'pad_ms': 200,
+                    'speech_band_ratio': 0.0  # > 0 (ex.: 0.5) descarta música de fundo
+                },
+                'long_file': {
+                    'enabled': False,  # Divide arquivos longos em chunks transcritos em paralelo
+                    'min_seconds': 1800,
+                    'chunk_seconds': 600,
+                    'overlap_seconds': 2.0,
+                    'workers': 0  # 0 = um processo a cada 4 núcleos
+                },
+                'language_detection': {
+                    'enabled': True,  # Com idioma 'auto', detecta antes em uma janela curta
+                    'window_seconds': 30,  # Trecho analisado (máx. 30 s, limite do Whisper)
+                    'search_seconds': 120,  # Início do arquivo decodificado para achar a primeira fala
+                    'min_probability': 0.5  # Abaixo disso o Whisper detecta durante a transcrição
+                },
+                'scheduler': {
+                    'enabled': False,  # Escolhe o modelo de cada vídeo conforme a meta de velocidade
+                    'models': ['tiny', 'base', 'small', 'medium'],  # Do mais rápido ao mais preciso
+                    'max_rtf': 0.0,  # Segundos de processamento por segundo de áudio (0 = sem limite)
+                    'deadline_hours': 0.0,  # Concluir a fila em até N horas (0 = sem prazo)
+                    'safety_margin': 1.2  # Folga sobre a velocidade medida
+                }
             },
             'translation': {
                 'enabled': False,
                 'target_language': 'pt',
-                'provider': 'google'
+                'provider': 'google',  # google, deepl ou libretranslate
+                'deepl_api_key': '',
+                'libretranslate_url': '',
+                'api_key': '',
+                'google_fallback': True,
+                'batch_max_chars': 4500,
+                'batch_max_items': 50,
+                'concurrency': 4,  # Lotes traduzidos em paralelo
+                'requests_per_second': 5,  # Limite total por provedor, dividido entre os workers (0 = sem limite)
+                'max_retries': 3
+            },
+            'cache': {
+                'enabled': True,
+                'directory': '',  # Vazio = ~/.amarelo_legendas/cache
+                'transcription_max_mb': 512,
+                'translation_memory_max_entries': 200000
+            },
+            'streaming': {
+                'enabled': False,  # Grava e exibe cada legenda assim que o Whisper a produz
+                'window_seconds': 60
+            },
+            'batch': {
+                'resume': True  # Manifesto em <pasta>/.amarelo para pular vídeos já legendados
+            },
+            'tracing': {
+                'enabled': False,  # Mede cada etapa e exporta um trace para chrome://tracing / Perfetto
+                'output': ''  # Vazio = <pasta dos vídeos>/.amarelo/traces/trace-<data>.json
+            },
+            'watch': {
+                'poll_interval': 2.0,  # Segundos entre varreduras quando o inotify não está disponível
+                'stable_seconds': 5.0,  # Tamanho inalterado por este tempo = arquivo completo
+                'use_inotify': True
+            },
+            'server': {
+                'host': '127.0.0.1',  # Apenas local por padrão
+                'port': 8765,
+                'workers': 1,  # Jobs simultâneos; as transcrições no modelo compartilhado são feitas uma por vez
+                'token': ''  # Se definido, exige "Authorization: Bearer <token>"
+            },
+            'performance': {
+                'workers': 1,  # Processos simultâneos (0 = um por núcleo)
+                'prefetch': 1  # Vídeos com áudio decodificado antecipadamente (0 = desativado; ignorado no streaming)
             },
             'font': {
                 'name': 'Arial',
                 'size': 20,
                 'color': '#FFFF00', # Sugestão: Amarelo para combinar com a marca!
                 'bold': False,
-                'format_type': 'ass'
+                'format_type': 'ass'  # Legado, sem efeito: os formatos gerados vêm de subtitle.formats
+            },
+            'video': {
+                'merge_subtitles': False,  # Embute as legendas no vídeo como faixas (cópia de streams, sem recodificar)
+                'output_format': 'mkv',  # mkv (mantém estilo ASS) ou mp4/mov (legendas em mov_text)
+                'output_suffix': '.legendado'  # video.mkv -> video.legendado.mkv
+            },
+            'subtitle': {
+                'formats': ['srt']  # Qualquer combinação de 'srt', 'vtt' e 'ass', gerada em uma só passagem
             }
         }
         
     def load(self):
         """Carrega configurações do arquivo"""
+        self._session_values = {}
         try:
             if self.config_file and os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     self.config = json.load(f)
                 logger.info(f"Configurações carregadas de {self.config_file}")
             else:
-                self.config = self._default_config.copy()
+                self.config = copy.deepcopy(self._default_config)
                 logger.info("Usando configurações padrão")
                 
             # Garantir que todas as chaves padrão existam
@@ -80,22 +185,21 @@ class ConfigManager:
             
         except Exception as e:
             logger.error(f"Erro ao carregar configurações: {e}")
-            self.config = self._default_config.copy()
+            self.config = copy.deepcopy(self._default_config)
     
     def _merge_configs(self, target: Dict, source: Dict):
         """Mescla configurações recursivamente"""
         for key, value in source.items():
             if key not in target:
-                target[key] = value
+                target[key] = copy.deepcopy(value)
             elif isinstance(value, dict) and isinstance(target[key], dict):
                 self._merge_configs(target[key], value)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Obtém valor de configuração"""
-        keys = key.split('.')
         config = self.config
         
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(config, dict) and k in config:
                 config = config[k]
             else:
@@ -103,36 +207,229 @@ class ConfigManager:
         
         return config
     
-    def set(self, key: str, value: Any):
-        """Define valor de configuração"""
-        keys = key.split('.')
-        config = self.config
+    def set(self, key: str, value: Any, persist: bool = True):
+        """Define valor de configuração (persist=False altera apenas a sessão atual)"""
+        keys = _split_key(key)
         
+        with self._lock:
+            config = self.config
+            for k in keys[:-1]:
+                if k not in config or not isinstance(config[k], dict):
+                    config[k] = {}
+                config = config[k]
+            
+            old = config.get(keys[-1], _MISSING)
+            session_old = self._session_values.get(key, _MISSING)
+            config[keys[-1]] = value
+            if persist:
+                self._session_values.pop(key, None)
+            elif key not in self._session_values:
+                # Valor gravado em disco no lugar do temporário
+                self._session_values[key] = old if old is _MISSING else copy.deepcopy(old)
+        
+        change = [(key, None if old is _MISSING else old, value)] if old != value else []
+        undo = getattr(self._local, 'undo', None)
+        if undo is not None:
+            undo.append((key, old, session_old))
+            self._local.dirty = self._local.dirty or persist
+            self._local.changes += change
+            return
+        if persist:
+            self._request_save()
+        self._notify(change)
+    
+    def update(self, values: Dict[str, Any], persist: bool = True):
+        """Define várias chaves de uma vez, com uma única gravação"""
+        with self.transaction():
+            for key, value in values.items():
+                self.set(key, value, persist=persist)
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """Agrupa alterações desta thread: uma gravação e uma rodada de notificações ao final.
+        
+        Se o bloco lançar exceção, as alterações feitas nele são desfeitas
+        (e ninguém é notificado).
+        Transações aninhadas fazem parte da mais externa. O lock não fica
+        preso durante o bloco: outras threads continuam lendo e alterando.
+        """
+        if getattr(self._local, 'undo', None) is not None:
+            yield self
+            return
+        self._local.undo, self._local.dirty, self._local.changes = [], False, []
+        try:
+            yield self
+        except BaseException:
+            self._rollback(self._local.undo)
+            raise
+        else:
+            changes = self._local.changes
+            self._local.undo = None
+            if self._local.dirty:
+                self._request_save()
+            self._notify(changes)
+        finally:
+            self._local.undo = None
+    
+    def subscribe(self, callback: Callable[[str, Any, Any], None], prefix: str = "") -> Callable[[], None]:
+        """Registra callback(chave, anterior, novo) para alterações sob `prefix`; retorna o cancelamento"""
+        entry = (prefix, callback)
+        with self._lock:
+            self._listeners.append(entry)
+        
+        def unsubscribe():
+            with self._lock:
+                if entry in self._listeners:
+                    self._listeners.remove(entry)
+        return unsubscribe
+    
+    def _notify(self, changes):
+        """Avisa os assinantes, fora do lock (um assinante pode ler ou alterar a configuração)"""
+        if not changes:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for key, old, new in changes:
+            for prefix, callback in listeners:
+                if not prefix or key == prefix or key.startswith(prefix + '.'):
+                    try:
+                        callback(key, old, new)
+                    except Exception as e:
+                        logger.error(f"Erro em assinante da configuração '{key}': {e}")
+    
+    def set_write_behind(self, delay: float):
+        """Adia as gravações por `delay` segundos, juntando alterações próximas (0 = gravar na hora)"""
+        with self._lock:
+            self.write_delay = max(0.0, float(delay))
+        if self.write_delay == 0:
+            self.flush()
+    
+    def _request_save(self):
+        with self._lock:
+            if self.write_delay <= 0:
+                self.save()
+                return
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.write_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Grava imediatamente as alterações pendentes do modo write-behind"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self.save()
+    
+    def _rollback(self, undo):
+        with self._lock:
+            for key, old, session_old in reversed(undo):
+                self._write_value(self.config, key, old)
+                if session_old is _MISSING:
+                    self._session_values.pop(key, None)
+                else:
+                    self._session_values[key] = session_old
+    
+    @staticmethod
+    def _write_value(config: Dict, key: str, value: Any):
+        """Grava (ou remove, se _MISSING) uma chave pontuada em `config`"""
+        keys = _split_key(key)
+        parents = []
         for k in keys[:-1]:
-            if k not in config or not isinstance(config[k], dict):
+            if not isinstance(config.get(k), dict):
+                if value is _MISSING:
+                    return
                 config[k] = {}
+            parents.append((config, k))
             config = config[k]
-        
-        config[keys[-1]] = value
-        self.save()
+        if value is not _MISSING:
+            config[keys[-1]] = value
+            return
+        config.pop(keys[-1], None)
+        # Seções que só existiam por causa da chave removida também saem
+        for parent, k in reversed(parents):
+            if parent[k]:
+                break
+            del parent[k]
     
     def save(self):
-        """Salva configurações no arquivo"""
-        try:
-            if self.config_file:
-                config_dir = os.path.dirname(self.config_file)
+        """Salva configurações no arquivo (gravação atômica: arquivo temporário + rename).
+        
+        Valores definidos com persist=False ficam de fora: o arquivo recebe o
+        valor anterior a eles.
+        """
+        with self._lock:
+            self._dirty = False
+            if not self.config_file:
+                return
+            data = copy.deepcopy(self.config)
+            for key, value in self._session_values.items():
+                self._write_value(data, key, value)
+            try:
+                config_dir = os.path.dirname(os.path.abspath(self.config_file))
                 os.makedirs(config_dir, exist_ok=True)
                 
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=2, ensure_ascii=False)
+                fd, tmp_path = tempfile.mkstemp(dir=config_dir, prefix='.config-', suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.config_file)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
                 
                 logger.info(f"Configurações salvas em {self.config_file}")
-        except Exception as e:
-            logger.error(f"Erro ao salvar configurações: {e}")
+            except Exception as e:
+                logger.error(f"Erro ao salvar configurações: {e}")
     
     def get_font_config(self) -> Dict[str, Any]:
         """Obtém configurações de fonte"""
         return self.config.get('font', {})
+    
+    def snapshot(self, overrides: Dict[str, Any] = None) -> 'ConfigSnapshot':
+        """Cópia independente da configuração atual (com os padrões) e ajustes próprios"""
+        with self._lock:
+            data = copy.deepcopy(self.config)
+        self._merge_configs(data, self._default_config)
+        snapshot = ConfigSnapshot(data)
+        for key, value in (overrides or {}).items():
+            snapshot.set(key, value)
+        return snapshot
+    
+    def has_key(self, key: str) -> bool:
+        """True se a chave existe na configuração padrão"""
+        config = self._default_config
+        for k in _split_key(key):
+            if not isinstance(config, dict) or k not in config:
+                return False
+            config = config[k]
+        return True
+
+
+class ConfigSnapshot:
+    """Configuração isolada (ex.: um job da API): mesma interface de leitura, nunca grava em disco"""
+    
+    def __init__(self, data: Dict[str, Any]):
+        self.config = data
+    
+    get = ConfigManager.get
+    
+    def set(self, key: str, value: Any, persist: bool = False):
+        keys = _split_key(key)
+        config = self.config
+        for k in keys[:-1]:
+            if k not in config or not isinstance(config[k], dict):
+                config[k] = {}
+            config = config[k]
+        config[keys[-1]] = value
 
 # Instância global (não inicializada automaticamente)
-config_manager = ConfigManager()
\ No newline at end of file
+config_manager = ConfigManager()
+# Alterações ainda adiadas pelo write-behind são gravadas ao sair
+atexit.register(config_manager.flush)
@@ -0,0 +1,64 @@
+import time
+import random
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Limitador token-bucket seguro entre threads: `rate` fichas/s, rajadas de até `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Bloqueia até haver fichas disponíveis"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, rate, capacity=None):
+    """Retorna o limitador compartilhado do processo para um provedor"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None or limiter.rate != float(rate):
+            limiter = TokenBucket(rate, capacity)
+            _limiters[name] = limiter
+        return limiter
+
+
+def retry_with_backoff(func, retries=3, base_delay=0.5, max_delay=8.0, exceptions=(Exception,), retry_if=None):
+    """Executa func() repetindo em caso de erro, com backoff exponencial e jitter total.
+
+    `retry_if(erro)` decide se o erro é transitório; os demais são relançados na hora.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except exceptions as e:
+            if attempt >= retries or (retry_if is not None and not retry_if(e)):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            logger.warning(f"Tentativa {attempt}/{retries} falhou ({e}); nova tentativa em {delay:.2f}s")
+            time.sleep(delay)
@@ -0,0 +1,129 @@
+"""Rastreamento opcional por etapa, exportável para chrome://tracing e Perfetto (ui.perfetto.dev)"""
+import os
+import json
+import time
+import logging
+import threading
+import contextlib
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer:
+    """Coleta intervalos (spans) de cada etapa, por processo e por thread.
+
+    Desativado, `span()` devolve um contexto vazio e não custa quase nada.
+    Os eventos seguem o formato "Trace Event" (fase "X"), com horário de
+    parede em microssegundos, de modo que spans de processos diferentes
+    ficam alinhados na mesma linha do tempo.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        # Evitar múltiplas inicializações
+        if hasattr(self, '_initialized'):
+            return
+
+        self._initialized = True
+        self.enabled = False
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        self.enabled = bool(config.get("tracing.enabled", False))
+
+    @contextlib.contextmanager
+    def _span(self, name, category, args):
+        start_wall = time.time_ns() // 1000
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            duration = (time.perf_counter_ns() - start) // 1000
+            thread = threading.current_thread()
+            event = {
+                'name': name, 'cat': category, 'ph': 'X', 'ts': start_wall, 'dur': duration,
+                'pid': os.getpid(), 'tid': thread.ident, 'args': args,
+            }
+            with self._lock:
+                self._events.append(event)
+                self._threads[(event['pid'], thread.ident)] = thread.name
+
+    def span(self, name, category="stage", **args):
+        """Mede o bloco `with`; `args` (mutável dentro do bloco) vai junto no evento"""
+        if not self.enabled:
+            return contextlib.nullcontext(args)
+        return self._span(name, category, args)
+
+    def drain(self):
+        """Remove e retorna os eventos coletados (inclui os nomes das threads)"""
+        with self._lock:
+            events = self._events
+            threads = self._threads
+            self._events = []
+            self._threads = {}
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for (pid, tid), name in threads.items()
+        ]
+        return metadata + events
+
+    def extend(self, events):
+        """Incorpora eventos vindos de outro processo"""
+        with self._lock:
+            self._events.extend(e for e in events if e.get('ph') == 'X')
+            for e in events:
+                if e.get('ph') == 'M':
+                    self._threads[(e['pid'], e['tid'])] = e['args']['name']
+
+
+def export_chrome_trace(events, path):
+    """Grava os eventos no formato JSON aceito pelo chrome://tracing e pelo Perfetto"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    pids = sorted({e['pid'] for e in events})
+    names = [
+        {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+         'args': {'name': 'principal' if pid == os.getpid() else f'worker {pid}'}}
+        for pid in pids
+    ]
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({'traceEvents': names + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return path
+
+
+def summarize(events):
+    """Totais por etapa: [(nome, chamadas, total_ms, média_ms, máx_ms)], do maior total para o menor"""
+    stats = {}
+    for e in events:
+        if e.get('ph') != 'X':
+            continue
+        count, total, longest = stats.get(e['name'], (0, 0, 0))
+        stats[e['name']] = (count + 1, total + e['dur'], max(longest, e['dur']))
+    rows = [(name, count, total / 1000, total / count / 1000, longest / 1000)
+            for name, (count, total, longest) in stats.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def format_summary(events):
+    """Tabela de texto com o resumo; a porcentagem é relativa ao span 'run' (tempo total do lote)"""
+    rows = summarize(events)
+    wall = next((total for name, _, total, _, _ in rows if name == "run"), None)
+    lines = [f"{'etapa':24s} {'chamadas':>8s} {'total (ms)':>12s} {'média (ms)':>11s} {'máx (ms)':>10s} {'%':>6s}"]
+    for name, count, total, mean, longest in rows:
+        share = f"{total / wall * 100:5.1f}%" if wall else "     -"
+        lines.append(f"{name:24s} {count:8d} {total:12.1f} {mean:11.1f} {longest:10.1f} {share}")
+    return "\n".join(lines)
+
+
+# Instância global (desativada até configure/enabled = True)
+tracer = Tracer()
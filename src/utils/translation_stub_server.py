@@ -0,0 +1,124 @@
+"""Servidor local que imita a API do LibreTranslate para medições offline.
+
+Uso:
+    python -m src.utils.translation_stub_server --port 5055 --latency-ms 80
+
+e configure translation.provider = "libretranslate" com
+translation.libretranslate_url = "http://127.0.0.1:5055".
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+
+def fake_translate(text, target):
+    """Tradução determinística: prefixa o idioma de destino (mantém quebras de linha)"""
+    return "\n".join(f"[{target}] {line}" if line.strip() else line for line in text.split("\n"))
+
+
+class StubTranslationServer(ThreadingHTTPServer):
+    """Servidor HTTP com latência artificial e contadores de requisições"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0.0, fail_rate=0.0):
+        super().__init__(address, _StubHandler)
+        self.latency = latency_ms / 1000.0
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, texts):
+        with self._lock:
+            self.requests += 1
+            self.texts += texts
+            return self.requests
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, como um servidor real
+
+    def log_message(self, fmt, *args):
+        logger.debug(fmt % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/languages":
+            codes = ["pt", "en", "es", "fr", "de", "it"]
+            self._send_json(200, [{"code": c, "name": c, "targets": codes} for c in codes])
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/translate":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            q = payload["q"]
+            target = payload.get("target", "pt")
+        except (ValueError, KeyError):
+            self._send_json(400, {"error": "Invalid request"})
+            return
+
+        texts = q if isinstance(q, list) else [q]
+        number = self.server.count(len(texts))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        # Falhas determinísticas (a cada N requisições) para exercitar as novas tentativas
+        if self.server.fail_rate and number % max(1, round(1 / self.server.fail_rate)) == 0:
+            self._send_json(429, {"error": "Too many requests"})
+            return
+
+        translated = [fake_translate(t, target) for t in texts]
+        self._send_json(200, {"translatedText": translated if isinstance(q, list) else translated[0]})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de tradução falso (API LibreTranslate)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Atraso artificial por requisição")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fração de requisições respondidas com 429")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = StubTranslationServer((args.host, args.port), latency_ms=args.latency_ms, fail_rate=args.fail_rate)
+    print(f"Servidor de tradução falso em {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Requisições: {server.requests}, textos: {server.texts}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+from src.core import backends
+from src.core.backends import FasterWhisperBackend, OpenAIWhisperBackend, backend_from_config, get_backend
+from src.core.progress import ProgressTracker, progress_scope
+
+
+def _config(backend):
+    return ConfigManager().snapshot({"transcription.backend": backend})
+
+
+class BackendFromConfigTest(unittest.TestCase):
+    def _choose(self, backend, device=None, installed=True):
+        with mock.patch.object(backends.importlib.util, "find_spec", return_value=object() if installed else None):
+            return backend_from_config(_config(backend), device).name
+
+    def test_default_is_openai_whisper(self):
+        self.assertEqual(self._choose(""), "openai-whisper")
+        self.assertEqual(backend_from_config(None).name, "openai-whisper")
+        self.assertEqual(backend_from_config(ConfigManager().snapshot()).name, "openai-whisper")
+
+    def test_faster_whisper_only_when_installed(self):
+        self.assertEqual(self._choose("faster-whisper"), "faster-whisper")
+        self.assertEqual(self._choose("faster-whisper", installed=False), "openai-whisper")
+
+    def test_auto_prefers_faster_whisper_on_cpu(self):
+        self.assertEqual(self._choose("auto", "cpu"), "faster-whisper")
+        self.assertEqual(self._choose("auto", None), "faster-whisper")
+        self.assertEqual(self._choose("auto", "cuda"), "openai-whisper")
+        self.assertEqual(self._choose("auto", "cpu", installed=False), "openai-whisper")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend("whisper.cpp")
+
+
+class FasterWhisperBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = FasterWhisperBackend()
+
+    def test_only_shared_options_are_forwarded(self):
+        options = {'language': 'pt', 'fp16': False, 'beam_size': 5, 'logprob_threshold': -1.0}
+        self.assertEqual(self.backend._options(options), {'language': 'pt', 'beam_size': 5})
+
+    def test_model_bytes_estimate(self):
+        self.assertEqual(self.backend.model_bytes(None, 'base', 'cpu'), int(74e6 * 4))
+        self.assertEqual(self.backend.model_bytes(None, 'base', 'cuda'), int(74e6 * 2))
+        self.assertEqual(self.backend.model_bytes(None, 'large-v3', 'cpu', 'int8'), int(1550e6))
+
+    def test_segments_are_converted_to_openai_format(self):
+        segments = [SimpleNamespace(start=0.0, end=2.0, text=" Oi", tokens=(1, 2), avg_logprob=-0.1,
+                                    compression_ratio=1.2, no_speech_prob=0.01, seek=0, temperature=0.0),
+                    SimpleNamespace(start=2.5, end=4.0, text=" tudo bem", tokens=(3,), avg_logprob=-0.2,
+                                    compression_ratio=1.1, no_speech_prob=0.02)]
+        model = mock.Mock()
+        model.transcribe.return_value = (iter(segments), SimpleNamespace(duration=8.0, language='pt'))
+        tracker = ProgressTracker("job", min_interval=0)
+        with progress_scope(tracker):
+            result = self.backend.transcribe(model, [0.0] * 16, {'language': 'pt', 'fp16': False})
+
+        self.assertEqual(model.transcribe.call_args.kwargs, {'language': 'pt'})
+        self.assertEqual(result['text'], " Oi tudo bem")
+        self.assertEqual(result['language'], 'pt')
+        self.assertEqual([(s['id'], s['start'], s['end'], s['tokens']) for s in result['segments']],
+                         [(0, 0.0, 2.0, [1, 2]), (1, 2.5, 4.0, [3])])
+        self.assertEqual((tracker.total_seconds, tracker.percent), (8.0, 50))
+
+
+class OpenAIWhisperBackendTest(unittest.TestCase):
+    def test_model_bytes_without_state_dict(self):
+        self.assertEqual(OpenAIWhisperBackend().model_bytes(object()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
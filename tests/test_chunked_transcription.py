@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from src.core.chunked_transcription import plan_chunks, stitch_results
+
+SR = 100  # Taxa baixa: os cortes só dependem da energia por quadro
+
+
+class PlanChunksTest(unittest.TestCase):
+    def test_short_audio_is_a_single_chunk(self):
+        chunks, cuts = plan_chunks(np.ones(150 * SR, dtype=np.float32), chunk_seconds=100, sr=SR)
+        self.assertEqual(chunks, [(0, 150 * SR)])
+        self.assertEqual(cuts, [0, 150 * SR])
+
+    def test_cuts_land_in_the_quietest_stretch(self):
+        audio = np.ones(300 * SR, dtype=np.float32)
+        audio[110 * SR:112 * SR] = 0.0  # Silêncio perto do primeiro alvo (100 s)
+        chunks, cuts = plan_chunks(audio, chunk_seconds=100, overlap_seconds=2.0, search_seconds=30, sr=SR)
+        self.assertTrue(110 * SR <= cuts[1] <= 112 * SR)
+        self.assertEqual(cuts[0], 0)
+        self.assertEqual(cuts[-1], len(audio))
+        # Cada chunk cobre o próprio trecho mais a sobreposição
+        for (start, end), lo, hi in zip(chunks, cuts[:-1], cuts[1:]):
+            self.assertEqual(start, max(0, lo - 2 * SR))
+            self.assertEqual(end, min(len(audio), hi + 2 * SR))
+
+
+class StitchResultsTest(unittest.TestCase):
+    def test_overlap_duplicates_are_dropped(self):
+        chunks = [(0, 12 * SR), (8 * SR, 20 * SR)]
+        cuts = [0, 10 * SR, 20 * SR]
+        results = [
+            {'language': 'en', 'segments': [{'start': 1.0, 'end': 3.0, 'text': ' a'},
+                                            {'start': 9.0, 'end': 11.0, 'text': ' b'}]},
+            # Relativo ao início do segundo chunk (8 s): o mesmo ' b' e um novo ' c'
+            {'language': 'en', 'segments': [{'start': 1.0, 'end': 3.0, 'text': ' b'},
+                                            {'start': 5.0, 'end': 6.0, 'text': ' c'}]},
+        ]
+        result = stitch_results(results, chunks, cuts, sr=SR)
+        self.assertEqual([(s['start'], s['end'], s['text']) for s in result['segments']],
+                         [(1.0, 3.0, ' a'), (9.0, 11.0, ' b'), (13.0, 14.0, ' c')])
+        self.assertEqual([s['id'] for s in result['segments']], [0, 1, 2])
+        self.assertEqual(result['text'], ' a b c')
+        self.assertEqual(result['language'], 'en')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import json
+import copy
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+
+
+class ConfigManagerTest(unittest.TestCase):
+    def setUp(self):
+        # ConfigManager é um singleton: guarda o estado e usa um arquivo temporário
+        self.manager = ConfigManager()
+        self._saved = (self.manager.config_file, copy.deepcopy(self.manager.config), dict(self.manager._session_values))
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "config.json")
+        self.manager.initialize(self.path)
+
+    def tearDown(self):
+        self.manager.set_write_behind(0)
+        self.manager._listeners = []
+        self.manager.config_file, self.manager.config, self.manager._session_values = self._saved
+        self._tmp.cleanup()
+
+    def _on_disk(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_defaults_are_loaded(self):
+        self.assertEqual(self.manager.get("subtitle.formats"), ["srt"])
+        self.assertEqual(self.manager.get("missing.key", 42), 42)
+        self.assertTrue(self.manager.has_key("font.color"))
+        self.assertFalse(self.manager.has_key("font.nope"))
+
+    def test_set_persists(self):
+        self.manager.set("font.size", 30)
+        self.assertEqual(self._on_disk()["font"]["size"], 30)
+
+    def test_session_only_values_are_not_saved(self):
+        self.manager.set("font.size", 30)
+        self.manager.set("font.size", 99, persist=False)
+        self.manager.set("extra.flag", True, persist=False)
+        self.manager.set("font.bold", True)
+        self.assertEqual(self.manager.get("font.size"), 99)
+        on_disk = self._on_disk()
+        self.assertEqual(on_disk["font"]["size"], 30)
+        self.assertTrue(on_disk["font"]["bold"])
+        self.assertNotIn("extra", on_disk)
+
+    def test_transaction_saves_once_at_the_end(self):
+        with self.manager.transaction():
+            self.manager.set("font.size", 31)
+            self.assertFalse(os.path.exists(self.path))
+            self.manager.set("font.bold", True)
+        on_disk = self._on_disk()
+        self.assertEqual((on_disk["font"]["size"], on_disk["font"]["bold"]), (31, True))
+
+    def test_transaction_rolls_back_on_error(self):
+        size = self.manager.get("font.size")
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.set("font.size", 50)
+                self.manager.set("new.section", 1, persist=False)
+                raise RuntimeError("falha")
+        self.assertEqual(self.manager.get("font.size"), size)
+        self.assertNotIn("new", self.manager.config)
+        self.assertEqual(self.manager._session_values, {})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_snapshot_is_isolated(self):
+        snapshot = self.manager.snapshot({"font.size": 12})
+        self.assertEqual(snapshot.get("font.size"), 12)
+        self.assertNotEqual(self.manager.get("font.size"), 12)
+        snapshot.set("font.color", "#000000")
+        self.assertNotEqual(self.manager.get("font.color"), "#000000")
+
+    def test_write_behind_coalesces_saves(self):
+        self.manager.set_write_behind(60)
+        with mock.patch.object(self.manager, "save", wraps=self.manager.save) as save:
+            for size in range(20, 25):
+                self.manager.set("font.size", size)
+            self.assertFalse(os.path.exists(self.path))
+            self.manager.flush()
+            self.manager.flush()
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(self._on_disk()["font"]["size"], 24)
+
+    def test_write_behind_timer_saves_after_delay(self):
+        self.manager.set_write_behind(0.05)
+        self.manager.set("font.size", 40)
+        timer = self.manager._save_timer
+        timer.join(5)
+        self.assertEqual(self._on_disk()["font"]["size"], 40)
+
+    def test_disabling_write_behind_flushes(self):
+        self.manager.set_write_behind(60)
+        self.manager.set("font.size", 41)
+        self.manager.set_write_behind(0)
+        self.assertEqual(self._on_disk()["font"]["size"], 41)
+
+    def test_subscribers_filter_by_prefix(self):
+        font, everything = [], []
+        self.manager.subscribe(lambda *change: font.append(change), "font")
+        unsubscribe = self.manager.subscribe(lambda *change: everything.append(change))
+        old_size = self.manager.get("font.size")
+        self.manager.set("font.size", 33)
+        self.manager.set("font.size", 33)  # Sem alteração, sem aviso
+        self.manager.set("fontx.size", 1, persist=False)
+        unsubscribe()
+        self.manager.set("font.bold", True)
+        self.assertEqual(font, [("font.size", old_size, 33), ("font.bold", False, True)])
+        self.assertEqual(everything, [("font.size", old_size, 33), ("fontx.size", None, 1)])
+
+    def test_transaction_notifies_at_the_end_and_not_on_rollback(self):
+        changes = []
+        self.manager.subscribe(lambda *change: changes.append(change), "font.size")
+        with self.manager.transaction():
+            self.manager.update({"font.size": 34, "font.bold": True})
+            self.assertEqual(changes, [])
+        self.assertEqual([c[2] for c in changes], [34])
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.set("font.size", 35)
+                raise RuntimeError("falha")
+        self.assertEqual(len(changes), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
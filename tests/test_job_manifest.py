@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from src.core.job_manifest import JobManifest, settings_hash
+
+
+class JobManifestTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.video = os.path.join(self.tmp, "ep1.mp4")
+        with open(self.video, "wb") as f:
+            f.write(b"video")
+        self.manifest = JobManifest(self.tmp)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_settings_hash_is_order_independent(self):
+        self.assertEqual(settings_hash({'a': 1, 'b': [1, 2]}), settings_hash({'b': [1, 2], 'a': 1}))
+        self.assertNotEqual(settings_hash({'a': 1}), settings_hash({'a': 2}))
+
+    def test_stage_round_trip(self):
+        entry = self.manifest.get(self.video)
+        self.manifest.set_stage(self.video, entry, 'transcription', 'h1', segments=[{'text': 'oi'}])
+        entry = JobManifest(self.tmp).get(self.video)
+        self.assertEqual(JobManifest.stage(entry, 'transcription', 'h1')['segments'], [{'text': 'oi'}])
+        self.assertIsNone(JobManifest.stage(entry, 'transcription', 'other'))
+
+    def test_is_complete_requires_outputs_on_disk(self):
+        srt = os.path.join(self.tmp, "ep1.srt")
+        self.manifest.set_stage(self.video, self.manifest.get(self.video), 'subtitle', 'h', outputs=[srt])
+        self.assertFalse(self.manifest.is_complete(self.video, 'h'))
+        open(srt, "w").close()
+        self.assertTrue(self.manifest.is_complete(self.video, 'h'))
+        self.assertFalse(self.manifest.is_complete(self.video, 'changed'))
+
+    def test_changed_video_starts_over_but_keeps_output_history(self):
+        muxed = os.path.join(self.tmp, "ep1.legendado.mkv")
+        self.manifest.set_stage(self.video, self.manifest.get(self.video), 'mux', 'h', outputs=[muxed])
+        st = os.stat(self.video)
+        os.utime(self.video, (st.st_atime, st.st_mtime + 10))
+
+        entry = self.manifest.get(self.video)
+        self.assertEqual(entry['stages'], {})
+        self.assertEqual(self.manifest.outputs('mux'), {muxed})
+
+    def test_outputs_accumulate_across_settings(self):
+        first = os.path.join(self.tmp, "ep1.legendado.mkv")
+        second = os.path.join(self.tmp, "ep1.legendado.mp4")
+        entry = self.manifest.get(self.video)
+        self.manifest.set_stage(self.video, entry, 'mux', 'h1', outputs=[first])
+        self.manifest.set_stage(self.video, entry, 'mux', 'h2', outputs=[second])
+        self.assertEqual(self.manifest.outputs('mux'), {first, second})
+        self.assertEqual(self.manifest.outputs('subtitle'), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
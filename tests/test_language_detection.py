@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from src.utils.config_manager import ConfigManager
+from src.core.audio import SAMPLE_RATE
+from src.core.language_detection import base_language, same_language, detection_options, speech_window
+
+
+class LanguageCodeTest(unittest.TestCase):
+    def test_base_language(self):
+        self.assertEqual(base_language("pt_BR"), "pt")
+        self.assertEqual(base_language(" PT-br "), "pt")
+        self.assertEqual(base_language("zh-CN"), "zh")
+        self.assertIsNone(base_language("auto"))
+        self.assertIsNone(base_language(""))
+        self.assertIsNone(base_language(None))
+
+    def test_same_language(self):
+        self.assertTrue(same_language("pt", "pt-BR"))
+        self.assertTrue(same_language("EN_us", "en"))
+        self.assertFalse(same_language("pt", "en"))
+        self.assertFalse(same_language(None, "pt"))
+        self.assertFalse(same_language("auto", "auto"))
+
+
+class DetectionOptionsTest(unittest.TestCase):
+    def test_window_is_capped_at_whisper_window(self):
+        options = detection_options(ConfigManager().snapshot({"transcription.language_detection.window_seconds": 90}))
+        self.assertEqual(options['window_seconds'], 30.0)
+
+    def test_disabled(self):
+        self.assertIsNone(detection_options(ConfigManager().snapshot({"transcription.language_detection.enabled": False})))
+        self.assertIsNone(detection_options(None))
+
+    def test_window_starts_at_first_speech(self):
+        rng = np.random.default_rng(0)
+        audio = rng.normal(0, 0.001, 60 * SAMPLE_RATE).astype(np.float32)
+        audio[20 * SAMPLE_RATE:] += rng.normal(0, 0.3, 40 * SAMPLE_RATE).astype(np.float32)
+        window = speech_window(audio, 10)
+        self.assertEqual(len(window), 10 * SAMPLE_RATE)
+        start = np.flatnonzero(audio == window[0])[0] / SAMPLE_RATE
+        self.assertAlmostEqual(start, 20, delta=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
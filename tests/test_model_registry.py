@@ -0,0 +1,77 @@
+import threading
+import unittest
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+from src.core import model_registry as registry_module
+from src.core.model_registry import ModelRegistry, warm_up_from_config
+
+
+def _fresh_registry():
+    """Instância própria, fora do singleton do processo"""
+    registry = object.__new__(ModelRegistry)
+    registry.__init__()
+    return registry
+
+
+class ModelRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = _fresh_registry()
+        self.loads = []
+
+        def load(model_size, device, quantization, backend):
+            self.loads.append(model_size)
+            return object()
+        self.registry._load = load
+        self.registry._model_bytes = lambda model, size, *args: {'tiny': 1, 'base': 2, 'small': 4}[size] * 2**20
+
+    def test_model_is_loaded_once_and_shared(self):
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(self.registry.get('base'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.loads, ['base'])
+        self.assertEqual(len({id(m) for m in models}), 1)
+
+    def test_least_recently_used_model_is_evicted_over_budget(self):
+        self.registry.set_memory_budget(6)
+        self.registry.get('tiny')
+        self.registry.get('base')
+        self.registry.get('tiny')  # 'base' passa a ser o menos usado
+        self.registry.get('small')
+        self.assertTrue(self.registry.is_loaded('tiny'))
+        self.assertFalse(self.registry.is_loaded('base'))
+        self.assertTrue(self.registry.is_loaded('small'))
+
+    def test_inference_lock_is_per_model(self):
+        self.assertIs(self.registry.inference_lock('base'), self.registry.inference_lock('base', 'auto'))
+        self.assertIsNot(self.registry.inference_lock('base'), self.registry.inference_lock('small'))
+
+
+class WarmUpFromConfigTest(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            mock.patch.object(registry_module.model_registry, "preload_async"),
+            mock.patch.object(registry_module.model_registry, "set_memory_budget"),
+            mock.patch.object(registry_module, "model_spec_from_config", return_value=('base', 'cpu', None, 'openai-whisper')),
+        ]
+        self.preload = patchers[0].start()
+        for patcher in patchers[1:]:
+            patcher.start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def test_preloads_by_default(self):
+        warm_up_from_config(ConfigManager().snapshot())
+        self.preload.assert_called_once_with('base', 'cpu', None, 'openai-whisper')
+
+    def test_skipped_when_not_needed_disabled_or_scheduled(self):
+        warm_up_from_config(ConfigManager().snapshot(), preload=False)
+        warm_up_from_config(ConfigManager().snapshot({"transcription.preload": False}))
+        warm_up_from_config(ConfigManager().snapshot({"transcription.scheduler.enabled": True}))
+        self.preload.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+from src.core import model_scheduler as scheduler_module
+from src.core.model_scheduler import ModelScheduler, SpeedStats
+
+
+class SpeedStatsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.stats = SpeedStats(self._tmp.name, device='cpu')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_prior_until_measured(self):
+        self.assertEqual(self.stats.rtf('large-v3'), (3.2, False))
+        self.assertEqual(self.stats.rtf('base.en'), (0.2, False))
+        self.assertEqual(self.stats.rtf('desconhecido'), (1.0, False))
+
+    def test_measurements_are_averaged_and_persisted(self):
+        self.stats.record('base', 100, 50)
+        self.stats.record('base', 100, 100)
+        self.stats.record('base', 0, 10)  # Ignorada
+        rtf, measured = SpeedStats(self._tmp.name, device='cpu').rtf('base')
+        self.assertAlmostEqual(rtf, 0.5 * 0.7 + 1.0 * 0.3)
+        self.assertTrue(measured)
+        self.assertEqual(self.stats.measurements()['base']['samples'], 2)
+        # Outro dispositivo, outra chave
+        self.assertFalse(SpeedStats(self._tmp.name, device='cuda').rtf('base')[1])
+
+
+class ModelSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.stats = SpeedStats(self._tmp.name)
+        self.now = 1000.0
+        patcher = mock.patch.object(scheduler_module.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_scheduler(self, **settings):
+        overrides = {"transcription.scheduler.safety_margin": 1.0,
+                     **{f"transcription.scheduler.{k}": v for k, v in settings.items()}}
+        return ModelScheduler(ConfigManager().snapshot(overrides), stats=self.stats)
+
+    def test_without_a_target_uses_the_most_accurate_model(self):
+        scheduler = self.make_scheduler()
+        self.assertIsNone(scheduler.budget())
+        self.assertEqual(scheduler.choose("a.mp4"), "medium")
+
+    def test_max_rtf_picks_the_largest_model_that_fits(self):
+        scheduler = self.make_scheduler(max_rtf=0.5)
+        self.assertEqual(scheduler.choose("a.mp4"), "base")
+        self.stats.record('small', 100, 40)  # Medido: mais rápido que a estimativa
+        self.assertEqual(scheduler.choose("a.mp4"), "small")
+
+    def test_nothing_fits_falls_back_to_the_fastest(self):
+        self.assertEqual(self.make_scheduler(max_rtf=0.01).choose("a.mp4"), "tiny")
+
+    def test_deadline_budget_shrinks_with_time_and_grows_with_workers(self):
+        scheduler = self.make_scheduler(deadline_hours=1)
+        with mock.patch.object(scheduler, "duration_of", side_effect=lambda v: {'a': 3600, 'b': None}[v]):
+            scheduler.begin_batch(['a', 'b'])
+        # 7200 s de áudio (duração desconhecida = média) em 3600 s
+        self.assertAlmostEqual(scheduler.budget(), 0.5)
+        scheduler.done('a')
+        self.now += 1800
+        self.assertAlmostEqual(scheduler.budget(), 0.5)
+        scheduler.workers = 2
+        self.assertAlmostEqual(scheduler.budget(), 1.0)
+
+    def test_budget_is_the_tighter_of_both_targets(self):
+        scheduler = self.make_scheduler(deadline_hours=1, max_rtf=0.3)
+        with mock.patch.object(scheduler, "duration_of", return_value=600):
+            scheduler.begin_batch(['a'])
+        self.assertAlmostEqual(scheduler.budget(), 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
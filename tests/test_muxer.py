@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.core import muxer
+from src.core.muxer import language_tag, pick_subtitle, mux_subtitles
+
+
+class LanguageTagTest(unittest.TestCase):
+    def test_bibliographic_for_matroska_terminologic_for_mp4(self):
+        self.assertEqual(language_tag("pt"), "por")
+        self.assertEqual(language_tag("de"), "ger")
+        self.assertEqual(language_tag("de", "mp4"), "deu")
+        self.assertEqual(language_tag("zh-CN", "mov"), "zho")
+
+    def test_unknown_codes(self):
+        self.assertEqual(language_tag(None), "und")
+        self.assertEqual(language_tag("xx"), "und")
+        self.assertEqual(language_tag("fil"), "fil")
+
+
+class PickSubtitleTest(unittest.TestCase):
+    def test_prefers_format_the_container_keeps_best(self):
+        paths = ["/v/a.srt", "/v/a.vtt", "/v/a.ass"]
+        self.assertEqual(pick_subtitle(paths, "mkv"), "/v/a.ass")
+        self.assertEqual(pick_subtitle(paths, "mp4"), "/v/a.srt")
+        self.assertIsNone(pick_subtitle([], "mkv"))
+
+
+class MuxSubtitlesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self._tmp.name, "out.mkv")
+        self.tracks = [{'path': "/v/a.pt.srt", 'language': "pt", 'title': "Português"},
+                       {'path': "/v/a.en.srt", 'language': "en"}]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _mux(self, video, container, existing=0):
+        def fake_run(cmd, **kwargs):
+            open(cmd[-1], "w").close()
+            return mock.Mock(stdout="")
+        with mock.patch.object(muxer, "count_subtitle_streams", return_value=existing), \
+                mock.patch.object(muxer.subprocess, "run", side_effect=fake_run) as run:
+            self.assertEqual(mux_subtitles(video, self.tracks, self.output, container), self.output)
+        self.assertTrue(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + ".part"))
+        return run.call_args[0][0]
+
+    def test_matroska_source_keeps_everything(self):
+        cmd = self._mux("/v/a.mkv", "mkv", existing=1)
+        self.assertIn("0", cmd[cmd.index("-map") + 1:cmd.index("-map") + 2])
+        self.assertNotIn("-c:s:0", cmd)
+        self.assertEqual(cmd[cmd.index("-metadata:s:s:1") + 1], "language=por")
+        self.assertEqual(cmd[cmd.index("-disposition:s:1") + 1], "default")
+        self.assertEqual(cmd[cmd.index("-disposition:s:2") + 1], "0")
+        self.assertEqual(cmd[-3:-1], ["-f", "matroska"])
+
+    def test_mp4_source_into_matroska_converts_existing_tracks(self):
+        cmd = self._mux("/v/a.mp4", "mkv", existing=2)
+        self.assertIn("0:s?", cmd)
+        self.assertEqual(cmd[cmd.index("-c:s:0") + 1], "srt")
+        self.assertEqual(cmd[cmd.index("-c:s:1") + 1], "srt")
+        self.assertNotIn("-c:s:2", cmd)
+        self.assertIn("-metadata:s:s:2", cmd)
+
+    def test_mp4_drops_old_tracks_and_uses_mov_text(self):
+        cmd = self._mux("/v/a.mkv", "mp4", existing=0)
+        self.assertNotIn("0:s?", cmd)
+        self.assertEqual(cmd[cmd.index("-c:s") + 1], "mov_text")
+        self.assertEqual(cmd[cmd.index("-metadata:s:s:0") + 1], "language=por")
+        self.assertEqual(cmd[cmd.index("-metadata:s:s:0", cmd.index("-metadata:s:s:0") + 1) + 1], "title=Português")
+
+
+if __name__ == '__main__':
+    unittest.main()
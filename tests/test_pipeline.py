@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+from src.core.job_manifest import JobManifest
+from src.core.pipeline import SubtitlePipeline, collect_videos
+
+
+class FakeTranscriber:
+    """Devolve sempre os mesmos segmentos e conta as chamadas (sem Whisper)"""
+
+    model_size = 'base'
+
+    def __init__(self, language='en'):
+        self.language = language
+        self.calls = 0
+
+    def transcription_options(self):
+        return {}
+
+    def transcribe(self, source, progress_callback=None, tracker=None, language=None):
+        self.calls += 1
+        segments = [
+            {'id': 0, 'start': 0.0, 'end': 1.5, 'text': ' Hello there'},
+            {'id': 1, 'start': 2.0, 'end': 3.25, 'text': ' General Kenobi'},
+        ]
+        return {'text': ''.join(s['text'] for s in segments), 'segments': segments, 'language': self.language}
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_segments(self, segments, target_lang, progress_callback=None, source_lang=None):
+        self.calls.append((target_lang, source_lang))
+        return [dict(seg, text=seg['text'].upper()) for seg in segments]
+
+
+def _touch(path, data=b"video"):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+class CollectVideosTest(unittest.TestCase):
+    def test_directories_globs_and_files_are_deduplicated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            a = _touch(os.path.join(tmp, "a.mp4"))
+            b = _touch(os.path.join(tmp, "b.MKV"))
+            _touch(os.path.join(tmp, "notes.txt"))
+            videos = collect_videos([tmp, os.path.join(tmp, "*.mp4"), a, os.path.join(tmp, "missing.mp4")])
+            self.assertEqual(videos, [os.path.abspath(a), os.path.abspath(b)])
+
+
+class SubtitlePipelineTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.video = _touch(os.path.join(self.tmp, "ep1.mp4"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_pipeline(self, language='en', **settings):
+        overrides = {"performance.prefetch": 0, "cache.enabled": False, **settings}
+        config = ConfigManager().snapshot(overrides)
+        self.transcriber = FakeTranscriber(language)
+        self.translator = FakeTranslator()
+        return SubtitlePipeline(config, transcriber=self.transcriber, translator=self.translator)
+
+    def test_run_writes_srt(self):
+        pipeline = self.make_pipeline()
+        outputs = pipeline.run([self.video])
+        self.assertEqual(outputs, [os.path.join(self.tmp, "ep1.srt")])
+        with open(outputs[0], encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("1\n00:00:00,000 --> 00:00:01,500\n", content)
+        self.assertIn("General Kenobi", content)
+
+    def test_changed_settings_rerun_only_later_stages(self):
+        pipeline = self.make_pipeline()
+        pipeline.run([self.video])
+        pipeline.config.set("translation.enabled", True)
+        pipeline.config.set("translation.target_language", "pt")
+        pipeline.run([self.video])
+        self.assertEqual(self.transcriber.calls, 1)
+        self.assertEqual(self.translator.calls, [("pt", "en")])
+
+    def test_translation_rate_is_split_between_workers(self):
+        pipeline = self.make_pipeline(**{"translation.requests_per_second": 6})
+        worker_config = pipeline._worker_config(3)
+        self.assertEqual(worker_config["translation"]["requests_per_second"], 2.0)
+        self.assertEqual(pipeline.config.get("translation.requests_per_second"), 6)
+
+    def test_model_is_needed_until_every_video_is_transcribed(self):
+        pipeline = self.make_pipeline()
+        self.assertTrue(pipeline.needs_model([self.video]))
+        pipeline.run([self.video])
+        self.assertFalse(pipeline.needs_model([self.video]))
+        # Mudar só a tradução não exige o modelo de novo
+        pipeline.config.set("translation.enabled", True)
+        self.assertFalse(pipeline.needs_model([self.video]))
+        pipeline.config.set("batch.resume", False)
+        self.assertTrue(pipeline.needs_model([self.video]))
+
+    def test_second_run_is_skipped_by_manifest(self):
+        pipeline = self.make_pipeline()
+        pipeline.run([self.video])
+        pipeline.run([self.video])
+        self.assertEqual(self.transcriber.calls, 1)
+
+    def test_streaming_never_prefetches_whole_files(self):
+        second = _touch(os.path.join(self.tmp, "ep2.mp4"))
+        for streaming, expected in ((False, 1), (True, 0)):
+            pipeline = self.make_pipeline(**{"performance.prefetch": 1, "streaming.enabled": streaming,
+                                             "batch.resume": False})
+            with mock.patch("src.core.pipeline.AudioPrefetcher",
+                            return_value=iter([(self.video, None), (second, None)])) as prefetcher:
+                pipeline.run([self.video, second])
+            self.assertEqual(prefetcher.call_count, expected)
+
+    def test_muxed_copies_are_never_inputs(self):
+        pipeline = self.make_pipeline()
+        muxed = _touch(os.path.join(self.tmp, "ep1.legendado.mkv"))
+        other = _touch(os.path.join(self.tmp, "ep1.pt.mp4"))
+        manifest = JobManifest(self.tmp)
+        manifest.set_stage(self.video, manifest.get(self.video), 'mux', 'hash', outputs=[other])
+
+        # Mesmo com o mux desativado, as cópias geradas antes ficam de fora
+        self.assertEqual(pipeline.filter_inputs([self.video, muxed, other]), [self.video])
+        self.assertTrue(pipeline.is_output(muxed))
+        self.assertFalse(pipeline.is_output(self.video))
+
+    def test_translation_skipped_when_audio_already_in_target(self):
+        pipeline = self.make_pipeline(language='pt', **{"translation.enabled": True,
+                                                         "translation.target_language": "pt-BR"})
+        pipeline.run([self.video])
+        self.assertEqual(self.translator.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
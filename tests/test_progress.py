@@ -0,0 +1,84 @@
+import pickle
+import threading
+import unittest
+import multiprocessing
+from src.core.progress import ProgressEvent, ProgressTracker, current_tracker, progress_scope
+
+
+def _send_event(events):
+    events.put(ProgressEvent("job", 40, 12.0, 30.0, 6.0))
+
+
+class ProgressTrackerTest(unittest.TestCase):
+    def test_events_are_throttled_and_finish_is_always_emitted(self):
+        tracker = ProgressTracker("job", total_seconds=100, min_interval=60)
+        events = []
+        tracker.subscribe(events.append)
+        for _ in range(50):
+            tracker.advance(1)
+        self.assertEqual([e.percent for e in events], [1])
+        final = tracker.finish()
+        self.assertEqual((final.percent, events[-1]), (100, final))
+        self.assertEqual(len(events), 2)
+
+    def test_unchanged_percent_is_not_emitted(self):
+        tracker = ProgressTracker("job", total_seconds=1000, min_interval=0)
+        events = []
+        tracker.subscribe(events.append)
+        for _ in range(5):
+            tracker.advance(1)
+        self.assertEqual([e.percent for e in events], [0])
+
+    def test_percent_never_goes_back_and_stops_at_99_until_finish(self):
+        tracker = ProgressTracker("job", total_seconds=10, min_interval=0)
+        tracker.set_position(5)
+        tracker.set_position(2)
+        self.assertEqual((tracker.percent, tracker.audio_seconds), (50, 5))
+        tracker.set_position(20)
+        self.assertEqual(tracker.percent, 99)
+        tracker.set_percent(10)
+        self.assertEqual(tracker.percent, 99)
+
+    def test_unsubscribe_and_failing_subscribers(self):
+        tracker = ProgressTracker("job", total_seconds=10, min_interval=0)
+        events = []
+        tracker.subscribe(lambda e: 1 / 0)
+        unsubscribe = tracker.subscribe(events.append)
+        tracker.set_position(1)
+        unsubscribe()
+        tracker.set_position(2)
+        self.assertEqual(len(events), 1)
+
+    def test_scope_is_per_thread(self):
+        tracker = ProgressTracker("job")
+        seen = []
+        with progress_scope(tracker):
+            thread = threading.Thread(target=lambda: seen.append(current_tracker()))
+            thread.start()
+            thread.join()
+            self.assertIs(current_tracker(), tracker)
+        self.assertEqual(seen, [None])
+        self.assertIsNone(current_tracker())
+
+
+class ProgressEventTest(unittest.TestCase):
+    def test_rtf(self):
+        self.assertEqual(ProgressEvent("job", 50, 10.0, 20.0, 5.0).rtf, 0.5)
+        self.assertIsNone(ProgressEvent("job", 0, 0.0, None, 1.0).rtf)
+
+    def test_pickles_across_processes(self):
+        event = pickle.loads(pickle.dumps(ProgressEvent("job", 50, 10.0, 20.0, 5.0)))
+        self.assertEqual((event.job_id, event.percent, event.rtf), ("job", 50, 0.5))
+
+        ctx = multiprocessing.get_context("spawn")
+        events = ctx.Queue()
+        process = ctx.Process(target=_send_event, args=(events,))
+        process.start()
+        received = events.get(timeout=30)
+        process.join(timeout=30)
+        self.assertEqual((received.job_id, received.percent, received.total_seconds, received.rtf),
+                         ("job", 40, 30.0, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
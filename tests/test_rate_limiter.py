@@ -0,0 +1,71 @@
+import time
+import unittest
+from unittest import mock
+from src.utils import rate_limiter
+from src.utils.rate_limiter import TokenBucket, get_rate_limiter, retry_with_backoff
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        for _ in range(5):
+            bucket.acquire()
+        # 5 fichas a 50/s: ~0,1 s de espera
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket(rate=0)
+        with mock.patch.object(rate_limiter.time, "sleep") as sleep:
+            for _ in range(100):
+                bucket.acquire()
+        sleep.assert_not_called()
+
+    def test_limiter_is_shared_per_provider_and_rate(self):
+        limiter = get_rate_limiter("test-provider", 3)
+        self.assertIs(get_rate_limiter("test-provider", 3), limiter)
+        self.assertIsNot(get_rate_limiter("test-provider", 4), limiter)
+
+
+class RetryWithBackoffTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(rate_limiter.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _flaky(self, failures, error=ConnectionError("falha")):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error
+            return "ok"
+        return func, calls
+
+    def test_succeeds_after_transient_failures(self):
+        func, calls = self._flaky(2)
+        self.assertEqual(retry_with_backoff(func, retries=3, base_delay=0.5), "ok")
+        self.assertEqual(len(calls), 3)
+        delays = [c.args[0] for c in self.sleep.call_args_list]
+        self.assertTrue(0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0)
+
+    def test_gives_up_after_retries(self):
+        func, calls = self._flaky(10)
+        with self.assertRaises(ConnectionError):
+            retry_with_backoff(func, retries=2)
+        self.assertEqual(len(calls), 3)
+
+    def test_non_transient_errors_are_raised_at_once(self):
+        func, calls = self._flaky(1, ValueError("inválido"))
+        with self.assertRaises(ValueError):
+            retry_with_backoff(func, retries=3, retry_if=lambda e: isinstance(e, ConnectionError))
+        self.assertEqual(len(calls), 1)
+        self.sleep.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import http.client
+from src.utils.config_manager import ConfigManager
+from src.core.jobs import JobQueue
+from src.server import JobServer
+
+
+class JobServerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self._tmp.name, "ep1.mp4")
+        open(self.video, "wb").close()
+        # Fila não iniciada: os jobs só são enfileirados
+        self.jobs = JobQueue(ConfigManager())
+        self.server = JobServer(("127.0.0.1", 0), self.jobs, token="segredo")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def _request(self, method, path, body=None, token="segredo"):
+        conn = http.client.HTTPConnection(*self.server.server_address[:2], timeout=5)
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        data = None if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+        conn.request(method, path, body=data, headers=headers)
+        response = conn.getresponse()
+        payload = json.loads(response.read())
+        conn.close()
+        return response.status, payload
+
+    def test_requires_token(self):
+        self.assertEqual(self._request("GET", "/health", token=None)[0], 401)
+        self.assertEqual(self._request("GET", "/health", token="errado")[0], 401)
+
+    def test_health_with_query_string(self):
+        status, payload = self._request("GET", "/health?verbose=1")
+        self.assertEqual((status, payload["status"]), (200, "ok"))
+
+    def test_submit_and_fetch_job(self):
+        status, job = self._request("POST", "/jobs/?source=test", {"videos": self.video,
+                                                                   "settings": {"translation.target_language": "en"}})
+        self.assertEqual(status, 202)
+        self.assertEqual(self._request("GET", f"/jobs/{job['id']}?x=1")[1]["id"], job["id"])
+        self.assertEqual(self.jobs.pending(), 1)
+        self.assertEqual(self._request("DELETE", f"/jobs/{job['id']}")[0], 200)
+        self.assertEqual(self._request("DELETE", f"/jobs/{job['id']}")[0], 409)
+
+    def test_invalid_bodies_are_rejected(self):
+        for body in ([1], {}, {"videos": [1]}, {"videos": self.video, "settings": ["font.size"]},
+                     {"videos": self.video, "settings": {"nao.existe": 1}}, b"{invalido"):
+            status, payload = self._request("POST", "/jobs", body)
+            self.assertEqual(status, 400, body)
+            self.assertIn("error", payload)
+
+    def test_unknown_routes(self):
+        self.assertEqual(self._request("GET", "/nada")[0], 404)
+        self.assertEqual(self._request("GET", "/jobs/inexistente")[0], 404)
+        self.assertEqual(self._request("POST", "/health", {})[0], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+from src.utils.config_manager import ConfigManager
+from src.core.subtitle_generator import SubtitleGenerator, format_timestamps
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 1.5, 'text': ' Hello <world>'},
+    {'start': 3661.25, 'end': 3662.75, 'text': ' {brace}\nline'},
+]
+
+
+class FormatTimestampTest(unittest.TestCase):
+    def setUp(self):
+        self.generator = SubtitleGenerator(None)
+
+    def test_scalar(self):
+        self.assertEqual(self.generator.format_timestamp(0), "00:00:00,000")
+        self.assertEqual(self.generator.format_timestamp(3661.5), "01:01:01,500")
+        # Fração truncada, como sempre foi
+        self.assertEqual(self.generator.format_timestamp(1512.04), "00:25:12,039")
+
+    def test_bulk_matches_scalar(self):
+        rng = random.Random(0)
+        values = [round(rng.uniform(0, 4 * 3600), 2) for _ in range(5000)] + [rng.uniform(0, 7200) for _ in range(5000)]
+        expected = [self.generator.format_timestamp(v) for v in values]
+        self.assertEqual(format_timestamps(values), expected)
+        self.assertEqual(format_timestamps(values, 'vtt'), [t.replace(',', '.') for t in expected])
+
+    def test_ass_uses_centiseconds(self):
+        self.assertEqual(format_timestamps([3661.257], 'ass'), ["1:01:01.25"])
+
+
+class SubtitleGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        self.config = ConfigManager().snapshot({"font.color": "#102030", "font.bold": True,
+                                                "subtitle.formats": ["srt", "vtt", "ass"]})
+        self.generator = SubtitleGenerator(self.config)
+
+    def test_render_all_formats_in_one_pass(self):
+        rendered = self.generator.render(SEGMENTS)
+        self.assertEqual(
+            rendered['srt'].split("\n\n")[0],
+            '1\n00:00:00,000 --> 00:00:01,500\n<b><font color="#102030">Hello <world></font></b>',
+        )
+        self.assertIn("01:01:01.250 --> 01:01:02.750\n", rendered['vtt'])
+        self.assertIn("Hello &lt;world&gt;", rendered['vtt'])
+        self.assertIn("Dialogue: 0,1:01:01.25,1:01:02.75,Default,,0,0,0,,(brace)\\Nline\n", rendered['ass'])
+
+    def test_headers_carry_style_once(self):
+        self.assertIn("color: #102030;", self.generator.header('vtt'))
+        self.assertIn("&H00302010", self.generator.header('ass'))
+        self.assertEqual(self.generator.header('srt'), "")
+
+    def test_generate_writes_each_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = os.path.join(tmp, "video.srt")
+            self.assertTrue(self.generator.generate(SEGMENTS, base))
+            paths = self.generator.output_paths(base)
+            self.assertEqual(sorted(os.path.basename(p) for p in paths.values()),
+                             ["video.ass", "video.srt", "video.vtt"])
+            with open(paths['vtt'], encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("WEBVTT\n"))
+
+    def test_stream_writer_numbers_cues_across_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "video.srt")
+            with self.generator.open_stream(path, formats=['srt']) as writer:
+                writer.write(SEGMENTS[:1])
+                writer.write(SEGMENTS[1:])
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+            self.assertTrue(content.startswith("1\n"))
+            self.assertIn("\n\n2\n01:01:01,250 --> 01:01:02,750\n", content)
+
+    def test_invalid_formats_fall_back_to_srt(self):
+        generator = SubtitleGenerator(ConfigManager().snapshot({"subtitle.formats": ["doc"]}))
+        self.assertEqual(generator.formats(), ["srt"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.core.audio import SAMPLE_RATE
+from src.core.transcription_engine import TranscriptionEngine
+from src.utils.tracing import Tracer, tracer, export_chrome_trace, summarize
+
+
+def _fresh_tracer():
+    """Instância própria, fora do singleton do processo"""
+    instance = object.__new__(Tracer)
+    instance.__init__()
+    instance.enabled = True
+    return instance
+
+
+class TracerTest(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        instance = _fresh_tracer()
+        instance.enabled = False
+        with instance.span("etapa", items=1) as args:
+            args['extra'] = 2
+        self.assertEqual(instance.drain(), [])
+
+    def test_spans_are_drained_with_thread_names(self):
+        instance = _fresh_tracer()
+        with instance.span("transcription"):
+            with instance.span("whisper", "model", audio_seconds=3.0) as args:
+                args['segments'] = 4
+        events = instance.drain()
+        spans = [e for e in events if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in spans], ["whisper", "transcription"])
+        self.assertEqual(spans[0]['args'], {'audio_seconds': 3.0, 'segments': 4})
+        self.assertTrue(any(e['ph'] == 'M' for e in events))
+        self.assertEqual(instance.drain(), [])
+
+    def test_extend_summarize_and_export(self):
+        instance = _fresh_tracer()
+        worker = [{'name': 'whisper', 'ph': 'X', 'ts': 0, 'dur': 3000, 'pid': 1, 'tid': 1, 'args': {}},
+                  {'name': 'whisper', 'ph': 'X', 'ts': 0, 'dur': 1000, 'pid': 1, 'tid': 1, 'args': {}},
+                  {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'w'}}]
+        instance.extend(worker)
+        events = instance.drain()
+        self.assertEqual(summarize(events), [("whisper", 2, 4.0, 2.0, 3.0)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_chrome_trace(events, os.path.join(tmp, "trace.json"))
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual(len([e for e in data['traceEvents'] if e['name'] == 'whisper']), 2)
+
+
+class WhisperSpanTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = object.__new__(TranscriptionEngine)
+        self.engine.config = None
+        self.engine.model_size, self.engine.device, self.engine.quantization = 'base', 'cpu', None
+        self.engine.backend = mock.Mock()
+        self.engine.backend.name = 'openai-whisper'
+        patchers = [mock.patch.object(TranscriptionEngine, 'model', new_callable=mock.PropertyMock),
+                    mock.patch.object(tracer, 'enabled', True)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        tracer.drain()
+        self.addCleanup(tracer.drain)
+
+    def _whisper_args(self, audio):
+        self.engine._infer(audio, {})
+        return next(e['args'] for e in tracer.drain() if e['name'] == 'whisper')
+
+    def test_audio_seconds_for_decoded_audio(self):
+        args = self._whisper_args(np.zeros(SAMPLE_RATE * 3, dtype=np.float32))
+        self.assertEqual(args['audio_seconds'], 3.0)
+
+    def test_no_audio_seconds_for_a_path(self):
+        self.assertNotIn('audio_seconds', self._whisper_args("/videos/episodio.mp4"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.transcription_cache import TranscriptionCache, audio_fingerprint
+
+
+class TranscriptionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = TranscriptionCache(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fingerprint_depends_only_on_content(self):
+        audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+        self.assertEqual(audio_fingerprint(audio), audio_fingerprint(audio.copy()))
+        self.assertNotEqual(audio_fingerprint(audio), audio_fingerprint(audio[::-1].copy()))
+
+    def test_key_includes_model_and_options(self):
+        key = TranscriptionCache.make_key("abc", "base", {'vad': None})
+        self.assertEqual(key, TranscriptionCache.make_key("abc", "base", {'vad': None}))
+        self.assertNotEqual(key, TranscriptionCache.make_key("abc", "small", {'vad': None}))
+        self.assertNotEqual(key, TranscriptionCache.make_key("abc", "base", {'vad': {'margin_db': 12}}))
+
+    def test_put_and_get(self):
+        key = TranscriptionCache.make_key("abc", "base")
+        self.assertIsNone(self.cache.get(key))
+        result = {'text': ' oi', 'segments': [{'start': 0.0, 'end': 1.0, 'text': ' oi'}], 'language': 'pt', 'extra': 1}
+        self.cache.put(key, result)
+        cached = self.cache.get(key)
+        self.assertEqual(cached, {k: result[k] for k in ('text', 'segments', 'language')})
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_evicts_least_recently_used(self):
+        old, new = TranscriptionCache.make_key("old", "base"), TranscriptionCache.make_key("new", "base")
+        self.cache.put(old, {'text': 'a' * 100, 'segments': []})
+        os.utime(self.cache._path(old), (0, 0))
+        size = os.path.getsize(self.cache._path(old))
+        self.cache.max_bytes = size + size // 2
+        self.cache.put(new, {'text': 'b' * 100, 'segments': []})
+        self.assertIsNone(self.cache.get(old))
+        self.assertIsNotNone(self.cache.get(new))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from src.core.translation_engine import TranslationEngine
+from src.core.translation_providers import TranslationProvider
+
+
+class FakeProvider(TranslationProvider):
+    """Provedor offline que registra as chamadas; `drop_lines` simula um lote desalinhado"""
+
+    name = "fake"
+
+    def __init__(self, native_batch=False, max_batch_items=50, drop_lines=False):
+        self.native_batch = native_batch
+        self.max_batch_items = max_batch_items
+        self.drop_lines = drop_lines
+        self.calls = []
+
+    def translate(self, text, source, target):
+        self.calls.append(text)
+        lines = text.split("\n")
+        if self.drop_lines and len(lines) > 1:
+            lines = lines[:-1]
+        return "\n".join(f"<{line}>" for line in lines)
+
+    def translate_batch(self, texts, source, target):
+        self.calls.append(list(texts))
+        return [f"<{t}>" for t in texts]
+
+
+class MakeBatchesTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = TranslationEngine()
+
+    def test_item_limit_uses_the_smaller_of_engine_and_provider(self):
+        texts = [str(i) for i in range(7)]
+        self.engine.batch_max_items = 3
+        self.assertEqual([len(b) for b in self.engine._make_batches(texts, FakeProvider())], [3, 3, 1])
+        self.engine.batch_max_items = 50
+        self.assertEqual([len(b) for b in self.engine._make_batches(texts, FakeProvider(max_batch_items=2))],
+                         [2, 2, 2, 1])
+
+    def test_char_limit_counts_delimiters(self):
+        self.engine.batch_max_chars = 10
+        batches = list(self.engine._make_batches(["aaaa", "bbbb", "cccc", "d" * 20], FakeProvider()))
+        self.assertEqual(batches, [["aaaa", "bbbb"], ["cccc"], ["d" * 20]])
+
+    def test_no_texts_no_batches(self):
+        self.assertEqual(list(self.engine._make_batches([], FakeProvider())), [])
+
+
+class TranslateBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = TranslationEngine()
+
+    def test_joined_batch_is_one_request(self):
+        provider = FakeProvider()
+        result = self.engine._translate_batch(provider, ["a", "b\nc"], "en", "pt")
+        self.assertEqual(result, {"a": "<a>", "b\nc": "<b c>"})
+        self.assertEqual(provider.calls, ["a\nb c"])
+
+    def test_native_batch(self):
+        provider = FakeProvider(native_batch=True)
+        self.assertEqual(self.engine._translate_batch(provider, ["a", "b"], "en", "pt"), {"a": "<a>", "b": "<b>"})
+        self.assertEqual(provider.calls, [["a", "b"]])
+
+    def test_misaligned_batch_falls_back_to_single_items(self):
+        provider = FakeProvider(drop_lines=True)
+        result = self.engine._translate_batch(provider, ["a", "b", "c"], "en", "pt")
+        self.assertEqual(result, {"a": "<a>", "b": "<b>", "c": "<c>"})
+        self.assertEqual(provider.calls, ["a\nb\nc", "a", "b", "c"])
+
+    def test_segments_keep_order_across_batches(self):
+        provider = FakeProvider()
+        engine = TranslationEngine(provider=provider)
+        engine.batch_max_items = 2
+        segments = [{'start': i, 'text': f" linha {i}"} for i in range(5)]
+        result = engine.translate_segments(segments, "pt", source_lang="en")
+        self.assertEqual([s['text'] for s in result], [f"<linha {i}>" for i in range(5)])
+        self.assertEqual([s['start'] for s in result], list(range(5)))
+        self.assertEqual(len(provider.calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from src.core.translation_memory import TranslationMemory
+from src.core.translation_engine import TranslationEngine
+from src.core.translation_providers import TranslationProvider
+
+
+class CountingProvider(TranslationProvider):
+    """Provedor offline: prefixa o destino e guarda cada texto enviado"""
+
+    name = "counting"
+
+    def __init__(self):
+        self.texts = []
+
+    def translate(self, text, source, target):
+        self.texts.append(text)
+        return "\n".join(f"[{target}] {line}" for line in text.split("\n"))
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.memory = TranslationMemory(self._tmp.name, max_entries=3)
+
+    def tearDown(self):
+        self.memory.close()
+        self._tmp.cleanup()
+
+    def test_lookup_is_keyed_by_languages_and_provider(self):
+        self.memory.put_many({"hello": "olá"}, "en", "pt", "google")
+        self.assertEqual(self.memory.get_many(["hello", "bye"], "en", "pt", "google"), {"hello": "olá"})
+        self.assertEqual(self.memory.get_many(["hello"], "auto", "pt", "google"), {})
+        self.assertEqual(self.memory.get_many(["hello"], "en", "pt", "deepl"), {})
+        self.assertEqual(self.memory.stats(), {'hits': 1, 'misses': 3})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.memory.put_many({"a": "A", "b": "B"}, "en", "pt", "p")
+        self.memory._conn.execute("UPDATE translations SET last_used = 0 WHERE source_text = 'a'")
+        self.memory.put_many({"c": "C", "d": "D"}, "en", "pt", "p")
+        self.assertEqual(set(self.memory.get_many("abcd", "en", "pt", "p")), {"b", "c", "d"})
+
+    def test_entries_survive_reopening(self):
+        self.memory.put_many({"hello": "olá"}, "en", "pt", "p")
+        self.memory.close()
+        self.memory = TranslationMemory(self._tmp.name)
+        self.assertEqual(self.memory.get_many(["hello"], "en", "pt", "p"), {"hello": "olá"})
+
+
+class TranslateSegmentsMemoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.provider = CountingProvider()
+        self.engine = TranslationEngine(provider=self.provider)
+        self.engine.memory = TranslationMemory(self._tmp.name)
+
+    def tearDown(self):
+        self.engine.close()
+        self._tmp.cleanup()
+
+    def test_duplicates_are_sent_once_and_remembered(self):
+        segments = [{'text': ' [Música]'}, {'text': ' Oi'}, {'text': ' [Música]'}, {'text': ''}]
+        result = self.engine.translate_segments(segments, "en", source_lang="pt")
+        self.assertEqual([s['text'] for s in result], ["[en] [Música]", "[en] Oi", "[en] [Música]", ""])
+        self.assertEqual(self.provider.texts, ["[Música]\nOi"])
+
+        self.engine.translate_segments(segments, "en", source_lang="pt-BR")
+        self.assertEqual(len(self.provider.texts), 1)
+        # Outro idioma de origem é outra chave
+        self.engine.translate_segments(segments, "en", source_lang="es")
+        self.assertEqual(len(self.provider.texts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
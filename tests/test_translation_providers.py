@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+import requests
+from src.utils.config_manager import ConfigManager
+from src.utils.translation_stub_server import StubTranslationServer
+from src.core import translation_providers
+from src.core.translation_engine import TranslationEngine
+from src.core.translation_providers import (
+    GoogleProvider, LibreTranslateProvider, get_provider, is_transient_error,
+)
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class IsTransientErrorTest(unittest.TestCase):
+    def test_rate_limit_server_and_connection_errors(self):
+        self.assertTrue(is_transient_error(_http_error(429)))
+        self.assertTrue(is_transient_error(_http_error(503)))
+        self.assertTrue(is_transient_error(requests.ConnectionError()))
+        self.assertTrue(is_transient_error(requests.Timeout()))
+
+    def test_client_errors_are_final(self):
+        self.assertFalse(is_transient_error(_http_error(403)))
+        self.assertFalse(is_transient_error(_http_error(400)))
+        self.assertFalse(is_transient_error(ValueError()))
+
+
+class LibreTranslateProviderTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubTranslationServer(("127.0.0.1", 0))
+        self.server.start_background()
+        self.provider = LibreTranslateProvider(self.server.url, pool_size=2)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.provider.session.close()
+
+    def test_batch_is_a_single_request(self):
+        self.assertEqual(self.provider.translate_batch(["a", "b"], "en", "pt"), ["[pt] a", "[pt] b"])
+        self.assertEqual(self.provider.translate("c", "en", "pt"), "[pt] c")
+        self.assertEqual((self.server.requests, self.server.texts), (2, 3))
+
+    def test_engine_retries_rate_limited_requests(self):
+        self.server.fail_rate = 0.5  # As requisições pares recebem 429
+        self.server.count(0)
+        engine = TranslationEngine(provider=self.provider)
+        engine.requests_per_second = 0
+        with mock.patch("src.utils.rate_limiter.time.sleep"):
+            result = engine.translate_segments([{'text': ' a'}, {'text': ' b'}], "pt", source_lang="en")
+        self.assertEqual([s['text'] for s in result], ["[pt] a", "[pt] b"])
+        self.assertEqual(self.server.requests, 3)
+
+
+class GetProviderTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(translation_providers._providers, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_provider_is_shared_in_the_process(self):
+        config = ConfigManager().snapshot({"translation.provider": "libretranslate",
+                                           "translation.libretranslate_url": "http://127.0.0.1:1"})
+        provider = get_provider(config)
+        self.assertIsInstance(provider, LibreTranslateProvider)
+        self.assertIs(get_provider(config), provider)
+
+    def test_fallback_is_cached_under_the_requested_key(self):
+        config = ConfigManager().snapshot({"translation.provider": "deepl", "translation.deepl_api_key": ""})
+        with mock.patch.object(translation_providers, "DeepLProvider", side_effect=ValueError("sem chave")) as deepl:
+            provider = get_provider(config)
+            self.assertIsInstance(provider, GoogleProvider)
+            self.assertIs(get_provider(config), provider)
+        self.assertEqual(deepl.call_count, 1)
+
+    def test_fallback_can_be_disabled(self):
+        config = ConfigManager().snapshot({"translation.provider": "deepl", "translation.google_fallback": False})
+        with self.assertRaises(ValueError):
+            get_provider(config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from src.core.audio import SAMPLE_RATE
+from src.core.vad import detect_speech, SpeechTimeline
+
+
+def _audio_with_speech(spans, seconds=10, seed=0):
+    """Ruído baixo com trechos de alta energia em `spans` (segundos)"""
+    rng = np.random.default_rng(seed)
+    audio = rng.normal(0, 0.001, seconds * SAMPLE_RATE).astype(np.float32)
+    for start, end in spans:
+        audio[start * SAMPLE_RATE:end * SAMPLE_RATE] += rng.normal(0, 0.3, (end - start) * SAMPLE_RATE)
+    return audio
+
+
+class DetectSpeechTest(unittest.TestCase):
+    def test_finds_loud_regions_with_padding(self):
+        regions = detect_speech(_audio_with_speech([(2, 4), (7, 8)]), pad_ms=200)
+        self.assertEqual(len(regions), 2)
+        (s1, e1), (s2, e2) = regions
+        self.assertAlmostEqual(s1 / SAMPLE_RATE, 1.8, delta=0.05)
+        self.assertAlmostEqual(e1 / SAMPLE_RATE, 4.2, delta=0.05)
+        self.assertAlmostEqual(s2 / SAMPLE_RATE, 6.8, delta=0.05)
+        self.assertAlmostEqual(e2 / SAMPLE_RATE, 8.2, delta=0.05)
+
+    def test_short_gaps_are_merged(self):
+        regions = detect_speech(_audio_with_speech([(2, 4), (4, 5)]), min_silence_ms=500)
+        self.assertEqual(len(regions), 1)
+
+    def test_empty_and_silent_audio(self):
+        self.assertEqual(detect_speech(np.zeros(10, dtype=np.float32)), [])
+        self.assertEqual(detect_speech(np.zeros(5 * SAMPLE_RATE, dtype=np.float32)), [])
+
+
+class SpeechTimelineTest(unittest.TestCase):
+    def setUp(self):
+        # Fala de 1-3 s e de 6-7 s: o áudio recortado tem 3 s
+        self.timeline = SpeechTimeline([(1 * SAMPLE_RATE, 3 * SAMPLE_RATE), (6 * SAMPLE_RATE, 7 * SAMPLE_RATE)])
+
+    def test_extract_concatenates_regions(self):
+        audio = np.arange(8 * SAMPLE_RATE, dtype=np.float32)
+        self.assertEqual(len(self.timeline.extract(audio)), 3 * SAMPLE_RATE)
+        self.assertEqual(self.timeline.speech_seconds(), 3.0)
+
+    def test_remap_segments_to_original_timeline(self):
+        segments = [{'start': 0.5, 'end': 1.5}, {'start': 2.2, 'end': 2.8}]
+        self.timeline.remap_segments(segments)
+        self.assertEqual([(s['start'], s['end']) for s in segments], [(1.5, 2.5), (6.2, 6.8)])
+
+    def test_segment_crossing_a_seam_keeps_the_larger_side(self):
+        segments = [{'start': 1.5, 'end': 2.2, 'words': [{'start': 1.5, 'end': 1.9}]}]
+        self.timeline.remap_segments(segments)
+        self.assertEqual((segments[0]['start'], segments[0]['end']), (2.5, 3.0))
+        self.assertEqual((segments[0]['words'][0]['start'], segments[0]['words'][0]['end']), (2.5, 2.9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.config_manager import ConfigManager
+from src.core import watcher as watcher_module
+from src.core.watcher import FolderWatcher, PollingWatcher
+
+
+class FolderWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        config = ConfigManager().snapshot({"watch.use_inotify": False, "watch.stable_seconds": 5})
+        self.watcher = FolderWatcher([self.tmp], config, is_excluded=lambda p: ".legendado." in p)
+        self.now = 1000.0
+        patcher = mock.patch.object(watcher_module.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, data=b"x"):
+        path = os.path.join(self.tmp, name)
+        with open(path, "ab") as f:
+            f.write(data)
+        return path
+
+    def test_file_is_ready_once_stable(self):
+        path = self._write("ep1.mp4")
+        self.watcher._track(path)
+        self.now += 4
+        self.assertEqual(self.watcher._ready(), [])
+        self.now += 1
+        self.assertEqual(self.watcher._ready(), [path])
+        self.now += 10
+        self.assertEqual(self.watcher._ready(), [])
+
+    def test_growing_file_restarts_the_wait(self):
+        path = self._write("ep1.mkv")
+        self.watcher._track(path)
+        self.now += 4
+        self._write("ep1.mkv", b"more")
+        self.assertEqual(self.watcher._ready(), [])
+        self.now += 4
+        self.assertEqual(self.watcher._ready(), [])
+        self.now += 1
+        self.assertEqual(self.watcher._ready(), [path])
+
+    def test_handled_file_returns_only_when_it_changes(self):
+        path = self._write("ep1.mp4")
+        self.watcher._track(path)
+        self.now += 5
+        self.assertEqual(self.watcher._ready(), [path])
+        self.watcher._track(path)
+        self.assertEqual(self.watcher._pending, {})
+        self._write("ep1.mp4", b"more")
+        self.watcher._track(path)
+        self.now += 5
+        self.assertEqual(self.watcher._ready(), [path])
+
+    def test_ignored_and_removed_files(self):
+        for name in ("notes.txt", ".partial.mp4", "ep1.legendado.mkv"):
+            self.watcher._track(self._write(name))
+        self.assertEqual(self.watcher._pending, {})
+        path = self._write("ep2.mp4")
+        self.watcher._track(path)
+        os.remove(path)
+        self.now += 5
+        self.assertEqual(self.watcher._ready(), [])
+        self.assertEqual(self.watcher._pending, {})
+
+
+class PollingWatcherTest(unittest.TestCase):
+    def test_reports_new_and_changed_files(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(watcher_module.time, "sleep"):
+            backend = PollingWatcher([tmp], interval=0)
+            path = os.path.join(tmp, "ep1.mp4")
+            with open(path, "wb") as f:
+                f.write(b"x")
+            self.assertEqual(backend.poll(1), [path])
+            self.assertEqual(backend.poll(1), [])
+            with open(path, "ab") as f:
+                f.write(b"more")
+            self.assertEqual(backend.poll(1), [path])
+
+
+if __name__ == '__main__':
+    unittest.main()